@@ -0,0 +1,96 @@
+"""Async variants of the api views for ASGI deployments.
+
+Under ASGI Django runs synchronous views on one shared thread, so a slow
+upstream fetch holds up every other request. ``async_view`` turns a
+``BaseStatsBombView.as_view()`` callable into a coroutine view that runs the
+synchronous view, statsbombpy calls and DataFrame work on a bounded thread
+pool. The view's ``get_prefetches`` callables (independent fetches) run
+concurrently on the pool before the view itself, and streamed bodies are
+produced on the pool one chunk at a time.
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+from django.conf import settings
+from django.urls import URLPattern, include
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'API_ASYNC_WORKERS', 16),
+    thread_name_prefix='api-async')
+
+
+async def run_in_pool(fn, *args, **kwargs):
+    """Run a blocking callable on the bounded api thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(fn, *args, **kwargs))
+
+
+def _prefetch(fn):
+    """Run one prefetch, leaving errors for the view to report"""
+    try:
+        fn()
+    except Exception as e:
+        logger.warning(f"Prefetch failed: {str(e)}")
+
+
+async def _iter_in_pool(iterator):
+    """Pull a blocking iterator's items one at a time on the pool"""
+    iterator = iter(iterator)
+    done = object()
+    while True:
+        item = await run_in_pool(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+
+def async_view(view):
+    """Wrap a DRF ``as_view()`` callable in a coroutine view"""
+    view_class = view.cls
+    initkwargs = view.initkwargs
+
+    def respond(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        # Render on the pool too, instead of Django's shared sync thread
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        return response
+
+    async def async_view_func(request, *args, **kwargs):
+        # Not yet dispatched: get_prefetches has no request to look at
+        prefetches = view_class(**initkwargs).get_prefetches(**kwargs)
+        if prefetches:
+            await asyncio.gather(*(
+                run_in_pool(_prefetch, fn) for fn in prefetches))
+        response = await run_in_pool(respond, request, *args, **kwargs)
+        if response.streaming and not response.is_async:
+            # Django would otherwise buffer a sync iterator whole before
+            # sending the first byte
+            response.streaming_content = _iter_in_pool(response.streaming_content)
+        return response
+
+    functools.update_wrapper(async_view_func, view, updated=())
+    async_view_func.csrf_exempt = getattr(view, 'csrf_exempt', False)
+    return async_view_func
+
+
+def async_urlpatterns(urlpatterns):
+    """Return a copy of urlpatterns with every api view wrapped by async_view"""
+    patterns = []
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLPattern) and hasattr(pattern.callback, 'cls'):
+            pattern = URLPattern(pattern.pattern, async_view(pattern.callback),
+                                 pattern.default_args, pattern.name)
+        patterns.append(pattern)
+    return patterns
+
+
+def async_include(module):
+    """``include()`` for an api URL module, serving its views asynchronously"""
+    return include(async_urlpatterns(import_module(module).urlpatterns))
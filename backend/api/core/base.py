@@ -1,8 +1,19 @@
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
+import json
 import logging
-import numpy as np
-import pandas as pd
+
+from .breaker import CircuitOpenError, reset_stale, stale_resources
+from .cache import frames_cache, get_indexed_events
+from .catalogue import season_matches_cache
+from .lazy import pd
+from .raw import RawMatchEvents
+from .renderers import NDJSONRenderer, iter_ndjson
+from .sanitize import sanitize_records
+from .singleflight import single_flight
+from .sources import default_data_source
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +26,112 @@ class BaseStatsBombView(APIView):
         'out', 'related_events', '50_50'
     ]
 
+    # Data source instance for this view; defaults to API_DATA_SOURCE
+    data_source = None
+
+    # ?format=ndjson is available on every view; event views stream it
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer]
+    ndjson_chunk_size = 500
+
+    def initial(self, request, *args, **kwargs):
+        reset_stale()
+        super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Flag responses built from stale cached data"""
+        stale = stale_resources()
+        if stale:
+            response['Warning'] = '110 - "Response is Stale"'
+            response['X-Data-Stale'] = ', '.join(stale)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def get_data_source(self):
+        """Return the source used for competitions, matches, lineups and events"""
+        return self.data_source or default_data_source()
+
+    def get_prefetches(self, **kwargs):
+        """Independent fetches the async view runs concurrently before ``get``.
+
+        Called with the URL kwargs on an instance built from the view's
+        initkwargs before dispatch, so it must not use ``self.request``,
+        ``self.args`` or ``self.kwargs``.
+        """
+        return []
+
+    def fetch_once(self, resource, key, fetch):
+        """Run ``fetch()``, sharing it with concurrent requests for the same key"""
+        return single_flight.do((resource, key), fetch)
+
+    def get_indexed_events(self, match_id):
+        """Return the cached, player-indexed events used by the player views.
+
+        MatchEvents (frame plus partition index) by default, or
+        RawMatchEvents when API_EVENTS_PIPELINE is 'raw'.
+        """
+        return get_indexed_events(match_id, self.get_data_source())
+
+    def get_season_matches(self, competition_id, season_id):
+        """Return the cached SeasonMatches for a season, or None if it has none"""
+        return season_matches_cache.get_or_load(
+            competition_id, season_id,
+            lambda: self.get_data_source().matches(competition_id, season_id))
+
+    def get_match_frames(self, match_id):
+        """Return the cached 360 freeze frames (MatchFrames) for a match"""
+        return frames_cache.get_or_load(
+            match_id, lambda: self.get_data_source().frames(match_id))
+
+    def get_section_records(self, match, player_name, types, columns):
+        """Return a player's events as cleaned dicts of the match's ``columns``.
+
+        RawMatchEvents builds the dicts straight from its flattened events;
+        otherwise the player's rows are taken from the match frame.
+        """
+        if isinstance(match, RawMatchEvents):
+            return match.select_records(player_name, types, columns)
+        events = match.player_events(player_name, types)
+        return self.clean_dataframe(
+            events[[col for col in columns if col in events.columns]])
+
+    def get_column(self, df, column):
+        """Return a column, or an all-missing Series if the frame lacks it"""
+        if column in df.columns:
+            return df[column]
+        return pd.Series(None, index=df.index, dtype=object)
+
+    def count_true(self, df, column):
+        """Count rows where a boolean event flag is set to True"""
+        return int(self.get_column(df, column).eq(True).sum())
+
+    def json_response(self, content, status=200):
+        """Return a pre-rendered JSON body without serializing it again"""
+        if self.wants_ndjson(self.request):
+            return Response(json.loads(content), status=status)
+        return HttpResponse(content, status=status,
+                            content_type='application/json')
+
+    def wants_ndjson(self, request):
+        """Whether content negotiation picked the NDJSON renderer"""
+        renderer = getattr(request, 'accepted_renderer', None)
+        return renderer is not None and renderer.format == NDJSONRenderer.format
+
+    def ndjson_response(self, frame):
+        """Stream a frame's rows as cleaned NDJSON, one chunk at a time
+
+        Under ASGI, async_view produces the chunks on the thread pool.
+        """
+        return StreamingHttpResponse(
+            iter_ndjson(frame, self.ndjson_chunk_size),
+            content_type=NDJSONRenderer.media_type)
+
     def handle_error(self, error, message="An error occurred"):
         logger.error(f"{message}: {str(error)}")
+        if isinstance(error, CircuitOpenError):
+            # Upstream is known to be failing; tell clients when to retry
+            return Response({
+                'error': str(error),
+                'message': message
+            }, status=503, headers={'Retry-After': str(error.retry_after)})
         return Response({
             'error': str(error),
             'message': message
@@ -24,46 +139,4 @@ class BaseStatsBombView(APIView):
 
     def clean_dataframe(self, df):
         """Clean DataFrame for JSON serialization"""
-        # Make a copy to avoid modifying the original
-        df = df.copy()
-
-        # First, handle all numeric columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            df[col] = df[col].replace({
-                np.nan: None,
-                np.inf: None,
-                -np.inf: None
-            })
-
-        # Handle all object/string columns
-        object_cols = df.select_dtypes(include=['object']).columns
-        for col in object_cols:
-            df[col] = df[col].replace({np.nan: None})
-
-        # Convert DataFrame to records
-        records = df.to_dict(orient='records')
-
-        # Final cleanup to ensure JSON serialization will work
-        clean_records = []
-        for record in records:
-            clean_record = {}
-            for key, value in record.items():
-                if isinstance(value, np.integer):
-                    clean_record[key] = int(value)
-                elif isinstance(value, np.floating):
-                    clean_record[key] = float(
-                        value) if not np.isnan(value) else None
-                elif isinstance(value, (np.ndarray, list)):
-                    # Handle array-like values
-                    if isinstance(value, np.ndarray):
-                        value = value.tolist()
-                    clean_record[key] = [
-                        None if isinstance(x, (float, np.floating)) and np.isnan(x)
-                        else x for x in value
-                    ]
-                else:
-                    clean_record[key] = None if pd.isna(value) else value
-            clean_records.append(clean_record)
-
-        return clean_records
+        return sanitize_records(df)
@@ -0,0 +1,218 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+# Resources a request was served stale, reported in the response headers
+_stale = contextvars.ContextVar('api_stale_resources', default=None)
+
+
+def reset_stale():
+    _stale.set(set())
+
+
+def mark_stale(resource, key):
+    """Record that a stale payload was served for the current request"""
+    resources = _stale.get()
+    if resources is None:
+        resources = set()
+        _stale.set(resources)
+    resources.add(resource)
+    logger.info(f"Serving stale {resource} for {key}")
+
+
+def stale_resources():
+    return sorted(_stale.get() or ())
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while a breaker is open"""
+
+    def __init__(self, resource, retry_after):
+        self.resource = resource
+        self.retry_after = retry_after
+        super().__init__(
+            f"Upstream {resource} requests are failing; retry in {retry_after}s")
+
+
+def is_upstream_failure(error):
+    """Whether an exception says the upstream is unhealthy, not the request bad"""
+    if isinstance(error, FileNotFoundError):
+        return False
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return not (status is not None and 400 <= status < 500)
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one upstream resource type.
+
+    Outcomes of the last ``window`` seconds are kept; once at least
+    ``min_calls`` were made and the share of failures (errors or calls
+    slower than ``slow_call`` seconds) reaches ``failure_rate`` the breaker
+    opens and calls fail fast. After ``reset_timeout`` seconds one trial
+    call is let through (half-open); its outcome closes or reopens it.
+    """
+
+    def __init__(self, resource, failure_rate=0.5, min_calls=5, window=60,
+                 reset_timeout=30, slow_call=10):
+        self.resource = resource
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+        self.state = CLOSED
+        self._outcomes = deque()  # (finished_at, failed)
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def call(self, fn, *args, **kwargs):
+        """Run an upstream call through the breaker"""
+        self._before_call()
+        start = time.monotonic()
+        failed = None
+        try:
+            result = fn(*args, **kwargs)
+            slow = self.slow_call and time.monotonic() - start > self.slow_call
+            if slow:
+                logger.warning(
+                    f"Slow upstream {self.resource} call: {time.monotonic() - start:.1f}s")
+            failed = bool(slow)
+            return result
+        except Exception as e:
+            failed = is_upstream_failure(e)
+            raise
+        finally:
+            if failed is None:
+                # Interrupted (KeyboardInterrupt, SystemExit): no outcome, but
+                # a half-open trial must not stay claimed
+                self._release_trial()
+            else:
+                self._record(failed)
+
+    def allows_calls(self):
+        """Whether a call would currently be attempted"""
+        with self._lock:
+            return self.state != OPEN or self._reset_due()
+
+    def stats(self):
+        with self._lock:
+            self._trim(time.monotonic())
+            failed = sum(1 for _, failed in self._outcomes if failed)
+            return {
+                'state': self.state,
+                'window_calls': len(self._outcomes),
+                'window_failure_rate': round(
+                    failed / len(self._outcomes) * 100, 1) if self._outcomes else 0,
+                'calls': self.calls,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'opened': self.opened,
+            }
+
+    def _reset_due(self):
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == OPEN and self._reset_due() and not self._trial_running:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            if self.state != CLOSED:
+                self.rejected += 1
+                retry_after = max(
+                    1, int(self.reset_timeout - (time.monotonic() - self._opened_at)))
+                raise CircuitOpenError(self.resource, retry_after)
+
+    def _release_trial(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_running = False
+
+    def _record(self, failed):
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            self.failures += failed
+            if self.state == HALF_OPEN and self._trial_running:
+                self._trial_running = False
+                self._outcomes.clear()
+                if failed:
+                    self._open(now)
+                else:
+                    self.state = CLOSED
+                    logger.info(f"Circuit for {self.resource} closed")
+                return
+
+            self._outcomes.append((now, failed))
+            self._trim(now)
+            failures = sum(1 for _, f in self._outcomes if f)
+            if (self.state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._open(now)
+
+    def _open(self, now):
+        self.state = OPEN
+        self._opened_at = now
+        self.opened += 1
+        logger.warning(f"Circuit for {self.resource} opened")
+
+    def _trim(self, now):
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+
+class GuardedSource:
+    """Data source wrapper routing each resource type through its breaker"""
+
+    resources = ['competitions', 'matches', 'lineups', 'events', 'raw_events',
+                 'frames']
+
+    def __init__(self, source, breakers):
+        self.source = source
+        self.breakers = breakers
+
+    def __getattr__(self, name):
+        attr = getattr(self.source, name)
+        if name not in self.breakers or not callable(attr):
+            return attr
+
+        breaker = self.breakers[name]
+
+        def guarded(*args, **kwargs):
+            return breaker.call(attr, *args, **kwargs)
+        return guarded
+
+
+def breakers_from_settings():
+    """Build one breaker per resource type from API_CIRCUIT_BREAKER"""
+    options = getattr(settings, 'API_CIRCUIT_BREAKER', {})
+    return {
+        resource: CircuitBreaker(
+            resource,
+            failure_rate=options.get('FAILURE_RATE', 0.5),
+            min_calls=options.get('MIN_CALLS', 5),
+            window=options.get('WINDOW', 60),
+            reset_timeout=options.get('RESET_TIMEOUT', 30),
+            slow_call=options.get('SLOW_CALL', 10),
+        )
+        for resource in GuardedSource.resources
+    }
+
+
+circuit_breakers = breakers_from_settings()
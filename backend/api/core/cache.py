@@ -0,0 +1,428 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .breaker import mark_stale
+from .frames import MatchFrames
+from .lazy import np
+from .partitions import MatchEvents
+from .raw import RawMatchEvents
+from .singleflight import single_flight
+
+logger = logging.getLogger(__name__)
+
+
+class EventsCache:
+    """Process-wide LRU cache of indexed match events keyed by match_id.
+
+    Entries are MatchEvents objects, bounded by count and by their in-memory
+    size, and expire after ``ttl`` seconds. Expired entries are kept until
+    replaced or evicted: ``get_or_load`` serves them marked stale while a
+    background refresh runs. When ``spill_dir`` is set, frames evicted from
+    memory are written to Parquet and read back on the next miss.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=512 * 1024 * 1024,
+                 ttl=3600, spill_dir=None, factory=MatchEvents, name='events'):
+        # Builds the cached object from what the loader returns
+        self.factory = factory
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()  # match_id -> (events, nbytes, expires_at)
+        # Expired entries already counted in expirations
+        self._expired = set()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.spills = 0
+        self.spill_hits = 0
+
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls, **kwargs):
+        """Build the cache from the API_EVENTS_CACHE setting"""
+        options = getattr(settings, 'API_EVENTS_CACHE', {})
+        kwargs.setdefault('spill_dir', options.get('SPILL_DIR'))
+        return cls(
+            max_entries=options.get('MAX_ENTRIES', 64),
+            max_bytes=options.get('MAX_BYTES', 512 * 1024 * 1024),
+            ttl=options.get('TTL', 3600),
+            **kwargs
+        )
+
+    def get(self, match_id):
+        """Return the cached MatchEvents for a match, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(match_id)
+            if entry is not None:
+                events, nbytes, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(match_id)
+                    self.hits += 1
+                    return events
+                if match_id not in self._expired:
+                    self._expired.add(match_id)
+                    self.expirations += 1
+
+        frame = self._read_spill(match_id)
+        if frame is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.spill_hits += 1
+        events = self.factory(frame)
+        self.set(match_id, events)
+        return events
+
+    def set(self, match_id, events):
+        """Insert MatchEvents, evicting least recently used entries as needed"""
+        with self._lock:
+            evicted = self._store(match_id, events)
+
+        # Parquet writes happen outside the lock so readers are not blocked
+        if self.spill_dir:
+            for evicted_id, evicted_events in evicted:
+                self._write_spill(evicted_id, evicted_events.frame)
+
+    def get_stale(self, match_id):
+        """Return a match's entry even if it has expired, without counting a lookup"""
+        with self._lock:
+            entry = self._entries.get(match_id)
+        return entry[0] if entry is not None else None
+
+    def get_or_load(self, match_id, loader):
+        """Return the cached MatchEvents, indexing ``loader()``'s frame on a miss.
+
+        An expired entry is returned as is, marked stale, and reloaded in
+        the background.
+        """
+        events = self.get(match_id)
+        if events is not None:
+            return events
+
+        key = (self.name, match_id)
+        load = lambda: self._load(match_id, loader)
+        stale = self.get_stale(match_id)
+        if stale is not None:
+            mark_stale(self.name, match_id)
+            single_flight.refresh(key, load)
+            return stale
+
+        # Concurrent misses for a match share one fetch and index build
+        return single_flight.do(key, load)
+
+    def _load(self, match_id, loader):
+        frame = loader()
+        if frame is None:
+            return None
+        events = self.factory(frame)
+        self.set(match_id, events)
+        return events
+
+    def contains(self, match_id):
+        """Whether a match is cached in memory or spilled, without counting a lookup"""
+        with self._lock:
+            entry = self._entries.get(match_id)
+            if entry is not None and (entry[2] is None or entry[2] > time.monotonic()):
+                return True
+        return bool(self.spill_dir) and os.path.exists(self._spill_path(match_id))
+
+    def persist(self, match_id):
+        """Write a cached match to the spill directory so other processes can load it"""
+        with self._lock:
+            entry = self._entries.get(match_id)
+        if entry is None or not self.spill_dir:
+            return False
+        self._write_spill(match_id, entry[0].frame)
+        return True
+
+    def invalidate(self, match_id=None):
+        """Drop one match (or everything) from memory and the spill directory"""
+        with self._lock:
+            match_ids = [match_id] if match_id is not None else list(
+                self._entries)
+            for key in match_ids:
+                if key in self._entries:
+                    self._remove(key)
+            if self.spill_dir:
+                if match_id is not None:
+                    paths = [self._spill_path(match_id)]
+                else:
+                    paths = [os.path.join(self.spill_dir, name)
+                             for name in os.listdir(self.spill_dir)
+                             if name.endswith('.parquet')]
+                for path in paths:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'spills': self.spills,
+                'spill_hits': self.spill_hits,
+            }
+
+    def memory_report(self):
+        """Original and compact size of each cached match that reports one"""
+        with self._lock:
+            entries = [(match_id, entry[0]) for match_id, entry in self._entries.items()]
+        report = {}
+        for match_id, events in entries:
+            if hasattr(events, 'memory_report'):
+                sizes = events.memory_report()
+                report[match_id] = {key: sizes[key] for key in (
+                    'rows', 'original_bytes', 'compact_bytes', 'saved_pct')}
+        return report
+
+    def _store(self, match_id, events):
+        """Insert under the lock, returning the entries evicted to make room"""
+        if match_id in self._entries:
+            self._remove(match_id)
+
+        nbytes = events.nbytes
+        if nbytes > self.max_bytes:
+            logger.warning(
+                f"Events for match {match_id} ({nbytes} bytes) exceed the cache size limit")
+            return [(match_id, events)]
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._entries[match_id] = (events, nbytes, expires_at)
+        self.current_bytes += nbytes
+
+        evicted = []
+        while (len(self._entries) > self.max_entries
+               or self.current_bytes > self.max_bytes):
+            evicted_id, (evicted_events, _, _) = next(iter(self._entries.items()))
+            self._remove(evicted_id)
+            self.evictions += 1
+            evicted.append((evicted_id, evicted_events))
+        return evicted
+
+    def _remove(self, match_id):
+        _, nbytes, _ = self._entries.pop(match_id)
+        self.current_bytes -= nbytes
+        self._expired.discard(match_id)
+
+    def _spill_path(self, match_id):
+        return os.path.join(self.spill_dir, f"{match_id}.parquet")
+
+    def _write_spill(self, match_id, frame):
+        """Write an evicted frame to Parquet, if spilling is enabled"""
+        if not self.spill_dir:
+            return
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.warning("pyarrow is not installed, events cache spill disabled")
+            self.spill_dir = None
+            return
+
+        try:
+            # Nested values (locations, tactics, freeze frames) are stored
+            # as JSON text so they come back exactly as statsbombpy built them
+            frame = frame.copy()
+            json_columns = []
+            for col in frame.select_dtypes(include=['object']).columns:
+                values = frame[col].dropna()
+                if values.map(lambda v: isinstance(v, (list, dict))).any():
+                    frame[col] = frame[col].map(
+                        lambda v: json.dumps(v) if isinstance(v, (list, dict)) else v)
+                    json_columns.append(col)
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[b'api.json_columns'] = json.dumps(json_columns).encode()
+            pq.write_table(table.replace_schema_metadata(metadata),
+                           self._spill_path(match_id))
+            self.spills += 1
+        except Exception as e:
+            logger.warning(f"Failed to spill events for match {match_id}: {str(e)}")
+
+    def _read_spill(self, match_id):
+        """Load a spilled frame if it exists and has not expired"""
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(match_id)
+        if not os.path.exists(path):
+            return None
+        if self.ttl and os.path.getmtime(path) + self.ttl < time.time():
+            os.remove(path)
+            return None
+
+        try:
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(path)
+            json_columns = json.loads(
+                (table.schema.metadata or {}).get(b'api.json_columns', b'[]'))
+            frame = table.to_pandas()
+            # Parquet nulls come back as None; statsbombpy frames use NaN
+            for col in json_columns:
+                frame[col] = frame[col].map(
+                    lambda v: json.loads(v) if isinstance(v, str) else np.nan)
+            return frame
+        except Exception as e:
+            logger.warning(
+                f"Failed to read spilled events for match {match_id}: {str(e)}")
+            return None
+
+
+class ResponseCache:
+    """LRU cache of pre-rendered per-match response bodies.
+
+    Keys are ``(kind, match_id)`` pairs such as ``('lineups', 3788741)`` so
+    one match's processed responses can be invalidated together. Expired
+    bodies are kept until evicted so ``get_or_load`` can serve them stale.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (kind, match_id) -> (content, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls):
+        """Build the cache from the API_RESPONSE_CACHE setting"""
+        options = getattr(settings, 'API_RESPONSE_CACHE', {})
+        return cls(
+            max_entries=options.get('MAX_ENTRIES', 256),
+            ttl=options.get('TTL', 3600),
+        )
+
+    def get(self, kind, match_id):
+        """Return the cached body for a match, or None on a miss"""
+        key = (kind, match_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                content, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return content
+            self.misses += 1
+        return None
+
+    def get_stale(self, kind, match_id):
+        """Return a body even if it has expired, without counting a lookup"""
+        with self._lock:
+            entry = self._entries.get((kind, match_id))
+        return entry[0] if entry is not None else None
+
+    def get_or_load(self, kind, match_id, loader):
+        """Return the cached body, or ``loader()``'s on a miss.
+
+        ``loader`` stores the body itself. An expired body is returned
+        marked stale while ``loader`` runs in the background.
+        """
+        content = self.get(kind, match_id)
+        if content is not None:
+            return content
+
+        stale = self.get_stale(kind, match_id)
+        if stale is not None:
+            mark_stale(kind, match_id)
+            single_flight.refresh((kind, match_id), loader)
+            return stale
+
+        # Concurrent misses for a body share one load
+        return single_flight.do((kind, match_id), loader)
+
+    def set(self, kind, match_id, content):
+        """Store a body, evicting least recently used entries as needed"""
+        key = (kind, match_id)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (content, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def contains(self, kind, match_id):
+        """Whether a body is cached, without counting a lookup"""
+        with self._lock:
+            entry = self._entries.get((kind, match_id))
+            return entry is not None and (
+                entry[1] is None or entry[1] > time.monotonic())
+
+    def invalidate(self, match_id=None, kind=None):
+        """Drop cached bodies for a match and/or kind, or everything"""
+        with self._lock:
+            for key in list(self._entries):
+                if ((match_id is None or key[1] == match_id)
+                        and (kind is None or key[0] == kind)):
+                    del self._entries[key]
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0,
+                'evictions': self.evictions,
+            }
+
+
+events_cache = EventsCache.from_settings()
+# Raw event dicts for the 'raw' events pipeline; dicts are not spilled
+raw_events_cache = EventsCache.from_settings(
+    spill_dir=None, factory=RawMatchEvents, name='raw-events')
+# StatsBomb 360 freeze frames as MatchFrames arrays
+frames_cache = EventsCache.from_settings(
+    spill_dir=None, factory=MatchFrames, name='frames')
+response_cache = ResponseCache.from_settings()
+
+
+def indexed_events_cache():
+    """The cache the player views read: raw_events_cache when
+    API_EVENTS_PIPELINE is 'raw', else events_cache"""
+    if getattr(settings, 'API_EVENTS_PIPELINE', 'dataframe') == 'raw':
+        return raw_events_cache
+    return events_cache
+
+
+def get_indexed_events(match_id, source):
+    """Return a match's indexed events from the pipeline's cache, loading from ``source``"""
+    cache = indexed_events_cache()
+    if cache is raw_events_cache:
+        return cache.get_or_load(match_id, lambda: source.raw_events(match_id))
+    return cache.get_or_load(match_id, lambda: source.events(match_id))
@@ -0,0 +1,280 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from .breaker import circuit_breakers, mark_stale
+from .sanitize import sanitize_records
+from .singleflight import single_flight
+from .sources import default_data_source
+
+logger = logging.getLogger(__name__)
+
+
+class CompetitionCatalogue:
+    """In-process catalogue of competitions and seasons.
+
+    Loads the competitions frame once, indexes it by competition_id and by
+    (competition_id, season_id), and keeps the JSON bodies of the
+    competitions and seasons endpoints pre-rendered. After ``ttl`` seconds
+    the next request triggers a background refresh while the current
+    snapshot keeps being served. A failed refresh is retried
+    ``retry_after`` seconds later.
+    """
+
+    def __init__(self, loader, ttl=21600, retry_after=30):
+        self.loader = loader
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._snapshot = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def competitions_json(self):
+        """Pre-rendered JSON for every competition season"""
+        return self._get_snapshot()['competitions_json']
+
+    def seasons_json(self, competition_id):
+        """Pre-rendered JSON for the seasons of one competition"""
+        snapshot = self._get_snapshot()
+        return snapshot['seasons_json'].get(
+            competition_id, snapshot['empty_json'])
+
+    def season(self, competition_id, season_id):
+        """Return one competition season record, or None"""
+        return self._get_snapshot()['by_season'].get(
+            (competition_id, season_id))
+
+    def refresh(self):
+        """Reload competitions synchronously and swap in the new snapshot"""
+        snapshot = self._build(self.loader())
+        with self._lock:
+            self._snapshot = snapshot
+            self._loaded_at = time.monotonic()
+        return snapshot
+
+    def _get_snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+            if snapshot is None:
+                # Concurrent first requests share one load
+                return single_flight.do(('competitions', None), self.refresh)
+
+        if self.ttl and time.monotonic() - self._loaded_at > self.ttl:
+            mark_stale('competitions', None)
+            self._refresh_in_background()
+        return snapshot
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh competitions catalogue: {str(e)}")
+                with self._lock:
+                    # Keep serving the snapshot until the retry is due,
+                    # instead of starting a refresh on every request
+                    self._loaded_at = time.monotonic() - self.ttl + self.retry_after
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name='competition-catalogue-refresh',
+                         daemon=True).start()
+
+    def _build(self, competitions):
+        """Index competition records and render the endpoint bodies"""
+        renderer = JSONRenderer()
+        records = sanitize_records(competitions)
+
+        by_competition = {}
+        by_season = {}
+        for record in records:
+            by_competition.setdefault(record['competition_id'], []).append(record)
+            by_season[(record['competition_id'], record['season_id'])] = record
+
+        return {
+            'by_competition': by_competition,
+            'by_season': by_season,
+            'competitions_json': renderer.render(records),
+            'seasons_json': {
+                competition_id: renderer.render(seasons)
+                for competition_id, seasons in by_competition.items()
+            },
+            'empty_json': renderer.render([]),
+        }
+
+
+class SeasonMatches:
+    """Cleaned matches of one competition season with team and date indexes.
+
+    The unfiltered matches body and the competition-info header are rendered
+    once; ``select`` answers team and date-range filters from the indexes.
+    """
+
+    info_fields = ['competition', 'season', 'competition_stage']
+
+    def __init__(self, matches):
+        renderer = JSONRenderer()
+        self.records = sanitize_records(matches)
+        self.matches_json = renderer.render(self.records)
+
+        first_match = self.records[0]
+        self.info = {field: first_match.get(field) for field in self.info_fields}
+        self.info_json = renderer.render(self.info)
+
+        # team name -> positions of its home and away matches
+        self._by_team = {}
+        for position, record in enumerate(self.records):
+            for side in ('home_team', 'away_team'):
+                team = record.get(side)
+                if team is not None:
+                    positions = self._by_team.setdefault(team, [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+
+        # ISO match dates sorted once, so a date range is two bisections
+        dated = sorted(
+            (record['match_date'], position)
+            for position, record in enumerate(self.records)
+            if isinstance(record.get('match_date'), str))
+        self._dates = [date for date, _ in dated]
+        self._date_positions = [position for _, position in dated]
+
+    def match_ids(self):
+        """Return the season's match ids in listing order"""
+        return [record['match_id'] for record in self.records]
+
+    def teams(self):
+        """Return the names of all teams playing in the season"""
+        return sorted(self._by_team)
+
+    def select(self, team=None, date_from=None, date_to=None):
+        """Return match records for a team and/or an inclusive ISO date range"""
+        positions = None
+        if team is not None:
+            positions = set(self._by_team.get(team, []))
+
+        if date_from is not None or date_to is not None:
+            start = bisect_left(self._dates, date_from) if date_from else 0
+            end = (bisect_right(self._dates, date_to) if date_to
+                   else len(self._dates))
+            in_range = set(self._date_positions[start:end])
+            positions = in_range if positions is None else positions & in_range
+
+        if positions is None:
+            return self.records
+        return [self.records[position] for position in sorted(positions)]
+
+
+class SeasonMatchesCache:
+    """LRU cache of SeasonMatches keyed by (competition_id, season_id)"""
+
+    def __init__(self, max_entries=128, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (season, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls):
+        """Build the cache from the API_MATCHES_CACHE setting"""
+        options = getattr(settings, 'API_MATCHES_CACHE', {})
+        return cls(
+            max_entries=options.get('MAX_ENTRIES', 128),
+            ttl=options.get('TTL', 3600),
+        )
+
+    def get(self, competition_id, season_id):
+        """Return the cached SeasonMatches, or None on a miss"""
+        key = (competition_id, season_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                season, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return season
+            self.misses += 1
+        return None
+
+    def get_or_load(self, competition_id, season_id, loader):
+        """Return the season's matches, indexing ``loader()``'s frame on a miss.
+
+        Returns None when the season has no matches; that is not cached.
+        An expired entry is returned marked stale and reloaded in the
+        background.
+        """
+        season = self.get(competition_id, season_id)
+        if season is not None:
+            return season
+
+        key = (competition_id, season_id)
+        load = lambda: self._load(competition_id, season_id, loader)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            mark_stale('matches', key)
+            single_flight.refresh(('matches', key), load)
+            return entry[0]
+
+        # Concurrent misses for a season share one fetch
+        return single_flight.do(('matches', key), load)
+
+    def _load(self, competition_id, season_id, loader):
+        matches = loader()
+        if matches is None or matches.empty:
+            return None
+        season = SeasonMatches(matches)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[(competition_id, season_id)] = (season, expires_at)
+            self._entries.move_to_end((competition_id, season_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return season
+
+    def invalidate(self, competition_id=None, season_id=None):
+        """Drop one season (or everything) from the cache"""
+        with self._lock:
+            if competition_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop((competition_id, season_id), None)
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0,
+                'evictions': self.evictions,
+            }
+
+
+competition_catalogue = CompetitionCatalogue(
+    lambda: default_data_source().competitions(),
+    ttl=getattr(settings, 'API_CATALOGUE_TTL', 21600),
+    retry_after=circuit_breakers['competitions'].reset_timeout)
+season_matches_cache = SeasonMatchesCache.from_settings()
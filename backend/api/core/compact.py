@@ -0,0 +1,246 @@
+"""Compact in-memory layout for cached event frames.
+
+statsbombpy frames are wide and object-heavy: most columns are NaN for all
+but a few event types, strings repeat on every row, flags are Python bools
+in object columns and locations are Python lists. ``CompactFrame`` stores
+such a frame as
+
+- dropped all-null columns (recreated on read),
+- categoricals for low-cardinality string columns,
+- int8 codes for True/False/missing flag columns,
+- the smallest int dtype for ints,
+- float32 for floats with at most 7 significant decimals, held as
+  ``value * 10**scale`` (an integer, so exact in float32) and divided
+  back on read,
+- such float32 x/y/z arrays plus a length per row for list-of-float
+  locations,
+
+and rebuilds an identical frame, or any subset of its rows, on read.
+"""
+from .lazy import np, pd
+
+# Object columns whose distinct strings are at most this share of their
+# non-null values are stored as categoricals
+CATEGORY_RATIO = 0.5
+
+_MISSING_FLAG = -1
+
+# Integers up to 2**24 are exact in float32
+_FLOAT32_INT_LIMIT = 2 ** 24
+_MAX_SCALE = 7
+
+
+def _narrow_floats(values):
+    """Return (float32 scaled values, scale) if float64 values fit, else None"""
+    finite = values[~np.isnan(values)]
+    for scale in range(_MAX_SCALE + 1):
+        scaled = np.round(finite * 10.0 ** scale)
+        if np.abs(scaled).max(initial=0) >= _FLOAT32_INT_LIMIT:
+            return None
+        # Dividing the integer back is correctly rounded, like parsing it
+        restored = scaled / 10.0 ** scale
+        if (np.array_equal(restored, finite)
+                and np.array_equal(np.signbit(restored), np.signbit(finite))):
+            return np.round(values * 10.0 ** scale).astype(np.float32), scale
+    return None
+
+
+def _widen(values, scale):
+    return values.astype(np.float64) / 10.0 ** scale
+
+
+class CompactFrame:
+    """A DataFrame kept in a compact dtype layout, rebuilt exactly on read.
+
+    ``keep_categorical`` names columns that are converted to categoricals
+    and stay so in the rebuilt frame (the index columns of MatchEvents);
+    every other column comes back with its original dtype and values. The
+    given frame is not modified.
+    """
+
+    def __init__(self, frame, keep_categorical=()):
+        self.columns = list(frame.columns)
+        self.index = frame.index
+        self.original_nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        self.keep_categorical = set(keep_categorical)
+
+        self.arrays = {}            # column -> stored ndarray or Categorical
+        self.null_columns = {}      # column -> (dtype, fill value)
+        self.categorical_columns = []
+        self.flag_columns = {}      # column -> int8 codes
+        self.downcast_columns = {}  # column -> (original dtype, float scale)
+        self.location_columns = {}  # column -> (lengths, [(x, scale), ...])
+
+        for column in self.columns:
+            stored = self._compact_column(column, frame[column])
+            if stored is not None:
+                self.arrays[column] = stored
+        self.nbytes = self._measure()
+
+    def _compact_column(self, column, series):
+        """Return the column's stored array, or None if kept elsewhere"""
+        if column in self.keep_categorical and series.dtype.name != 'category':
+            series = series.astype('category')
+        dtype = series.dtype
+        if dtype.name == 'category':
+            if column not in self.keep_categorical:
+                self.categorical_columns.append(column)
+            return series.array
+
+        if dtype.kind == 'i':
+            narrow = pd.to_numeric(series, downcast='integer').to_numpy()
+            if narrow.dtype != dtype:
+                self.downcast_columns[column] = (dtype, None)
+            return narrow
+
+        if dtype.kind == 'f':
+            values = series.to_numpy()
+            if np.isnan(values).all():
+                self.null_columns[column] = (dtype, np.nan)
+                return None
+            narrow = _narrow_floats(values) if dtype == np.float64 else None
+            if narrow is None:
+                return values
+            self.downcast_columns[column] = (dtype, narrow[1])
+            return narrow[0]
+
+        if dtype != object:
+            return series.array
+
+        values = series.to_numpy()
+        missing = pd.isna(values)
+        if missing.all():
+            self.null_columns[column] = (
+                dtype, None if len(values) and values[0] is None else np.nan)
+            return None
+
+        present = values[~missing]
+        types = set(map(type, present))
+        if types == {bool}:
+            codes = np.full(len(values), _MISSING_FLAG, dtype=np.int8)
+            codes[~missing] = present.astype(bool)
+            self.flag_columns[column] = codes
+            return None
+
+        if types == {str}:
+            if column in self.keep_categorical or (
+                    len(set(present)) <= CATEGORY_RATIO * len(present)):
+                if column not in self.keep_categorical:
+                    self.categorical_columns.append(column)
+                return pd.Categorical(values)
+            return values
+
+        if types == {list}:
+            location = self._compact_locations(values, missing, present)
+            if location is not None:
+                self.location_columns[column] = location
+                return None
+        return values
+
+    def _compact_locations(self, values, missing, present):
+        """float32 x/y(/z) arrays for lists of 2-3 floats, if lossless"""
+        lengths = np.zeros(len(values), dtype=np.int8)
+        lengths[~missing] = [len(value) for value in present]
+        if lengths[~missing].min() < 2 or lengths.max() > 3:
+            return None
+        if any(type(v) is not float for value in present for v in value):
+            return None
+
+        width = int(lengths.max())
+        coords = np.full((len(values), width), np.nan)
+        for row, value in zip(np.flatnonzero(~missing), present):
+            coords[row, :len(value)] = value
+        axes = []
+        for axis in range(width):
+            narrow = _narrow_floats(coords[:, axis])
+            if narrow is None:
+                return None
+            axes.append(narrow)
+        return lengths, axes
+
+    def __len__(self):
+        return len(self.index)
+
+    def _measure(self):
+        nbytes = int(self.index.memory_usage(deep=True))
+        nbytes += sum(int(pd.Series(values, copy=False).memory_usage(
+            index=False, deep=True)) for values in self.arrays.values())
+        nbytes += sum(codes.nbytes for codes in self.flag_columns.values())
+        nbytes += sum(lengths.nbytes + sum(axis.nbytes for axis, _ in axes)
+                      for lengths, axes in self.location_columns.values())
+        return nbytes
+
+    def column(self, column):
+        """The stored values of a column kept in ``arrays``"""
+        return self.arrays[column]
+
+    def take(self, positions=None, columns=None):
+        """Rebuild the frame, or the rows at ``positions``, with original dtypes.
+
+        ``columns`` limits the rebuilt frame to some of the stored columns.
+        """
+        index = self.index if positions is None else self.index[positions]
+        size = len(index)
+        if columns is None:
+            columns = self.columns
+
+        data = {}
+        for column in columns:
+            if column in self.null_columns:
+                dtype, fill = self.null_columns[column]
+                values = np.empty(size, dtype=dtype)
+                values.fill(fill)
+                data[column] = values
+            elif column in self.flag_columns:
+                codes = self.flag_columns[column]
+                if positions is not None:
+                    codes = codes[positions]
+                values = np.empty(size, dtype=object)
+                values.fill(np.nan)
+                values[codes == 1] = True
+                values[codes == 0] = False
+                data[column] = values
+            elif column in self.location_columns:
+                data[column] = self._take_locations(column, positions, size)
+            else:
+                values = self.arrays[column]
+                if positions is not None:
+                    values = values[positions]
+                if column in self.downcast_columns:
+                    dtype, scale = self.downcast_columns[column]
+                    values = (values.astype(dtype) if scale is None
+                              else _widen(values, scale))
+                elif column in self.categorical_columns:
+                    values = np.asarray(values, dtype=object)
+                data[column] = values
+        return pd.DataFrame(data, index=index, columns=columns)
+
+    def _take_locations(self, column, positions, size):
+        lengths, axes = self.location_columns[column]
+        if positions is not None:
+            lengths = lengths[positions]
+            axes = [(axis[positions], scale) for axis, scale in axes]
+        coords = list(zip(*(_widen(axis, scale).tolist() for axis, scale in axes)))
+
+        values = np.empty(size, dtype=object)
+        values.fill(np.nan)
+        for row in np.flatnonzero(lengths):
+            values[row] = list(coords[row][:lengths[row]])
+        return values
+
+    def report(self):
+        """Memory used before and after compaction, and what was changed"""
+        nbytes = self.nbytes
+        return {
+            'rows': len(self),
+            'columns': len(self.columns),
+            'original_bytes': self.original_nbytes,
+            'compact_bytes': nbytes,
+            'saved_pct': round((1 - nbytes / self.original_nbytes) * 100, 1)
+            if self.original_nbytes else 0,
+            'dropped_null_columns': sorted(self.null_columns),
+            'categorical_columns': sorted(self.categorical_columns),
+            'flag_columns': sorted(self.flag_columns),
+            'downcast_columns': sorted(self.downcast_columns),
+            'location_columns': sorted(self.location_columns),
+        }
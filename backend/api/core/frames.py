@@ -0,0 +1,132 @@
+from .lazy import np
+
+# Goal posts of the goal the acting team attacks, in StatsBomb pitch units
+GOAL_X = 120.0
+LEFT_POST_Y = 36.0
+RIGHT_POST_Y = 44.0
+
+
+def to_floats(values):
+    """Return float32 values as the shortest Python floats that round-trip"""
+    # float32 -> str picks the shortest repr, so 85.9 stays 85.9
+    return values.astype(str).astype(np.float64).tolist()
+
+
+class MatchFrames:
+    """StatsBomb 360 freeze frames of a match as struct-of-arrays.
+
+    Every visible player of every frame is one row of flat arrays (float32
+    ``x``/``y`` and boolean ``teammate``/``actor``/``keeper`` flags). Frame
+    ``i`` owns rows ``offsets[i]:offsets[i + 1]``; visible areas are stored
+    the same way as float32 polygon vertices. Nothing is kept per player as
+    a Python object.
+    """
+
+    def __init__(self, frames):
+        self.event_ids = [frame['event_uuid'] for frame in frames]
+        self.positions = {
+            event_id: position for position, event_id in enumerate(self.event_ids)}
+
+        players = [frame.get('freeze_frame') or [] for frame in frames]
+        areas = [frame.get('visible_area') or [] for frame in frames]
+        self.offsets = np.zeros(len(frames) + 1, dtype=np.int32)
+        np.cumsum([len(p) for p in players], out=self.offsets[1:])
+        self.area_offsets = np.zeros(len(frames) + 1, dtype=np.int32)
+        np.cumsum([len(a) // 2 for a in areas], out=self.area_offsets[1:])
+
+        rows = [player for frame_players in players for player in frame_players]
+        locations = np.array(
+            [player['location'][:2] for player in rows],
+            dtype=np.float32).reshape(-1, 2)
+        self.x = np.ascontiguousarray(locations[:, 0])
+        self.y = np.ascontiguousarray(locations[:, 1])
+        self.teammate = np.array([bool(p.get('teammate')) for p in rows], dtype=bool)
+        self.actor = np.array([bool(p.get('actor')) for p in rows], dtype=bool)
+        self.keeper = np.array([bool(p.get('keeper')) for p in rows], dtype=bool)
+
+        area = np.array([v for a in areas for v in a[:len(a) // 2 * 2]],
+                        dtype=np.float32).reshape(-1, 2)
+        self.area_x = np.ascontiguousarray(area[:, 0])
+        self.area_y = np.ascontiguousarray(area[:, 1])
+
+    def __len__(self):
+        return len(self.event_ids)
+
+    @property
+    def nbytes(self):
+        arrays = [self.offsets, self.area_offsets, self.x, self.y, self.teammate,
+                  self.actor, self.keeper, self.area_x, self.area_y]
+        # Event ids are 36-character strings, plus the lookup dict
+        return (sum(a.nbytes for a in arrays)
+                + len(self.event_ids) * (36 + 49 + 8) * 2)
+
+    def frame(self, event_id):
+        """Return one event's freeze frame, or None if it has none"""
+        position = self.positions.get(event_id)
+        if position is None:
+            return None
+
+        rows = slice(self.offsets[position], self.offsets[position + 1])
+        area = slice(self.area_offsets[position], self.area_offsets[position + 1])
+        players = [
+            {'teammate': teammate, 'actor': actor, 'keeper': keeper,
+             'location': [x, y]}
+            for teammate, actor, keeper, x, y in zip(
+                self.teammate[rows].tolist(), self.actor[rows].tolist(),
+                self.keeper[rows].tolist(), to_floats(self.x[rows]),
+                to_floats(self.y[rows]))
+        ]
+        return {
+            'event_id': event_id,
+            'visible_area': [list(vertex) for vertex in zip(
+                to_floats(self.area_x[area]), to_floats(self.area_y[area]))],
+            'freeze_frame': players,
+        }
+
+    def defenders_between(self, event_ids, ball_x, ball_y):
+        """Count opponents inside the ball-to-goal triangle for each event.
+
+        The triangle joins the ball location to both goal posts. Returns
+        ``(defenders, keeper_in_cone, visible)`` arrays aligned with
+        ``event_ids``; events without a frame get -1 defenders and visible.
+        """
+        positions = np.array(
+            [self.positions.get(event_id, -1) for event_id in event_ids],
+            dtype=np.int64)
+        has_frame = positions >= 0
+        starts = self.offsets[positions[has_frame]]
+        counts = self.offsets[positions[has_frame] + 1] - starts
+
+        # Row index and owning event of every player in the selected frames
+        owners = np.repeat(np.flatnonzero(has_frame), counts)
+        rows = (np.repeat(starts - np.cumsum(counts) + counts, counts)
+                + np.arange(counts.sum()))
+
+        px, py = self.x[rows], self.y[rows]
+        bx = np.asarray(ball_x, dtype=np.float32)[owners]
+        by = np.asarray(ball_y, dtype=np.float32)[owners]
+        inside = _in_triangle(
+            px, py, bx, by, GOAL_X, LEFT_POST_Y, GOAL_X, RIGHT_POST_Y)
+        opponent = inside & ~self.teammate[rows]
+        keeper = self.keeper[rows]
+
+        size = len(event_ids)
+        defenders = np.bincount(
+            owners, weights=opponent & ~keeper, minlength=size).astype(np.int64)
+        keeper_in_cone = np.bincount(
+            owners, weights=opponent & keeper, minlength=size) > 0
+        visible = np.zeros(size, dtype=np.int64)
+        visible[has_frame] = counts
+        defenders[~has_frame] = -1
+        visible[~has_frame] = -1
+        return defenders, keeper_in_cone, visible
+
+
+def _in_triangle(px, py, ax, ay, bx, by, cx, cy):
+    """Vectorized point-in-triangle test, boundary included"""
+    d1 = (px - bx) * (ay - by) - (ax - bx) * (py - by)
+    d2 = (px - cx) * (by - cy) - (bx - cx) * (py - cy)
+    d3 = (px - ax) * (cy - ay) - (cx - ax) * (py - ay)
+    negative = (d1 < 0) | (d2 < 0) | (d3 < 0)
+    positive = (d1 > 0) | (d2 > 0) | (d3 > 0)
+    return ~(negative & positive)
@@ -1,8 +1,7 @@
 from api.core.base import BaseStatsBombView
 from rest_framework.response import Response
-from statsbombpy import sb
-import pandas as pd
-import numpy as np
+from api.core.lazy import np, pd
+from api.core.raw import RawMatchEvents
 import logging
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,34 @@
+"""Heavy dependencies of the api views, imported on first use.
+
+pandas, numpy and statsbombpy account for most of a worker's startup time.
+The proxies below stand in for those modules and import them the first
+time an attribute is read, so processes that never serve an api view (the
+sbapi-only URL profile, management commands) never load them.
+"""
+import importlib
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name):
+        self._lazy_name = name
+
+    def _load(self):
+        module = importlib.import_module(self._lazy_name)
+        # Later lookups find the attributes directly, without __getattr__
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self._lazy_name}'>"
+
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+sb = LazyModule('statsbombpy.sb')
+sb_entities = LazyModule('statsbombpy.entities')
+sb_helpers = LazyModule('statsbombpy.helpers')
@@ -0,0 +1,85 @@
+from .compact import CompactFrame
+from .lazy import np, pd
+
+# Columns stored as categoricals; they are repeated on every event row
+CATEGORICAL_COLUMNS = ['player', 'team', 'type']
+
+
+class MatchEvents:
+    """A match events frame plus a (player, type) -> row positions index.
+
+    Built once when a match is loaded into the events cache, so player
+    views look up their rows in O(k) instead of scanning the ``player``
+    and ``type`` columns of the whole match on every request. The frame is
+    held as a CompactFrame, with the index columns as categoricals;
+    ``frame`` and ``player_events`` rebuild the original columns and values.
+    The given frame is left as it was.
+    """
+
+    def __init__(self, frame):
+        self.compact = CompactFrame(frame, keep_categorical=CATEGORICAL_COLUMNS)
+
+        if 'player' in self.compact.arrays and 'type' in self.compact.arrays:
+            frame = pd.DataFrame({
+                'player': self.compact.column('player'),
+                'type': self.compact.column('type'),
+            })
+            self._player_types = frame.groupby(
+                ['player', 'type'], observed=True, sort=False).indices
+            self._players = frame.groupby(
+                'player', observed=True, sort=False).indices
+        else:
+            self._player_types = {}
+            self._players = {}
+
+        if 'type' in self.compact.arrays:
+            self._types = pd.DataFrame({'type': self.compact.column('type')}).groupby(
+                'type', observed=True, sort=False).indices
+        else:
+            self._types = {}
+
+        self.nbytes = self.compact.nbytes + sum(
+            positions.nbytes for index in (self._player_types, self._players, self._types)
+            for positions in index.values())
+
+    @property
+    def frame(self):
+        """The full match frame, as statsbombpy built it"""
+        return self.compact.take()
+
+    def memory_report(self):
+        """Memory the compact layout saves for this match"""
+        return self.compact.report()
+
+    def player_rows(self, player_name, types=None):
+        """Return sorted row positions for a player, optionally by event type"""
+        if types is None:
+            return self._players.get(player_name, np.empty(0, dtype=np.intp))
+
+        partitions = [self._player_types[(player_name, event_type)]
+                      for event_type in types
+                      if (player_name, event_type) in self._player_types]
+        if not partitions:
+            return np.empty(0, dtype=np.intp)
+        if len(partitions) == 1:
+            return partitions[0]
+        return np.sort(np.concatenate(partitions))
+
+    def player_events(self, player_name, types=None):
+        """Return the player's events (in match order), optionally by type"""
+        return self.compact.take(self.player_rows(player_name, types))
+
+    def type_rows(self, types):
+        """Return sorted row positions of the events of some types"""
+        partitions = [self._types[event_type] for event_type in types
+                      if event_type in self._types]
+        if not partitions:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(partitions))
+
+    def type_events(self, types, columns=None):
+        """Return the events of some types (in match order), optionally
+        only the given columns; columns the match lacks are left out"""
+        if columns is not None:
+            columns = [col for col in columns if col in self.compact.columns]
+        return self.compact.take(self.type_rows(types), columns)
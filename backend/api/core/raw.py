@@ -0,0 +1,199 @@
+import math
+import sys
+
+from .lazy import np, pd, sb_helpers
+
+# Marks a column an event does not have, as opposed to an explicit null
+_MISSING = object()
+
+# Column dtypes the wide statsbombpy frame ends up with after concat
+_FLOAT, _INT, _BOOL, _OBJECT = 'float', 'int', 'bool', 'object'
+
+
+def _clean_float(value):
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _clean_object(value):
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, list):
+        return [None if isinstance(x, float) and x != x else x for x in value]
+    return value
+
+
+# Column kind -> JSON-safe value of a non-None value, as sanitize_records
+# gives for a column of that dtype
+_CLEANERS = {
+    _FLOAT: _clean_float,
+    _INT: int,
+    _BOOL: bool,
+    _OBJECT: _clean_object,
+}
+
+
+def _deep_size(value):
+    """sys.getsizeof of a value plus the lists and dicts nested in it"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(item) for item in value.values())
+    elif isinstance(value, list):
+        size += sum(_deep_size(item) for item in value)
+    return size
+
+
+class RawMatchEvents:
+    """Match events kept as flattened per-event dicts, without the wide frame.
+
+    Events are flattened and ordered the way statsbombpy builds its events
+    frame (grouped by type, in order of first appearance), and indexed by
+    (player, type). ``select_records`` returns a player's events as the
+    JSON-safe dicts the player views build from the match frame, straight
+    from the flattened dicts; ``player_events`` returns a frame of just the
+    requested rows with the match frame's columns and dtypes, for the
+    NDJSON responses that stream frames.
+    """
+
+    def __init__(self, events):
+        if isinstance(events, dict):
+            events = events.values()
+
+        groups = {}
+        for event in events:
+            groups.setdefault(event['type']['name'], []).append(
+                sb_helpers.flatten_event(event, True))
+        self.records = [record for group in groups.values() for record in group]
+
+        self._player_types = {}
+        self._players = {}
+        self._types = {}
+        for position, record in enumerate(self.records):
+            self._types.setdefault(record['type'], []).append(position)
+            player = record.get('player')
+            if player is not None:
+                self._player_types.setdefault(
+                    (player, record['type']), []).append(position)
+                self._players.setdefault(player, []).append(position)
+
+        self.columns, self.column_kinds, self.nbytes = self._scan(self.records)
+
+    @staticmethod
+    def _scan(records):
+        """Infer each column's frame dtype and measure the records' size.
+
+        The size counts each record dict and its values, including nested
+        lists and dicts; keys are strings shared by every record and are
+        not counted.
+        """
+        present = {}
+        kinds = {}
+        nbytes = 0
+        for record in records:
+            nbytes += sys.getsizeof(record)
+            for key, value in record.items():
+                nbytes += _deep_size(value)
+                present[key] = present.get(key, 0) + 1
+                seen = kinds.setdefault(key, set())
+                seen.add(type(value))
+
+        column_kinds = {}
+        for key, seen in kinds.items():
+            complete = present[key] == len(records) and type(None) not in seen
+            values = seen - {type(None)}
+            if values and values <= {int, float}:
+                # Numeric columns with gaps become float64, like pandas does
+                column_kinds[key] = _INT if complete and values == {int} else _FLOAT
+            elif complete and values == {bool}:
+                column_kinds[key] = _BOOL
+            else:
+                column_kinds[key] = _OBJECT
+        return sorted(present), column_kinds, nbytes
+
+    def player_rows(self, player_name, types=None):
+        """Return sorted record positions for a player, optionally by event type"""
+        if types is None:
+            return self._players.get(player_name, [])
+
+        partitions = [self._player_types[(player_name, event_type)]
+                      for event_type in types
+                      if (player_name, event_type) in self._player_types]
+        if len(partitions) == 1:
+            return partitions[0]
+        return sorted(position for partition in partitions
+                      for position in partition)
+
+    def player_records(self, player_name, types=None):
+        """Return the player's flattened event dicts in match order"""
+        return [self.records[position]
+                for position in self.player_rows(player_name, types)]
+
+    def select_records(self, player_name, types, columns):
+        """Return a player's events as JSON-safe dicts of some columns.
+
+        Columns the match does not have are left out, and values are
+        converted as the column's dtype in the match frame would be, so
+        the dicts equal ``sanitize_records`` of the frame rows.
+        """
+        records = self.player_records(player_name, types)
+        columns = [column for column in columns if column in self.column_kinds]
+        cleaners = [(column, _CLEANERS[self.column_kinds[column]])
+                    for column in columns]
+        return [
+            {column: None if (value := record.get(column)) is None else clean(value)
+             for column, clean in cleaners}
+            for record in records
+        ]
+
+    def type_rows(self, types):
+        """Return sorted record positions of the events of some types"""
+        return sorted(position for event_type in types
+                      for position in self._types.get(event_type, []))
+
+    def type_events(self, types, columns=None):
+        """Return the events of some types as a frame with the match's
+        columns, or only the given ones it has"""
+        return self.frame_for(
+            [self.records[position] for position in self.type_rows(types)],
+            columns)
+
+    def player_events(self, player_name, types=None):
+        """Return the player's events as a frame with the match's columns"""
+        return self.frame_for(self.player_records(player_name, types))
+
+    def frame_for(self, records, columns=None):
+        """Build a frame for some records with the full match's columns and dtypes.
+
+        ``columns`` limits the frame to some of the match's columns.
+        """
+        columns = self.columns if columns is None else [
+            column for column in columns if column in self.column_kinds]
+        present = set()
+        for record in records:
+            present.update(record)
+
+        # Columns none of the records have are all-missing either way
+        missing = np.full(len(records), np.nan)
+        data = {}
+        for column in columns:
+            if column not in present:
+                data[column] = missing
+                continue
+
+            values = [record.get(column, _MISSING) for record in records]
+            kind = self.column_kinds[column]
+            if kind == _FLOAT:
+                data[column] = np.array(
+                    [np.nan if v is _MISSING or v is None else v for v in values],
+                    dtype=np.float64)
+            elif kind == _INT:
+                data[column] = np.array(values, dtype=np.int64)
+            elif kind == _BOOL:
+                data[column] = np.array(values, dtype=bool)
+            else:
+                # Filled one by one so list values stay single elements
+                column_values = np.empty(len(values), dtype=object)
+                for i, value in enumerate(values):
+                    column_values[i] = np.nan if value is _MISSING else value
+                data[column] = column_values
+        return pd.DataFrame(data, columns=columns)
@@ -0,0 +1,38 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+
+from .sanitize import sanitize_records
+
+
+def dumps_line(data):
+    """Encode one value as a compact JSON line, as DRF's JSONRenderer would"""
+    return json.dumps(
+        data, cls=encoders.JSONEncoder, ensure_ascii=False, allow_nan=False,
+        separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def iter_ndjson(frame, chunk_size=500):
+    """Yield a frame's rows as cleaned NDJSON, ``chunk_size`` rows at a time"""
+    for start in range(0, len(frame), chunk_size):
+        records = sanitize_records(frame.iloc[start:start + chunk_size])
+        yield b''.join(dumps_line(record) for record in records)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON, selected with ``?format=ndjson``.
+
+    Lists render one item per line and anything else as a single line.
+    Views that can stream return a StreamingHttpResponse instead.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, list):
+            return b''.join(dumps_line(item) for item in data)
+        return dumps_line(data)
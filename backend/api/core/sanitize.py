@@ -0,0 +1,79 @@
+"""Column-wise conversion of DataFrames into JSON-safe Python values.
+
+Produces the same values as the original record-by-record cleanup: NaN and
++/-inf in numeric columns become None, missing values in every other column
+become None, NumPy scalars become Python scalars and NaN items inside list
+values become None. Work is done once per column with NumPy; only columns
+that actually hold nested lists or NumPy scalars fall back to a per-value
+pass.
+"""
+from .lazy import np, pd
+
+# Value types that are already JSON-safe once missing values are None
+_PLAIN_TYPES = frozenset([str, bool, int, float, dict, type(None)])
+
+
+def _clean_value(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value) if not np.isnan(value) else None
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, (np.ndarray, list)):
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        float_types = (float, np.floating)
+        # x != x only holds for NaN, and is much cheaper than np.isnan
+        return [
+            None if isinstance(x, float_types) and x != x else x
+            for x in value
+        ]
+    return value
+
+
+def sanitize_series(series):
+    """Return the values of a Series as a JSON-safe list"""
+    dtype = series.dtype
+
+    if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+        values = series.to_numpy()
+        invalid = ~np.isfinite(values)
+        if not invalid.any():
+            return values.tolist()
+        values = values.astype(object)
+        values[invalid] = None
+        return values.tolist()
+
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iub':
+        return series.to_numpy().tolist()
+
+    # Object, categorical, datetime and extension dtypes
+    values = series.to_numpy(dtype=object)
+    missing = pd.isna(values)
+    if missing.any():
+        values = values.copy()
+        values[missing] = None
+
+    if set(map(type, values)) <= _PLAIN_TYPES:
+        return values.tolist()
+    return [_clean_value(value) for value in values]
+
+
+def sanitize_columns(df):
+    """Convert a DataFrame to a JSON-safe ``{column: [values]}`` mapping"""
+    return {
+        column: sanitize_series(df.iloc[:, position])
+        for position, column in enumerate(df.columns)
+    }
+
+
+def sanitize_records(df):
+    """Convert a DataFrame to a list of JSON-safe record dicts"""
+    columns = list(df.columns)
+    if not columns:
+        # As DataFrame.to_dict(orient='records') gives
+        return []
+    values = [sanitize_series(df.iloc[:, position])
+              for position in range(len(columns))]
+    return [dict(zip(columns, row)) for row in zip(*values)]
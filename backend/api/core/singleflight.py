@@ -0,0 +1,110 @@
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised when a follower gives up waiting for the leader's fetch"""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running (followers) wait up to ``timeout`` seconds and
+    receive the leader's result, or its exception. Nothing is kept once the
+    call finishes, so caching stays the job of the caller.
+    """
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.collapsed = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    @classmethod
+    def from_settings(cls):
+        """Build the coalescer from the API_SINGLE_FLIGHT_TIMEOUT setting"""
+        return cls(timeout=getattr(settings, 'API_SINGLE_FLIGHT_TIMEOUT', 30))
+
+    def do(self, key, fn, timeout=None):
+        """Return ``fn()``, sharing one execution between concurrent callers"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.collapsed += 1
+
+        if leader:
+            try:
+                call.result = fn()
+                return call.result
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self.errors += 1
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        timeout = self.timeout if timeout is None else timeout
+        if not call.done.wait(timeout):
+            with self._lock:
+                self.timeouts += 1
+            logger.warning(f"Timed out waiting for in-flight fetch of {key}")
+            raise SingleFlightTimeout(
+                f"Timed out after {timeout}s waiting for in-flight fetch of {key}")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def refresh(self, key, fn):
+        """Run ``fn()`` on a background thread unless a call for the key is in flight"""
+        with self._lock:
+            if key in self._calls:
+                return False
+
+        def run():
+            try:
+                self.do(key, fn)
+            except Exception as e:
+                logger.warning(f"Background refresh of {key} failed: {str(e)}")
+
+        threading.Thread(target=run, name=f"refresh-{key}", daemon=True).start()
+        return True
+
+    def stats(self):
+        """Return leader/collapsed counters and the number of calls in flight"""
+        with self._lock:
+            calls = self.leaders + self.collapsed
+            return {
+                'in_flight': len(self._calls),
+                'timeout': self.timeout,
+                'leaders': self.leaders,
+                'collapsed': self.collapsed,
+                'collapse_rate': round(self.collapsed / calls * 100, 1) if calls else 0,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+            }
+
+
+single_flight = SingleFlight.from_settings()
@@ -0,0 +1,159 @@
+import json
+import logging
+import mmap
+import os
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .breaker import GuardedSource, circuit_breakers
+from .lazy import pd, sb, sb_entities, sb_helpers
+
+try:
+    import orjson
+
+    def _loads(buffer):
+        return orjson.loads(buffer)
+except ImportError:
+    def _loads(buffer):
+        return json.loads(bytes(buffer))
+
+logger = logging.getLogger(__name__)
+
+
+class StatsBombApiSource:
+    """Data source backed by statsbombpy (StatsBomb API or hosted open data)"""
+
+    def competitions(self):
+        return sb.competitions()
+
+    def matches(self, competition_id, season_id):
+        return sb.matches(competition_id=competition_id, season_id=season_id)
+
+    def lineups(self, match_id):
+        return sb.lineups(match_id=match_id)
+
+    def events(self, match_id):
+        return sb.events(match_id=match_id)
+
+    def raw_events(self, match_id):
+        return sb.events(match_id=match_id, fmt='dict')
+
+    def frames(self, match_id):
+        return sb.frames(match_id=match_id, fmt='dict')
+
+
+class OpenDataMirrorSource:
+    """Data source reading a local mirror of the statsbomb/open-data tree.
+
+    ``root`` is the repository's ``data`` directory, containing
+    ``competitions.json``, ``matches/<competition>/<season>.json``,
+    ``events/<match>.json``, ``lineups/<match>.json`` and
+    ``three-sixty/<match>.json``. The frames built
+    here match the ones statsbombpy returns for the same files.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def read_json(self, *parts):
+        """Parse a JSON file from the mirror through a read-only memory map"""
+        path = os.path.join(self.root, *parts)
+        with open(path, 'rb') as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                raise ValueError(f"Empty data file: {path}")
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as buffer:
+                    return _loads(buffer)
+
+    def competitions(self):
+        return pd.DataFrame(self.read_json('competitions.json'))
+
+    def matches(self, competition_id, season_id):
+        matches = sb_entities.matches(
+            self.read_json('matches', str(competition_id), f"{season_id}.json"))
+
+        # Same flattening as statsbombpy.sb.matches
+        home_managers = [
+            ", ".join(m['name'] for m in match['home_team'].get('managers', []))
+            for match in matches.values()
+        ]
+        away_managers = [
+            ", ".join(m['name'] for m in match['away_team'].get('managers', []))
+            for match in matches.values()
+        ]
+        matches = pd.DataFrame(matches.values())
+        if matches.empty:
+            return matches
+
+        matches['competition'] = matches.competition.apply(
+            lambda c: f"{c['country_name']} - {c['competition_name']}")
+        for col in ['season', 'home_team', 'away_team']:
+            matches[col] = matches[col].apply(lambda c: c[f"{col}_name"])
+        for col in ['competition_stage', 'stadium', 'referee']:
+            if col in matches.columns:
+                matches[col] = matches[col].apply(
+                    lambda x: x['name'] if not pd.isna(x) else x)
+        matches['home_managers'] = home_managers
+        matches['away_managers'] = away_managers
+        metadata = matches.pop('metadata')
+        for k in ['data_version', 'shot_fidelity_version', 'xy_fidelity_version']:
+            matches[k] = metadata.apply(lambda x: x.get(k))
+        return matches
+
+    def lineups(self, match_id):
+        lineups = {}
+        raw = sb_entities.lineups(self.read_json('lineups', f"{match_id}.json"))
+        for lineup in raw.values():
+            team_lineup = pd.DataFrame(lineup['lineup'])
+            team_lineup['country'] = team_lineup.country.apply(
+                lambda c: c['name'] if isinstance(c, dict) else 'Unknown')
+            lineups[lineup['team_name']] = team_lineup
+        return lineups
+
+    def events(self, match_id):
+        events = sb_entities.events(
+            self.read_json('events', f"{match_id}.json"), match_id)
+        events = sb_helpers.filter_and_group_events(events, {}, 'dataframe', True)
+        return pd.concat(
+            [pd.DataFrame(evs) for evs in events.values()],
+            axis=0, ignore_index=True, sort=True)
+
+    def raw_events(self, match_id):
+        """Unflattened event dicts keyed by id, as ``sb.events(fmt='dict')``"""
+        return sb_entities.events(
+            self.read_json('events', f"{match_id}.json"), match_id)
+
+    def frames(self, match_id):
+        """360 freeze frames as a list of dicts, as ``sb.frames(fmt='dict')``"""
+        return sb_entities.frames(
+            self.read_json('three-sixty', f"{match_id}.json"), match_id)
+
+
+DATA_SOURCES = {
+    'statsbomb': lambda: StatsBombApiSource(),
+    'open-data-mirror': lambda: OpenDataMirrorSource(settings.API_OPEN_DATA_ROOT),
+}
+
+_default_source = None
+
+
+def default_data_source():
+    """Return the process-wide data source named by API_DATA_SOURCE.
+
+    The setting is either a key of DATA_SOURCES or the dotted path of a
+    class exposing competitions/matches/lineups/events (plus raw_events for
+    the 'raw' events pipeline and frames for 360 data). Unless API_CIRCUIT_BREAKER disables it,
+    each resource type's calls go through its circuit breaker.
+    """
+    global _default_source
+    if _default_source is None:
+        name = getattr(settings, 'API_DATA_SOURCE', 'statsbomb')
+        if name in DATA_SOURCES:
+            _default_source = DATA_SOURCES[name]()
+        else:
+            _default_source = import_string(name)()
+        if getattr(settings, 'API_CIRCUIT_BREAKER', {}).get('ENABLED', True):
+            _default_source = GuardedSource(_default_source, circuit_breakers)
+        logger.info(f"Using {name} data source for StatsBomb data")
+    return _default_source
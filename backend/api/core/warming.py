@@ -0,0 +1,215 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+
+from .cache import get_indexed_events, indexed_events_cache, response_cache
+from .sources import default_data_source
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Space calls at least ``1 / rate`` seconds apart across threads"""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            slot = max(time.monotonic(), self._next)
+            self._next = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SeasonWarmer:
+    """Prefetch events and lineups for every match of a season.
+
+    Matches are loaded on a bounded worker pool, and upstream fetches are
+    rate limited to ``rate`` per second. Each match is reported as warm
+    (already cached), cold (fetched now) or failed. Background warming runs
+    one season at a time on a single daemon thread.
+    """
+
+    def __init__(self, workers=4, rate=2.0, lineups=True, on_matches_view=False):
+        self.workers = workers
+        self.rate = rate
+        self.lineups = lineups
+        self.on_matches_view = on_matches_view
+        self._queue = queue.Queue()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.totals = {
+            'seasons': 0,
+            'events': {'warm': 0, 'cold': 0, 'failed': 0},
+            'lineups': {'warm': 0, 'cold': 0, 'failed': 0},
+        }
+
+    @classmethod
+    def from_settings(cls):
+        """Build the warmer from the API_PREFETCH setting"""
+        options = getattr(settings, 'API_PREFETCH', {})
+        return cls(
+            workers=options.get('WORKERS', 4),
+            rate=options.get('RATE', 2.0),
+            lineups=options.get('LINEUPS', True),
+            on_matches_view=options.get('ON_MATCHES_VIEW', False),
+        )
+
+    def warm(self, competition_id, season_id, match_ids=None, progress=None,
+             after_load=None):
+        """Warm a season's matches and return a warm/cold report.
+
+        ``progress(done, total, match_id, result)`` is called as each match
+        finishes; ``after_load(match_id)`` runs after a match's events load.
+        """
+        if match_ids is None:
+            matches = default_data_source().matches(competition_id, season_id)
+            match_ids = [] if matches is None else matches['match_id'].tolist()
+
+        limiter = RateLimiter(self.rate)
+        report = {
+            'competition_id': competition_id,
+            'season_id': season_id,
+            'matches': len(match_ids),
+            'events': {'warm': 0, 'cold': 0, 'failed': 0},
+            'lineups': {'warm': 0, 'cold': 0, 'failed': 0},
+        }
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix='api-prefetch') as pool:
+            futures = {
+                pool.submit(self._warm_match, match_id, limiter, after_load): match_id
+                for match_id in match_ids
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                for resource, state in result.items():
+                    report[resource][state] += 1
+                if progress:
+                    progress(done, len(match_ids), futures[future], result)
+
+        report['seconds'] = round(time.perf_counter() - start, 2)
+        for resource in ('events', 'lineups'):
+            counts = report[resource]
+            lookups = counts['warm'] + counts['cold']
+            report[resource]['warm_ratio'] = round(
+                counts['warm'] / lookups * 100, 1) if lookups else 0
+
+        with self._lock:
+            self.totals['seasons'] += 1
+            for resource in ('events', 'lineups'):
+                for state in ('warm', 'cold', 'failed'):
+                    self.totals[resource][state] += report[resource][state]
+        return report
+
+    def trigger(self, competition_id, season_id, match_ids):
+        """Queue a season for background warming unless it is already queued"""
+        key = (competition_id, season_id)
+        with self._lock:
+            if key in self._queued:
+                return False
+            self._queued.add(key)
+            self._queue.put((competition_id, season_id, list(match_ids)))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='api-prefetch-queue', daemon=True)
+                self._thread.start()
+        return True
+
+    def stats(self):
+        """Return warm/cold totals and queued seasons"""
+        with self._lock:
+            stats = {
+                'queued': len(self._queued),
+                'workers': self.workers,
+                'rate': self.rate,
+                'seasons': self.totals['seasons'],
+            }
+            for resource in ('events', 'lineups'):
+                counts = dict(self.totals[resource])
+                lookups = counts['warm'] + counts['cold']
+                counts['warm_ratio'] = round(
+                    counts['warm'] / lookups * 100, 1) if lookups else 0
+                stats[resource] = counts
+            return stats
+
+    def _run(self):
+        while True:
+            try:
+                competition_id, season_id, match_ids = self._queue.get(timeout=60)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+
+            try:
+                logger.info(
+                    f"Prefetching {len(match_ids)} matches for competition {competition_id} and season {season_id}")
+                report = self.warm(
+                    competition_id, season_id, match_ids,
+                    progress=self._log_progress)
+                logger.info(
+                    f"Prefetched competition {competition_id} season {season_id} "
+                    f"in {report['seconds']}s: events {report['events']}, lineups {report['lineups']}")
+            except Exception as e:
+                logger.error(f"Failed to prefetch season {season_id}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._queued.discard((competition_id, season_id))
+
+    def _log_progress(self, done, total, match_id, result):
+        if done == total or done % 10 == 0:
+            logger.info(f"Prefetched {done}/{total} matches")
+
+    def _warm_match(self, match_id, limiter, after_load=None):
+        """Load one match's events and lineups, reporting warm/cold/failed"""
+        # Imported here because the views import the api core modules
+        from api.views.match.lineups import MatchLineupsView
+
+        source = default_data_source()
+        result = {}
+
+        # The cache the player views read under API_EVENTS_PIPELINE
+        if indexed_events_cache().contains(match_id):
+            result['events'] = 'warm'
+        else:
+            try:
+                limiter.wait()
+                get_indexed_events(match_id, source)
+                result['events'] = 'cold'
+                if after_load:
+                    after_load(match_id)
+            except Exception as e:
+                logger.warning(f"Failed to prefetch events for match {match_id}: {str(e)}")
+                result['events'] = 'failed'
+
+        if self.lineups:
+            if response_cache.contains('lineups', match_id):
+                result['lineups'] = 'warm'
+            else:
+                try:
+                    limiter.wait()
+                    MatchLineupsView().warm(match_id)
+                    result['lineups'] = 'cold'
+                except Exception as e:
+                    logger.warning(f"Failed to prefetch lineups for match {match_id}: {str(e)}")
+                    result['lineups'] = 'failed'
+
+        return result
+
+
+season_warmer = SeasonWarmer.from_settings()
@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from api.core.sanitize import sanitize_columns, sanitize_records
+from api.core.sources import default_data_source
+
+
+def legacy_clean_dataframe(df):
+    """Record-by-record cleanup previously used by BaseStatsBombView.
+
+    api.tests checks the columnar sanitizer against it.
+    """
+    df = df.copy()
+
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    for col in numeric_cols:
+        df[col] = df[col].replace({
+            np.nan: None,
+            np.inf: None,
+            -np.inf: None
+        })
+
+    object_cols = df.select_dtypes(include=['object']).columns
+    for col in object_cols:
+        df[col] = df[col].replace({np.nan: None})
+
+    records = df.to_dict(orient='records')
+
+    clean_records = []
+    for record in records:
+        clean_record = {}
+        for key, value in record.items():
+            if isinstance(value, np.integer):
+                clean_record[key] = int(value)
+            elif isinstance(value, np.floating):
+                clean_record[key] = float(
+                    value) if not np.isnan(value) else None
+            elif isinstance(value, (np.ndarray, list)):
+                if isinstance(value, np.ndarray):
+                    value = value.tolist()
+                clean_record[key] = [
+                    None if isinstance(x, (float, np.floating)) and np.isnan(x)
+                    else x for x in value
+                ]
+            else:
+                clean_record[key] = None if pd.isna(value) else value
+        clean_records.append(clean_record)
+
+    return clean_records
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the columnar DataFrame sanitizer against the legacy "
+            "record-by-record cleanup on a full-match events frame")
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('match_id', type=int)
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per implementation (best is reported)')
+
+    def handle(self, *args, **options):
+        try:
+            frame = default_data_source().events(options['match_id'])
+        except Exception as e:
+            raise CommandError(f"Failed to load match {options['match_id']}: {e}")
+
+        self.stdout.write(
+            f"Match {options['match_id']}: {frame.shape[0]} rows x {frame.shape[1]} columns")
+
+        timings = {}
+        for name, func in [('legacy', legacy_clean_dataframe),
+                           ('records', sanitize_records),
+                           ('columns', sanitize_columns)]:
+            runs = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                func(frame)
+                runs.append(time.perf_counter() - start)
+            timings[name] = min(runs)
+
+        for name, seconds in timings.items():
+            speedup = timings['legacy'] / seconds if seconds else float('inf')
+            self.stdout.write(
+                f"{name:>8}: {seconds * 1000:8.1f} ms  ({speedup:.1f}x)")
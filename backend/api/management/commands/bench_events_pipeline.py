@@ -0,0 +1,89 @@
+import json
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.core.partitions import MatchEvents
+from api.core.raw import RawMatchEvents
+from api.core.sources import default_data_source
+from api.views.player.match.analytics import PlayerMatchAnalyticsView
+
+
+def build_dataframe(source, match_id):
+    return MatchEvents(source.events(match_id))
+
+
+def build_raw(source, match_id):
+    return RawMatchEvents(source.raw_events(match_id))
+
+
+PIPELINES = [('dataframe', build_dataframe), ('raw', build_raw)]
+
+
+class Command(BaseCommand):
+    help = ("Compare the wide-DataFrame and raw-dict events pipelines for a "
+            "match: output parity, load latency, peak memory and per-player "
+            "section latency")
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('match_id', type=int)
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Timed runs per pipeline (best is reported)')
+
+    def handle(self, *args, **options):
+        match_id = options['match_id']
+        source = default_data_source()
+        view = PlayerMatchAnalyticsView()
+
+        try:
+            matches = {name: build(source, match_id) for name, build in PIPELINES}
+        except Exception as e:
+            raise CommandError(f"Failed to load match {match_id}: {e}")
+
+        players = list(matches['dataframe']._players)
+        self.stdout.write(
+            f"Match {match_id}: {len(matches['raw'].records)} events, "
+            f"{len(players)} players, {len(matches['raw'].columns)} columns")
+
+        # Every section for every player must render identically
+        outputs = {name: self._sections(view, match, players)
+                   for name, match in matches.items()}
+        if outputs['dataframe'] != outputs['raw']:
+            raise CommandError('Raw pipeline output differs from the DataFrame pipeline')
+        self.stdout.write(f"Parity: {len(players) * len(view.sections)} sections identical")
+
+        self.stdout.write(
+            f"{'pipeline':>10} {'load ms':>9} {'peak MB':>9} {'cached MB':>10} {'sections ms':>12}")
+        for name, build in PIPELINES:
+            load = min(self._timed(build, source, match_id)
+                       for _ in range(options['repeat']))
+
+            tracemalloc.start()
+            match = build(source, match_id)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            sections = min(self._timed(self._sections, view, match, players)
+                           for _ in range(options['repeat']))
+            self.stdout.write(
+                f"{name:>10} {load * 1000:9.1f} {peak / 2**20:9.1f} "
+                f"{match.nbytes / 2**20:10.1f} {sections * 1000:12.1f}")
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+
+    def _sections(self, view, match, players):
+        """Render every analytics section for every player as JSON text"""
+        rendered = []
+        for player in players:
+            for section in view.sections:
+                try:
+                    data = getattr(view, f'_get_{section}_section')(match, player)
+                except ValueError as e:
+                    data = {'error': str(e)}
+                rendered.append(json.dumps(data, default=str))
+        return rendered
@@ -0,0 +1,76 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+HEAVY_MODULES = ['pandas', 'numpy', 'statsbombpy']
+
+# Run in a fresh interpreter per sample so nothing is already imported
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+if {eager!r}:
+    import numpy, pandas, statsbombpy.sb
+import django
+django.setup()
+setup = time.perf_counter()
+error = None
+try:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+end = time.perf_counter()
+print(json.dumps({{
+    'setup_ms': (setup - start) * 1000,
+    'urls_ms': (end - setup) * 1000,
+    'loaded': [m for m in {heavy!r} if m in sys.modules],
+    'error': error,
+}}))
+'''
+
+
+class Command(BaseCommand):
+    help = ("Measure worker startup (django.setup plus URLconf loading) for "
+            "each URL profile, with heavy imports lazy and eager")
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Fresh interpreters per profile (median is reported)')
+        parser.add_argument('--profiles', default='full,sbapi',
+                            help='Comma-separated API_URL_PROFILE values')
+
+    def handle(self, *args, **options):
+        profiles = [p.strip() for p in options['profiles'].split(',') if p.strip()]
+
+        self.stdout.write(
+            f"{'profile':>8} {'imports':>8} {'setup ms':>9} {'urls ms':>8} "
+            f"{'total ms':>9}  heavy modules loaded")
+        errors = set()
+        for profile in profiles:
+            for eager in (False, True):
+                samples = [self._sample(profile, eager)
+                           for _ in range(options['repeat'])]
+                setup = statistics.median(s['setup_ms'] for s in samples)
+                urls = statistics.median(s['urls_ms'] for s in samples)
+                loaded = ', '.join(samples[-1]['loaded']) or '-'
+                self.stdout.write(
+                    f"{profile:>8} {'eager' if eager else 'lazy':>8} "
+                    f"{setup:9.0f} {urls:8.0f} {setup + urls:9.0f}  {loaded}")
+                errors.update((profile, s['error']) for s in samples if s['error'])
+
+        for profile, error in sorted(errors):
+            self.stderr.write(f"URLconf for profile '{profile}' failed to load: {error}")
+
+    def _sample(self, profile, eager):
+        env = dict(os.environ, API_URL_PROFILE=profile)
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD.format(eager=eager, heavy=HEAVY_MODULES)],
+            env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+            check=True)
+        return json.loads(result.stdout.strip().splitlines()[-1])
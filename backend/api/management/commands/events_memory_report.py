@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.core.lazy import pd
+from api.core.partitions import CATEGORICAL_COLUMNS, MatchEvents
+from api.core.sources import default_data_source
+
+
+class Command(BaseCommand):
+    help = ("Report the memory the compact events layout saves per match and "
+            "check that the rebuilt frame equals the statsbombpy frame")
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('match_ids', type=int, nargs='+')
+        parser.add_argument('--columns', action='store_true',
+                            help='List the columns each compaction step applied to')
+
+    def handle(self, *args, **options):
+        source = default_data_source()
+        self.stdout.write(
+            f"{'match':>9} {'rows':>6} {'original MB':>12} {'compact MB':>11} {'saved':>7}")
+        for match_id in options['match_ids']:
+            try:
+                frame = source.events(match_id)
+            except Exception as e:
+                raise CommandError(f"Failed to load match {match_id}: {e}")
+
+            original = frame.copy()
+            events = MatchEvents(frame)
+            self._check_round_trip(match_id, original, events)
+
+            report = events.memory_report()
+            self.stdout.write(
+                f"{match_id:>9} {report['rows']:>6} "
+                f"{report['original_bytes'] / 2 ** 20:12.2f} "
+                f"{report['compact_bytes'] / 2 ** 20:11.2f} "
+                f"{report['saved_pct']:6.1f}%")
+            if options['columns']:
+                for key, columns in report.items():
+                    if isinstance(columns, list) and columns:
+                        self.stdout.write(f"    {key}: {', '.join(columns)}")
+
+    def _check_round_trip(self, match_id, original, events):
+        for col in CATEGORICAL_COLUMNS:
+            if col in original.columns:
+                original[col] = original[col].astype('category')
+        try:
+            pd.testing.assert_frame_equal(events.frame, original, check_exact=True)
+        except AssertionError as e:
+            raise CommandError(f"Compact frame of match {match_id} differs: {e}")
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.core.cache import indexed_events_cache
+from api.core.sources import default_data_source
+from api.core.warming import SeasonWarmer, season_warmer
+
+
+class Command(BaseCommand):
+    help = ("Prefetch events for every match of a competition season into the "
+            "events cache spill directory, where server processes read them "
+            "on their next cache miss, and report warm/cold ratios. Needs "
+            "API_EVENTS_CACHE_SPILL_DIR and the 'dataframe' events pipeline. "
+            "Lineups are not warmed here: they are only cached in the memory "
+            "of a server process, and only warm through "
+            "CompetitionMatchesView's in-process trigger")
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('competition_id', type=int)
+        parser.add_argument('season_id', type=int)
+        parser.add_argument('--workers', type=int, default=season_warmer.workers,
+                            help='Matches loaded in parallel')
+        parser.add_argument('--rate', type=float, default=season_warmer.rate,
+                            help='Upstream fetches per second, 0 for no limit')
+        parser.add_argument('--limit', type=int,
+                            help='Only warm the first N matches of the season')
+
+    def handle(self, *args, **options):
+        # This process exits when done; only spilled events outlive it.
+        # The 'raw' pipeline's event dicts are never spilled.
+        cache = indexed_events_cache()
+        if not cache.spill_dir:
+            raise CommandError(
+                'warm_season needs API_EVENTS_CACHE_SPILL_DIR to be set and '
+                "API_EVENTS_PIPELINE to be 'dataframe'")
+
+        warmer = SeasonWarmer(
+            workers=options['workers'],
+            rate=options['rate'],
+            lineups=False,
+        )
+
+        match_ids = None
+        if options['limit']:
+            matches = default_data_source().matches(
+                options['competition_id'], options['season_id'])
+            match_ids = matches['match_id'].tolist()[:options['limit']]
+
+        def progress(done, total, match_id, result):
+            states = ', '.join(f'{k} {v}' for k, v in result.items())
+            self.stdout.write(f"[{done}/{total}] match {match_id}: {states}")
+
+        try:
+            report = warmer.warm(
+                options['competition_id'], options['season_id'], match_ids,
+                progress=progress, after_load=cache.persist)
+        except Exception as e:
+            raise CommandError(f"Failed to warm season: {e}")
+
+        self.stdout.write(
+            f"Warmed {report['matches']} matches in {report['seconds']}s")
+        counts = report['events']
+        self.stdout.write(
+            f"  events: {counts['warm']} warm, {counts['cold']} cold, "
+            f"{counts['failed']} failed ({counts['warm_ratio']}% warm)")
@@ -1,3 +1,1434 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.test import AsyncClient, SimpleTestCase, override_settings
+from django.urls import path, resolve
+from rest_framework.test import APIRequestFactory
+from statsbombpy import public, sb
+from statsbombpy.config import OPEN_DATA_PATHS
+
+from api.core import base
+from api.core.asynchronous import async_include, async_view
+from api.core.breaker import CircuitBreaker, CircuitOpenError
+from api.core.cache import (
+    EventsCache, events_cache, frames_cache, raw_events_cache, response_cache)
+from api.core.catalogue import CompetitionCatalogue, SeasonMatches
+from api.core.compact import CompactFrame
+from api.core.frames import MatchFrames
+from api.core.partitions import MatchEvents
+from api.core.raw import RawMatchEvents
+from api.core.renderers import NDJSONRenderer, iter_ndjson
+from api.core.sanitize import sanitize_columns, sanitize_records
+from api.core.sources import OpenDataMirrorSource
+from api.core.singleflight import SingleFlight, SingleFlightTimeout
+from api.core.warming import SeasonWarmer
+from api.management.commands.bench_clean_dataframe import legacy_clean_dataframe
+from api.views.match.frames import MatchShotFramesView, _is_missing
+from api.views.match.info import MatchInformationView
+from api.views.match.lineups import MatchLineupsView
+from api.views.player.match.analytics import PlayerMatchAnalyticsView
+from api.views.player.match.defending import PlayerMatchDefendingView
+from api.views.player.match.passing import PlayerMatchPassingView
+from api.views.player.match.possession import PlayerMatchPossessionView
+from api.views.player.season.aggregates import PlayerSeasonView, section_rows
+
+# URLconf of the tests that serve the api views asynchronously
+urlpatterns = [
+    path('api/', async_include('api.urls.match')),
+    path('api/', async_include('api.urls.player')),
+]
+
+
+def legacy_possession_stats(view, possession_data):
+    """Dict-based possession calculator the DataFrame version replaced"""
+    stats = {
+        'total_possession_actions': len(possession_data),
+        'actions_by_type': {}
+    }
+    for event_type in view.possession_types:
+        count = sum(1 for event in possession_data if event.get(
+            'type') == event_type)
+        if count > 0:
+            stats['actions_by_type'][event_type] = count
+
+    dribbles = [e for e in possession_data if e.get('type') == 'Dribble']
+    if dribbles:
+        successful_dribbles = sum(
+            1 for d in dribbles if d.get('dribble_outcome') == 'Complete')
+        stats.update({
+            'dribble_success_rate': round((successful_dribbles / len(dribbles) * 100), 1),
+            'successful_dribbles': successful_dribbles,
+            'total_dribbles': len(dribbles),
+            'dribbling_details': {
+                'nutmegs': sum(1 for d in dribbles if d.get('dribble_nutmeg') is True),
+                'overrun': sum(1 for d in dribbles if d.get('dribble_overrun') is True),
+                'no_touch': sum(1 for d in dribbles if d.get('dribble_no_touch') is True)
+            }
+        })
+
+    carries = [e for e in possession_data if e.get('type') == 'Carry']
+    stats['total_carries'] = len(carries)
+    if carries:
+        carry_distances = []
+        for carry in carries:
+            start_loc = carry.get('location')
+            end_loc = carry.get('carry_end_location')
+            if start_loc and end_loc:
+                try:
+                    distance = ((end_loc[0] - start_loc[0]) **
+                                2 + (end_loc[1] - start_loc[1])**2)**0.5
+                    carry_distances.append(distance)
+                except (TypeError, IndexError):
+                    continue
+        if carry_distances:
+            stats['average_carry_distance'] = round(
+                sum(carry_distances) / len(carry_distances), 1)
+
+    stats['ball_losses'] = {
+        'dispossessed': sum(1 for e in possession_data if e.get('type') == 'Dispossessed'),
+        'miscontrol': sum(1 for e in possession_data if e.get('type') == 'Miscontrol')
+    }
+    fouls_won = [e for e in possession_data if e.get('type') == 'Foul Won']
+    stats['fouls_won'] = {
+        'total': len(fouls_won),
+        'defensive_half': sum(1 for f in fouls_won if f.get('foul_won_defensive') is True),
+        'won_advantage': sum(1 for f in fouls_won if f.get('foul_won_advantage') is True)
+    }
+    stats['offsides'] = sum(
+        1 for e in possession_data if e.get('type') == 'Offside')
+    return stats
+
+
+def legacy_defensive_stats(view, defense_data):
+    """Dict-based defending calculator the DataFrame version replaced"""
+    stats = {
+        'total_defensive_actions': len(defense_data),
+        'actions_by_type': {}
+    }
+    for event_type in view.defending_types:
+        count = sum(1 for event in defense_data if event.get(
+            'type') == event_type)
+        if count > 0:
+            stats['actions_by_type'][event_type] = count
+
+    duels = [e for e in defense_data if e.get('type') == 'Duel']
+    successful_duels = sum(
+        1 for duel in duels if duel.get('duel_outcome') == 'success')
+    if duels:
+        stats['duel_success_rate'] = round(
+            (successful_duels / len(duels) * 100), 1)
+
+    pressures = [e for e in defense_data if e.get('type') == 'Pressure']
+    successful_pressures = sum(
+        1 for pressure in pressures if pressure.get('counterpress') is True)
+    if pressures:
+        stats['pressure_success_rate'] = round(
+            (successful_pressures / len(pressures) * 100), 1)
+
+    stats.update({
+        'ball_recoveries': sum(1 for e in defense_data if e.get('type') == 'Ball Recovery'),
+        'interceptions': sum(1 for e in defense_data if e.get('type') == 'Interception'),
+        'fouls_committed': sum(1 for e in defense_data if e.get('type') == 'Foul Committed'),
+        'cards': {
+            'yellow': sum(1 for e in defense_data if e.get('foul_committed_card') == 'Yellow Card'),
+            'red': sum(1 for e in defense_data if e.get('foul_committed_card') == 'Red Card')
+        }
+    })
+    return stats
+
+
+def build_match(events, seed=0):
+    """Build an indexed match frame shaped like statsbombpy output"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for index, (event_type, extra) in enumerate(events, start=1):
+        row = {
+            'id': f'event-{index}', 'index': index, 'period': 1,
+            'minute': index // 10, 'second': index % 60, 'type': event_type,
+            'team': 'Team A', 'player': 'Player A',
+            'location': [float(v) for v in rng.uniform(0, 80, 2).round(1)],
+            'duration': float(rng.uniform(0, 3)),
+        }
+        row.update(extra)
+        rows.append(row)
+    return MatchEvents(pd.DataFrame(rows))
+
+
+def named(id, name):
+    return {'id': id, 'name': name}
+
+
+def open_data_event(index, event_type, **extra):
+    return {
+        'id': f'event-{index}', 'index': index, 'period': 1,
+        'timestamp': f'00:00:{index:02d}.000', 'minute': 0, 'second': index,
+        'type': named(*event_type), 'possession': 1,
+        'possession_team': named(1, 'Home'),
+        'play_pattern': named(1, 'Regular Play'), 'team': named(1, 'Home'),
+        **extra,
+    }
+
+
+# A one-match statsbomb/open-data tree
+OPEN_DATA_FILES = {
+    'competitions.json': [{
+        'competition_id': 11, 'season_id': 90, 'country_name': 'Spain',
+        'competition_name': 'La Liga', 'competition_gender': 'male',
+        'competition_youth': False, 'competition_international': False,
+        'season_name': '2020/2021', 'match_updated': '2023-01-01T00:00:00',
+        'match_updated_360': None, 'match_available_360': None,
+        'match_available': '2023-01-01T00:00:00',
+    }],
+    'matches/11/90.json': [{
+        'match_id': 1, 'match_date': '2020-09-01', 'kick_off': '21:00:00.000',
+        'competition': {'competition_id': 11, 'country_name': 'Spain',
+                        'competition_name': 'La Liga'},
+        'season': {'season_id': 90, 'season_name': '2020/2021'},
+        'home_team': {'home_team_id': 1, 'home_team_name': 'Home',
+                      'home_team_gender': 'male',
+                      'managers': [{'id': 1, 'name': 'Boss'}]},
+        'away_team': {'away_team_id': 2, 'away_team_name': 'Away',
+                      'away_team_gender': 'male'},
+        'home_score': 1, 'away_score': 0, 'match_status': 'available',
+        'match_status_360': 'available', 'last_updated': '2023-01-01T00:00:00',
+        'last_updated_360': None, 'match_week': 1,
+        'metadata': {'data_version': '1.1.0', 'shot_fidelity_version': '2'},
+        'competition_stage': named(1, 'Regular Season'),
+        'stadium': named(1, 'Stadium'), 'referee': named(2, 'Referee'),
+    }],
+    'events/1.json': [
+        open_data_event(1, (35, 'Starting XI'),
+                        tactics={'formation': 442, 'lineup': []}),
+        open_data_event(2, (30, 'Pass'), player=named(10, 'Player A'),
+                        position=named(1, 'Goalkeeper'), location=[10.0, 40.0],
+                        duration=1.2, **{'pass': {
+                            'length': 20.5, 'end_location': [30.0, 40.0],
+                            'height': named(1, 'Ground Pass'),
+                            'goal_assist': True}}),
+        open_data_event(3, (16, 'Shot'), player=named(11, 'Player B'),
+                        location=[100.0, 40.0], shot={
+                            'statsbomb_xg': 0.3, 'outcome': named(97, 'Goal'),
+                            'end_location': [120.0, 40.0, 1.0]}),
+    ],
+    'lineups/1.json': [
+        {'team_id': 1, 'team_name': 'Home', 'lineup': [
+            {'player_id': 10, 'player_name': 'Player A', 'player_nickname': None,
+             'jersey_number': 1, 'country': named(214, 'Spain'), 'cards': [],
+             'positions': []},
+            {'player_id': 11, 'player_name': 'Player B', 'player_nickname': 'B',
+             'jersey_number': 9, 'country': None, 'cards': [], 'positions': []},
+        ]},
+        {'team_id': 2, 'team_name': 'Away', 'lineup': [
+            {'player_id': 20, 'player_name': 'Player C', 'player_nickname': None,
+             'jersey_number': 4, 'country': named(78, 'France'), 'cards': [],
+             'positions': []},
+        ]},
+    ],
+    'three-sixty/1.json': [{
+        'event_uuid': 'event-3', 'visible_area': [80.0, 0.0, 120.0, 80.0],
+        'freeze_frame': [{'teammate': False, 'actor': False, 'keeper': True,
+                          'location': [118.0, 40.0]}],
+    }],
+}
+
+
+class Sized:
+    """Cache entry stand-in with a fixed size"""
+
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+
+class EventsCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used_by_count(self):
+        cache = EventsCache(max_entries=2, ttl=None)
+        cache.set(1, Sized(10))
+        cache.set(2, Sized(10))
+        cache.get(1)
+        cache.set(3, Sized(10))
+
+        self.assertIsNone(cache.get(2))
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNotNone(cache.get(3))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_evicts_by_bytes_and_skips_oversized_entries(self):
+        cache = EventsCache(max_entries=10, max_bytes=100, ttl=None)
+        cache.set(1, Sized(40))
+        cache.set(2, Sized(40))
+        cache.set(3, Sized(40))
+        self.assertEqual((cache.contains(1), cache.contains(2), cache.contains(3)),
+                         (False, True, True))
+        self.assertEqual(cache.stats()['bytes'], 80)
+
+        cache.set(4, Sized(101))
+        self.assertFalse(cache.contains(4))
+        self.assertEqual(cache.stats()['bytes'], 80)
+
+    def test_expired_entries_are_misses_but_served_stale(self):
+        cache = EventsCache(ttl=60)
+        cache.set(1, Sized(10))
+        with mock.patch('api.core.cache.time.monotonic',
+                        return_value=time.monotonic() + 61):
+            self.assertIsNone(cache.get(1))
+            self.assertFalse(cache.contains(1))
+            self.assertIsNotNone(cache.get_stale(1))
+            # Each expired entry is counted once, however often it is read
+            self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+        cache.set(1, Sized(10))
+        with mock.patch('api.core.cache.time.monotonic',
+                        return_value=time.monotonic() + 61):
+            self.assertIsNone(cache.get(1))
+            self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats()['expirations'], 2)
+
+    def test_spill_round_trips_nested_columns(self):
+        frames = {
+            match_id: pd.DataFrame({
+                'id': [f'{match_id}-a', f'{match_id}-b'],
+                'type': ['Pass', 'Shot'], 'player': ['Player A', 'Player B'],
+                'minute': [1, 2],
+                'location': [[60.0, 40.1], [110.5, 38.0]],
+                'tactics': [{'formation': 433, 'lineup': [{'player': 'A'}]}, np.nan],
+                'related_events': [['x', 'y'], np.nan],
+            })
+            for match_id in (1, 2)
+        }
+        with tempfile.TemporaryDirectory() as spill_dir:
+            cache = EventsCache(max_entries=1, ttl=None, spill_dir=spill_dir)
+            cache.set(1, MatchEvents(frames[1].copy()))
+            cache.set(2, MatchEvents(frames[2].copy()))
+            self.assertEqual(cache.stats()['spills'], 1)
+
+            reloaded = cache.get(1)
+            self.assertEqual(cache.stats()['spill_hits'], 1)
+            expected = MatchEvents(frames[1].copy()).frame
+            pd.testing.assert_frame_equal(reloaded.frame, expected, check_exact=True)
+            self.assertEqual(repr(reloaded.frame.to_dict('records')),
+                             repr(expected.to_dict('records')))
+
+
+class CompetitionCatalogueTests(SimpleTestCase):
+    def competitions(self, season_name):
+        return pd.DataFrame([
+            {'competition_id': 2, 'season_id': 27, 'competition_name': 'Premier League',
+             'season_name': season_name},
+            {'competition_id': 2, 'season_id': 44, 'competition_name': 'Premier League',
+             'season_name': '2003/2004'},
+            {'competition_id': 11, 'season_id': 90, 'competition_name': 'La Liga',
+             'season_name': '2020/2021'},
+        ])
+
+    def test_indexes_seasons(self):
+        catalogue = CompetitionCatalogue(lambda: self.competitions('2015/2016'))
+        self.assertEqual(
+            [s['season_id'] for s in json.loads(catalogue.seasons_json(2))], [27, 44])
+        self.assertEqual(json.loads(catalogue.seasons_json(99)), [])
+        self.assertEqual(catalogue.season(11, 90)['competition_name'], 'La Liga')
+        self.assertIsNone(catalogue.season(11, 27))
+
+    def test_refreshes_in_background_after_ttl(self):
+        names = iter(['2015/2016', '2016/2017'])
+        refreshed = threading.Event()
+        catalogue = CompetitionCatalogue(
+            lambda: self.competitions(next(names)), ttl=60)
+        original_refresh = catalogue.refresh
+
+        def refresh():
+            snapshot = original_refresh()
+            refreshed.set()
+            return snapshot
+
+        catalogue.refresh = refresh
+        self.assertEqual(catalogue.season(2, 27)['season_name'], '2015/2016')
+        refreshed.clear()
+
+        with mock.patch('api.core.catalogue.time.monotonic',
+                        return_value=time.monotonic() + 61):
+            # The expired snapshot is served while the refresh runs
+            self.assertEqual(catalogue.season(2, 27)['season_name'], '2015/2016')
+            self.assertTrue(refreshed.wait(5))
+        self.assertEqual(catalogue.season(2, 27)['season_name'], '2016/2017')
+
+
+    def test_backs_off_after_a_failed_refresh(self):
+        loads = []
+        done = threading.Event()
+
+        def loader():
+            loads.append(1)
+            if len(loads) > 1:
+                done.set()
+                raise ConnectionError('upstream down')
+            return self.competitions('2015/2016')
+
+        # The refresh thread reads the same clock
+        clock = [0]
+        patcher = mock.patch('api.core.catalogue.time.monotonic',
+                             side_effect=lambda: clock[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        catalogue = CompetitionCatalogue(loader, ttl=60, retry_after=30)
+        catalogue.season(2, 27)
+
+        def season_at(seconds):
+            clock[0] = seconds
+            record = catalogue.season(2, 27)
+            while catalogue._refreshing:
+                time.sleep(0.01)
+            return record
+
+        self.assertEqual(season_at(61)['season_name'], '2015/2016')
+        self.assertTrue(done.wait(5))
+        self.assertEqual(len(loads), 2)
+        # No new refresh until the retry is due
+        season_at(62)
+        season_at(61 + 29)
+        self.assertEqual(len(loads), 2)
+        season_at(61 + 31)
+        self.assertEqual(len(loads), 3)
+
+
+class SeasonMatchesTests(SimpleTestCase):
+    def setUp(self):
+        def match(match_id, date, home, away):
+            return {'match_id': match_id, 'match_date': date, 'home_team': home,
+                    'away_team': away, 'competition': 'Premier League',
+                    'season': '2015/2016', 'competition_stage': 'Regular Season'}
+
+        self.season = SeasonMatches(pd.DataFrame([
+            match(1, '2015-08-08', 'Arsenal', 'West Ham'),
+            match(2, '2015-08-15', 'Chelsea', 'Arsenal'),
+            match(3, '2015-08-15', 'West Ham', 'Leicester'),
+            match(4, '2015-08-22', 'Leicester', 'Chelsea'),
+            match(5, '2015-08-01', 'Arsenal', 'Arsenal'),
+            match(6, np.nan, 'Chelsea', 'West Ham'),
+        ]))
+
+    def ids(self, **filters):
+        return [record['match_id'] for record in self.season.select(**filters)]
+
+    def test_team_index(self):
+        self.assertEqual(self.season.teams(),
+                         ['Arsenal', 'Chelsea', 'Leicester', 'West Ham'])
+        self.assertEqual(self.ids(team='Arsenal'), [1, 2, 5])
+        self.assertEqual(self.ids(team='Tottenham'), [])
+
+    def test_date_range_is_inclusive(self):
+        self.assertEqual(self.ids(date_from='2015-08-15', date_to='2015-08-15'), [2, 3])
+        self.assertEqual(self.ids(date_from='2015-08-09', date_to='2015-08-21'), [2, 3])
+        self.assertEqual(self.ids(date_from='2015-08-15'), [2, 3, 4])
+        self.assertEqual(self.ids(date_to='2015-08-08'), [1, 5])
+        self.assertEqual(self.ids(date_from='2015-08-23'), [])
+        # Undated matches only appear without a date filter
+        self.assertEqual(self.ids(), [1, 2, 3, 4, 5, 6])
+
+    def test_team_and_date_range(self):
+        self.assertEqual(
+            self.ids(team='West Ham', date_from='2015-08-08', date_to='2015-08-15'),
+            [1, 3])
+
+
+class RawEventsSource:
+    def raw_events(self, match_id):
+        return [{'id': 'a', 'index': 1, 'type': {'id': 30, 'name': 'Pass'},
+                 'player': {'id': 1, 'name': 'Player A'}, 'location': [60.0, 40.0]}]
+
+    def events(self, match_id):
+        raise AssertionError('the raw pipeline does not load the events frame')
+
+
+class SeasonWarmerTests(SimpleTestCase):
+    match_id = 990002
+
+    @override_settings(API_EVENTS_PIPELINE='raw')
+    def test_warms_the_pipeline_cache(self):
+        self.addCleanup(raw_events_cache.invalidate, self.match_id)
+        warmer = SeasonWarmer(workers=1, rate=None, lineups=False)
+        with mock.patch('api.core.warming.default_data_source',
+                        return_value=RawEventsSource()):
+            report = warmer.warm(1, 1, [self.match_id])
+            self.assertEqual(report['events']['cold'], 1)
+            self.assertTrue(raw_events_cache.contains(self.match_id))
+            self.assertFalse(events_cache.contains(self.match_id))
+
+            report = warmer.warm(1, 1, [self.match_id])
+            self.assertEqual(report['events']['warm'], 1)
+
+
+class SanitizeTests(SimpleTestCase):
+    """The columnar sanitizer gives the values the legacy clean_dataframe gave"""
+
+    def assert_parity(self, frame):
+        legacy = legacy_clean_dataframe(frame)
+        records = sanitize_records(frame)
+        self.assertEqual(records, legacy)
+        # Same values and the same Python types, down to list items
+        self.assertEqual(json.dumps(records, default=repr),
+                         json.dumps(legacy, default=repr))
+        self.assertEqual(sanitize_columns(frame), {
+            column: [record[column] for record in legacy]
+            for column in frame.columns})
+
+    def test_numeric_columns(self):
+        self.assert_parity(pd.DataFrame({
+            'float': [1.5, np.nan, np.inf, -np.inf],
+            'finite': [0.25, 1.0, 2.0, 3.5],
+            'int': np.arange(4, dtype=np.int64),
+            'uint': np.arange(4, dtype=np.uint8),
+            'bool': [True, False, True, False],
+        }))
+
+    def test_object_columns(self):
+        self.assert_parity(pd.DataFrame({
+            'text': ['a', None, np.nan, 'é'],
+            'numpy_scalars': [np.int64(3), np.float64(np.nan), np.float32(2.5),
+                              np.bool_(True)],
+            'lists': [[1.0, np.nan], [], np.nan, [np.float64(np.nan), 'x', [2]]],
+            'arrays': [np.array([1.0, np.nan]), np.array([3]), None,
+                       np.array(['a'])],
+            'dicts': [{'name': 'Pass', 'nested': {'x': [1]}}, None, {}, np.nan],
+            'mixed': [1, 'two', 3.5, None],
+        }))
+
+    def test_datetime_and_categorical_columns(self):
+        self.assert_parity(pd.DataFrame({
+            'kick_off': pd.to_datetime(
+                ['2020-09-01 21:00', None, '2021-05-23 18:30', '2021-01-01 00:00']),
+            'updated': pd.to_datetime(
+                ['2023-01-01T00:00:00Z', None, None, '2023-06-01T12:00:00Z']),
+            'delay': pd.to_timedelta(['1s', None, '2min', '0s']),
+            'type': pd.Categorical(['Pass', 'Shot', None, 'Pass']),
+        }))
+
+    def test_empty_frames(self):
+        self.assert_parity(pd.DataFrame({'x': pd.Series([], dtype=float)}))
+        self.assert_parity(pd.DataFrame(index=range(3)))
+
+
+class RawMatchEventsTests(SimpleTestCase):
+    def setUp(self):
+        events = [
+            {'id': 'a', 'index': 1, 'type': {'id': 30, 'name': 'Pass'},
+             'player': {'id': 1, 'name': 'Player A'}, 'location': [60.0, 40.0],
+             'pass': {'length': 12.5, 'goal_assist': True}},
+            {'id': 'b', 'index': 2, 'type': {'id': 43, 'name': 'Carry'},
+             'player': {'id': 1, 'name': 'Player A'}, 'under_pressure': True,
+             'carry': {'end_location': [70.0, 35.5]}},
+            {'id': 'c', 'index': 3, 'type': {'id': 30, 'name': 'Pass'},
+             'player': {'id': 2, 'name': 'Player B'}, 'location': [10.0, float('nan')],
+             'pass': {'length': 3}},
+            {'id': 'd', 'index': 4, 'type': {'id': 30, 'name': 'Pass'},
+             'player': {'id': 1, 'name': 'Player A'}},
+        ]
+        self.match = RawMatchEvents(events)
+
+    def test_select_records_equals_cleaned_frame_rows(self):
+        columns = ['id', 'index', 'type', 'location', 'under_pressure',
+                   'pass_length', 'pass_goal_assist', 'carry_end_location',
+                   'not_a_column']
+        for player in ['Player A', 'Player B']:
+            for types in [['Pass'], ['Pass', 'Carry']]:
+                frame = self.match.player_events(player, types)
+                expected = sanitize_records(
+                    frame[[col for col in columns if col in frame.columns]])
+                self.assertEqual(
+                    self.match.select_records(player, types, columns), expected)
+
+    def test_type_events_limits_rows_and_columns(self):
+        frame = self.match.frame_for(self.match.records)
+        expected = frame[frame['type'] == 'Pass'][['id', 'pass_length']]
+        pd.testing.assert_frame_equal(
+            self.match.type_events(['Pass'], ['id', 'pass_length', 'not_a_column']),
+            expected.reset_index(drop=True))
+
+    def test_nbytes_counts_nested_values(self):
+        self.assertGreater(self.match.nbytes, sum(
+            sys.getsizeof(record) + sum(map(sys.getsizeof, record.values()))
+            for record in self.match.records))
+
+
+class TypeEventsTests(SimpleTestCase):
+    def test_type_events_match_the_frame_filter(self):
+        match = build_match([('Shot', {}), ('Pass', {}), ('Half End', {}),
+                             ('Shot', {'shot_outcome': 'Goal'})])
+        frame = match.frame
+        columns = ['id', 'type', 'shot_outcome', 'not_a_column']
+        expected = frame[frame['type'].isin(['Shot', 'Half End'])][
+            ['id', 'type', 'shot_outcome']]
+        pd.testing.assert_frame_equal(
+            match.type_events(['Shot', 'Half End'], columns), expected)
+        self.assertTrue(match.type_events(['Substitution']).empty)
+
+
+class PossessionStatsParityTests(SimpleTestCase):
+    def setUp(self):
+        self.view = PlayerMatchPossessionView()
+
+    def assert_parity(self, match):
+        player_possession = match.player_events(
+            'Player A', self.view.possession_types)
+        possession_data = self.view._process_possession_data(
+            player_possession, 'Player A')
+        stats = json.dumps(self.view._calculate_possession_stats(player_possession))
+        self.assertEqual(
+            stats, json.dumps(legacy_possession_stats(self.view, possession_data)))
+        self.assertEqual(stats, json.dumps(
+            self.view._calculate_possession_stats(pd.DataFrame(possession_data))))
+
+    def test_matches_legacy_calculator(self):
+        rng = np.random.default_rng(1)
+        events = []
+        for _ in range(120):
+            event_type = rng.choice(self.view.possession_types + ['Pass'])
+            extra = {}
+            if event_type == 'Carry':
+                extra['carry_end_location'] = [
+                    float(v) for v in rng.uniform(0, 80, 2).round(1)]
+            elif event_type == 'Dribble':
+                extra['dribble_outcome'] = str(
+                    rng.choice(['Complete', 'Incomplete']))
+                if rng.random() < 0.3:
+                    extra['dribble_nutmeg'] = True
+                if rng.random() < 0.3:
+                    extra['dribble_overrun'] = True
+            elif event_type == 'Foul Won':
+                if rng.random() < 0.5:
+                    extra['foul_won_defensive'] = True
+                if rng.random() < 0.5:
+                    extra['foul_won_advantage'] = True
+            events.append((str(event_type), extra))
+        self.assert_parity(build_match(events))
+
+    def test_without_dribbles_or_carries(self):
+        self.assert_parity(build_match([
+            ('Miscontrol', {}), ('Offside', {}), ('Dispossessed', {})
+        ]))
+
+    def test_carry_without_end_location(self):
+        self.assert_parity(build_match([
+            ('Carry', {'carry_end_location': [50.0, 40.0]}),
+            ('Carry', {}),
+            ('Carry', {'carry_end_location': [10.5, 12.1]}),
+        ]))
+
+
+class DefendingStatsParityTests(SimpleTestCase):
+    def setUp(self):
+        self.view = PlayerMatchDefendingView()
+
+    def assert_parity(self, match):
+        player_defense = match.player_events(
+            'Player A', self.view.defending_types)
+        defense_data = self.view._process_defensive_data(
+            player_defense, 'Player A')
+        stats = json.dumps(self.view._calculate_defensive_stats(player_defense))
+        self.assertEqual(
+            stats, json.dumps(legacy_defensive_stats(self.view, defense_data)))
+        self.assertEqual(stats, json.dumps(
+            self.view._calculate_defensive_stats(pd.DataFrame(defense_data))))
+
+    def test_matches_legacy_calculator(self):
+        rng = np.random.default_rng(2)
+        events = []
+        for _ in range(150):
+            event_type = rng.choice(self.view.defending_types + ['Pass'])
+            extra = {}
+            if event_type == 'Duel':
+                extra['duel_outcome'] = str(
+                    rng.choice(['success', 'Won', 'Lost In Play']))
+            elif event_type == 'Pressure' and rng.random() < 0.4:
+                extra['counterpress'] = True
+            elif event_type == 'Foul Committed' and rng.random() < 0.4:
+                extra['foul_committed_card'] = str(
+                    rng.choice(['Yellow Card', 'Red Card']))
+            events.append((str(event_type), extra))
+        self.assert_parity(build_match(events))
+
+    def test_without_duels_or_pressures(self):
+        self.assert_parity(build_match([
+            ('Ball Recovery', {}), ('Clearance', {}), ('Interception', {})
+        ]))
+
+
+class PipelineStatsParityTests(SimpleTestCase):
+    """The raw and frame pipelines give the same sections for the same events"""
+
+    def raw_events(self, seed=3):
+        rng = np.random.default_rng(seed)
+        event_types = (PlayerMatchDefendingView.defending_types +
+                       PlayerMatchPossessionView.possession_types + ['Pass'])
+        events = []
+        for index in range(1, 401):
+            event_type = str(rng.choice(event_types))
+            event = {
+                'id': f'event-{index}', 'index': index, 'period': 1,
+                'minute': index // 10, 'second': index % 60,
+                'type': named(0, event_type),
+                'player': named(0, str(rng.choice(['Player A', 'Player B']))),
+                'location': [float(v) for v in rng.uniform(0, 80, 2).round(1)],
+            }
+            if event_type == 'Carry' and rng.random() < 0.8:
+                event['carry'] = {'end_location': [
+                    float(v) for v in rng.uniform(0, 80, 2).round(1)]}
+            elif event_type == 'Dribble':
+                event['dribble'] = {'outcome': named(0, str(
+                    rng.choice(['Complete', 'Incomplete'])))}
+                if rng.random() < 0.3:
+                    event['dribble']['nutmeg'] = True
+            elif event_type == 'Foul Won' and rng.random() < 0.5:
+                event['foul_won'] = {'defensive': True}
+            elif event_type == 'Duel':
+                event['duel'] = {'outcome': named(0, str(
+                    rng.choice(['success', 'Won', 'Lost In Play'])))}
+            elif event_type == 'Pressure' and rng.random() < 0.4:
+                event['counterpress'] = True
+            elif event_type == 'Foul Committed' and rng.random() < 0.4:
+                event['foul_committed'] = {'card': named(0, str(
+                    rng.choice(['Yellow Card', 'Red Card'])))}
+            events.append(event)
+        return events
+
+    def test_sections_match(self):
+        raw = RawMatchEvents(self.raw_events())
+        match = MatchEvents(raw.frame_for(raw.records))
+        for view, section in [
+                (PlayerMatchDefendingView(), '_get_defending_section'),
+                (PlayerMatchPossessionView(), '_get_possession_section')]:
+            for player in ['Player A', 'Player B']:
+                raw_stats, raw_data = getattr(view, section)(raw, player)
+                stats, data = getattr(view, section)(match, player)
+                self.assertEqual(json.dumps(raw_stats), json.dumps(stats))
+                self.assertEqual(raw_data, data)
+
+    def test_season_rows_match(self):
+        raw = RawMatchEvents(self.raw_events())
+        match = MatchEvents(raw.frame_for(raw.records))
+        view = PlayerSeasonView()
+        sections = ['defending', 'possession']
+        raw_rows = section_rows(raw, 'Player A', sections)
+        rows = section_rows(match, 'Player A', sections)
+        for section in sections:
+            self.assertEqual(
+                json.dumps(view._merge_section(section, [raw_rows[section]])),
+                json.dumps(view._merge_section(section, [rows[section]])))
+
+
+class PlayerMatchAnalyticsTests(SimpleTestCase):
+    def setUp(self):
+        self.match = build_match([
+            ('Pressure', {'counterpress': True}), ('Ball Recovery', {}),
+            ('Carry', {'carry_end_location': [60.0, 40.0]}), ('Miscontrol', {}),
+        ])
+
+    def get(self, query=''):
+        request = APIRequestFactory().get(
+            f'/api/player-match-analytics/1/Player A/{query}')
+        with mock.patch.object(PlayerMatchAnalyticsView, 'get_indexed_events',
+                               return_value=self.match):
+            response = PlayerMatchAnalyticsView.as_view()(
+                request, match_id=1, player_name='Player A')
+        return response.status_code, response.data
+
+    def test_sections_selector(self):
+        status, data = self.get('?sections=possession, defending')
+        self.assertEqual(status, 200)
+        self.assertEqual(list(data['sections']), ['defending', 'possession'])
+        self.assertEqual(
+            data['sections']['defending']['statistics']['total_defensive_actions'], 2)
+        self.assertEqual(
+            data['sections']['possession']['statistics']['total_carries'], 1)
+
+        status, data = self.get('?sections=defending,heading')
+        self.assertEqual(status, 400)
+        self.assertIn('heading', data['error'])
+
+    def test_failing_section_reports_its_error(self):
+        with mock.patch.object(PlayerMatchAnalyticsView, '_get_defending_section',
+                               side_effect=ValueError('No defending events')):
+            status, data = self.get('?sections=defending,possession')
+        self.assertEqual(status, 200)
+        self.assertEqual(data['sections']['defending'], {'error': 'No defending events'})
+        self.assertIn('statistics', data['sections']['possession'])
+
+
+class PlayerSeasonTests(SimpleTestCase):
+    def setUp(self):
+        self.match = build_match([
+            ('Pass', {}), ('Duel', {'duel_outcome': 'success'}),
+            ('Carry', {'carry_end_location': [60.0, 40.0]}),
+        ])
+
+    def test_section_rows_hold_only_the_statistics_fields(self):
+        rows = section_rows(self.match, 'Player A', ['defending', 'shooting'])
+        self.assertEqual(list(rows), ['defending'])
+        self.assertEqual(rows['defending'], [
+            {'type': 'Duel', 'duel_outcome': 'success'}])
+        self.assertEqual(section_rows(self.match, 'Nobody', ['defending']), {})
+
+    def test_cached_matches_are_read_in_process(self):
+        view = PlayerSeasonView()
+        with mock.patch.object(PlayerSeasonView, 'get_indexed_events',
+                               return_value=self.match), \
+                mock.patch.object(events_cache, 'contains', return_value=True), \
+                mock.patch('api.views.player.season.aggregates.get_process_pool') as pool:
+            match_rows, failed = view._collect_rows(
+                (1, 2), 'Player A', ['possession'])
+        pool.assert_not_called()
+        self.assertEqual(failed, [])
+        self.assertEqual(list(match_rows), [1, 2])
+        self.assertEqual(
+            view._merge_section('possession', [rows['possession'] for rows in
+                                               match_rows.values()])['total_carries'], 2)
+
+
+class NDJSONTests(SimpleTestCase):
+    def test_iter_ndjson_chunks_and_sanitizes(self):
+        frame = pd.DataFrame({
+            'x': np.arange(1201, dtype=float),
+            'location': [[1.0, np.nan]] * 1201,
+        })
+        frame.loc[3, 'x'] = np.nan
+        frame.loc[4, 'x'] = np.inf
+        chunks = list(iter_ndjson(frame, 500))
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [500, 500, 201])
+
+        rows = [json.loads(line) for chunk in chunks
+                for line in chunk.splitlines()]
+        self.assertEqual(len(rows), 1201)
+        self.assertEqual(rows[3], {'x': None, 'location': [1.0, None]})
+        self.assertIsNone(rows[4]['x'])
+        self.assertEqual(rows[1200]['x'], 1200.0)
+
+    def test_renderer_writes_one_line_per_item(self):
+        renderer = NDJSONRenderer()
+        self.assertEqual(renderer.render([{'a': 1}, {'b': 'é'}]),
+                         '{"a":1}\n{"b":"é"}\n'.encode('utf-8'))
+        self.assertEqual(renderer.render({'error': 'x'}), b'{"error":"x"}\n')
+        self.assertEqual(renderer.render(None), b'')
+
+    def get(self, view_class, query):
+        match = build_match([('Duel', {'duel_outcome': 'success'})] * 1201)
+        request = APIRequestFactory().get(f'/api/player-defending/1/Player A/{query}')
+        with mock.patch.object(view_class, 'get_indexed_events', return_value=match):
+            response = view_class.as_view()(
+                request, match_id=1, player_name='Player A')
+        if response.streaming:
+            return response, list(response.streaming_content)
+        return response, [response.render().content]
+
+    def test_format_ndjson_streams_event_rows(self):
+        response, chunks = self.get(PlayerMatchDefendingView, '?format=ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [500, 500, 201])
+        self.assertEqual(json.loads(chunks[0].splitlines()[0])['type'], 'Duel')
+
+        response, chunks = self.get(PlayerMatchDefendingView, '')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(chunks[0])['statistics'][
+            'total_defensive_actions'], 1201)
+
+    def test_format_ndjson_renders_errors_as_one_line(self):
+        response, chunks = self.get(PlayerMatchPassingView, '?format=ndjson')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(chunks[0].count(b'\n'), 1)
+        self.assertIn('error', json.loads(chunks[0]))
+
+
+async def asgi_get(path, query_string=''):
+    """Serve a GET through the ASGI handler.
+
+    Returns the response start message and the body messages, each with the
+    number of NDJSON chunks produced by the time it was sent.
+    """
+    produced = []
+    messages = []
+    requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    def counted_iter_ndjson(*args):
+        for chunk in iter_ndjson(*args):
+            produced.append(chunk)
+            yield chunk
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # Never disconnects
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append((message, len(produced)))
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path,
+        'raw_path': path.encode(), 'query_string': query_string.encode(),
+        'root_path': '', 'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 1234), 'server': ('testserver', 80),
+    }
+    with mock.patch.object(base, 'iter_ndjson', counted_iter_ndjson):
+        await get_asgi_application()(scope, receive, send)
+    return messages[0][0], [(m.get('body', b''), count) for m, count in messages[1:]]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncNDJSONTests(SimpleTestCase):
+    async def test_asgi_streams_ndjson_chunks_as_they_are_produced(self):
+        match = build_match([('Duel', {'duel_outcome': 'success'})] * 1201)
+        with mock.patch.object(PlayerMatchDefendingView, 'get_indexed_events',
+                               return_value=match):
+            start, bodies = await asgi_get(
+                '/api/player-match-def/1/Player A/', 'format=ndjson')
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'Content-Type', b'application/x-ndjson'), start['headers'])
+        self.assertEqual(b''.join(body for body, _ in bodies).count(b'\n'), 1201)
+        # Each chunk went out before the next one was produced
+        self.assertEqual(sorted({count for body, count in bodies if body}), [1, 2, 3])
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTests(SimpleTestCase):
+    async def test_wrapped_view_returns_the_sync_body(self):
+        match = build_match([('Duel', {'duel_outcome': 'success'})] * 30)
+        url = '/api/player-match-def/1/Player A/'
+        with mock.patch.object(PlayerMatchDefendingView, 'get_indexed_events',
+                               return_value=match):
+            response = await AsyncClient().get(url)
+            expected = PlayerMatchDefendingView.as_view()(
+                APIRequestFactory().get(url), match_id=1,
+                player_name='Player A').render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+
+    async def test_prefetches_run_concurrently_and_failures_reach_the_view(self):
+        # Each prefetch waits for the other, so they only finish together
+        both_running = threading.Barrier(2, timeout=5)
+        warmed = []
+
+        def get_indexed_events(match_id):
+            if not warmed:
+                both_running.wait()
+            raise ValueError('upstream down')
+
+        def warm(match_id):
+            both_running.wait()
+            warmed.append(match_id)
+
+        with mock.patch.object(MatchInformationView, 'get_indexed_events',
+                               side_effect=get_indexed_events), \
+                mock.patch.object(MatchLineupsView, 'warm', side_effect=warm):
+            response = await AsyncClient().get('/api/match-info/990004/')
+        self.assertEqual(warmed, [990004])
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()['error'], 'upstream down')
+
+    def test_wrapper_keeps_the_view_name_and_csrf_exemption(self):
+        view = MatchInformationView.as_view()
+        wrapped = async_view(view)
+        self.assertTrue(asyncio.iscoroutinefunction(wrapped))
+        self.assertTrue(wrapped.csrf_exempt)
+        self.assertEqual(wrapped.__name__, view.__name__)
+        self.assertIs(wrapped.__wrapped__, view)
+
+        match = resolve('/api/match-info/1/')
+        self.assertEqual(match.url_name, 'match-data')
+        self.assertTrue(asyncio.iscoroutinefunction(match.func))
+
+    async def test_unsafe_methods_skip_csrf_checks(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        response = await client.post('/api/player-match-def/1/Player A/')
+        self.assertEqual(response.status_code, 405)
+
+
+class MatchInformationTests(SimpleTestCase):
+    match_id = 990005
+
+    def setUp(self):
+        def at(period, minute, second, **extra):
+            return {'period': period, 'minute': minute, 'second': second, **extra}
+
+        # Out of order, with ties in both periods
+        self.match = build_match([
+            ('Half Start', at(2, 45, 0)),
+            ('Starting XI', at(1, 0, 0, tactics={'formation': 442, 'lineup': []})),
+            ('Half Start', at(1, 0, 0)),
+            ('Substitution', at(2, 60, 5)),
+            ('Tactical Shift', at(1, 30, 10, tactics={'formation': 433, 'lineup': []})),
+            ('Substitution', at(2, 60, 5)),
+            ('Half End', at(1, 45, 2)),
+            ('Pass', at(1, 12, 0)),
+            ('Half End', at(2, 90, 3)),
+            ('Player Off', at(1, 30, 10)),
+        ])
+        self.view = MatchInformationView()
+        response_cache.invalidate(self.match_id)
+        self.addCleanup(response_cache.invalidate, self.match_id)
+
+    def get(self, query=''):
+        request = APIRequestFactory().get(f'/api/match-info/{self.match_id}/{query}')
+        with mock.patch.object(MatchInformationView, 'get_indexed_events',
+                               return_value=self.match) as get_indexed_events:
+            response = MatchInformationView.as_view()(
+                request, match_id=self.match_id)
+        return response, get_indexed_events.call_count
+
+    def test_timeline_matches_the_period_and_time_sort(self):
+        with mock.patch.object(self.view, 'get_indexed_events',
+                               return_value=self.match):
+            info_events = self.view._get_info_events(self.match_id)
+        events_data = self.view.clean_dataframe(info_events)
+        timeline = self.view._organize_events(
+            events_data, self.view._timeline_positions(info_events))['match_timeline']
+
+        # The sort the timeline positions replaced
+        unsorted = self.view._organize_events(
+            events_data, range(len(events_data)))['match_timeline']
+        expected = sorted(unsorted, key=lambda x: (
+            x['period'], int(x['time'].split(':')[0]), int(x['time'].split(':')[1])))
+        self.assertEqual(timeline, expected)
+        self.assertEqual(
+            [(event['type'], event['period']) for event in timeline][-4:],
+            [('Half Start', 2), ('Substitution', 2), ('Substitution', 2),
+             ('Half End', 2)])
+
+    def test_raw_events_false_leaves_the_events_out(self):
+        response, _ = self.get('?raw_events=false')
+        slim = json.loads(response.content)
+        self.assertNotIn('raw_events', slim)
+        self.assertEqual(len(slim['match_events']), 9)
+
+        response, _ = self.get()
+        full = json.loads(response.content)
+        self.assertEqual(len(full['raw_events']), 9)
+        self.assertEqual({**slim, 'raw_events': full['raw_events']}, full)
+
+        # Both bodies are cached under their own kind
+        self.assertNotIn(b'raw_events', response_cache.get('match-info-slim', self.match_id))
+        self.assertIn(b'raw_events', response_cache.get('match-info', self.match_id))
+        response, fetches = self.get('?raw_events=false')
+        self.assertEqual(fetches, 0)
+        self.assertEqual(json.loads(response.content), slim)
+
+
+class OpenDataMirrorSourceTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        for name, data in OPEN_DATA_FILES.items():
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(data))
+        self.source = OpenDataMirrorSource(str(self.root))
+
+        # statsbombpy reads the same tree instead of the hosted open data
+        base = OPEN_DATA_PATHS['competitions'].rsplit('/', 1)[0] + '/'
+
+        def get_response(url):
+            return json.loads((self.root / url[len(base):]).read_text())
+
+        patcher = mock.patch.object(public, 'get_response', get_response)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_frames_match_statsbombpy(self):
+        pd.testing.assert_frame_equal(
+            self.source.competitions(), sb.competitions())
+        pd.testing.assert_frame_equal(
+            self.source.matches(11, 90), sb.matches(competition_id=11, season_id=90))
+        pd.testing.assert_frame_equal(self.source.events(1), sb.events(match_id=1))
+
+        lineups = self.source.lineups(1)
+        expected = sb.lineups(match_id=1)
+        self.assertEqual(list(lineups), list(expected))
+        for team in expected:
+            pd.testing.assert_frame_equal(lineups[team], expected[team])
+
+        self.assertEqual(self.source.raw_events(1), sb.events(match_id=1, fmt='dict'))
+        self.assertEqual(self.source.frames(1), sb.frames(match_id=1, fmt='dict'))
+
+    def test_missing_and_empty_files(self):
+        for fetch in (self.source.events, self.source.raw_events,
+                      self.source.lineups, self.source.frames):
+            with self.assertRaises(FileNotFoundError) as raised:
+                fetch(2)
+            self.assertTrue(_is_missing(raised.exception))
+        with self.assertRaises(FileNotFoundError):
+            self.source.matches(11, 91)
+
+        (self.root / 'events' / '2.json').write_text('')
+        with self.assertRaises(ValueError):
+            self.source.events(2)
+
+
+class LineupsSource:
+    """Data source stand-in that counts lineup fetches"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def lineups(self, match_id):
+        self.calls += 1
+        return {
+            'Arsenal': pd.DataFrame({
+                'player_id': [1, 2], 'player_name': ['Keeper', 'Striker'],
+                'player_nickname': [np.nan, 'Nine'], 'jersey_number': [1, 9],
+                'country': ['England', 'France'],
+                'positions': [[{'position': 'Goalkeeper'}], []],
+                'cards': [[], [{'card_type': 'Yellow Card', 'time': '12:00'}]],
+            }),
+            # No nickname or cards columns at all
+            'Chelsea': pd.DataFrame({
+                'player_id': [3], 'player_name': ['Winger'], 'jersey_number': [7],
+                'country': [np.nan], 'positions': [[{'position': 'Left Wing'}]],
+            }),
+        }
+
+
+class MatchLineupsTests(SimpleTestCase):
+    match_id = 990001
+
+    def setUp(self):
+        self.source = LineupsSource()
+        response_cache.invalidate(self.match_id)
+        self.addCleanup(response_cache.invalidate, self.match_id)
+
+    def get(self, query=''):
+        request = APIRequestFactory().get(f'/api/matches/{self.match_id}/lineups/{query}')
+        with mock.patch.object(MatchLineupsView, 'data_source', self.source):
+            response = MatchLineupsView.as_view()(request, match_id=self.match_id)
+        return json.loads(response.content)
+
+    def test_reindexes_and_sanitizes_lineups(self):
+        self.assertEqual(self.get(), {
+            'Arsenal': [
+                {'player_id': 1, 'player_name': 'Keeper', 'nickname': None,
+                 'jersey_number': 1, 'country': 'England',
+                 'positions': [{'position': 'Goalkeeper'}]},
+                {'player_id': 2, 'player_name': 'Striker', 'nickname': 'Nine',
+                 'jersey_number': 9, 'country': 'France', 'positions': [],
+                 'cards': [{'card_type': 'Yellow Card', 'time': '12:00'}]},
+            ],
+            'Chelsea': [
+                {'player_id': 3, 'player_name': 'Winger', 'nickname': None,
+                 'jersey_number': 7, 'country': None,
+                 'positions': [{'position': 'Left Wing'}]},
+            ],
+        })
+
+    def test_cached_until_refresh(self):
+        first = self.get()
+        self.assertEqual(self.get(), first)
+        self.assertEqual(self.source.calls, 1)
+
+        self.get('?refresh=1')
+        self.assertEqual(self.source.calls, 2)
+        self.assertTrue(response_cache.contains('lineups', self.match_id))
+
+
+class SingleFlightTests(SimpleTestCase):
+    def run_concurrently(self, flight, fn, callers=8, timeout=None):
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(flight.do('key', fn, timeout=timeout))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return 'events'
+
+        threading.Timer(0.2, release.set).start()
+        results, errors = self.run_concurrently(flight, fetch)
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ['events'] * 8)
+        self.assertEqual(errors, [])
+        self.assertEqual(flight.stats()['collapsed'], 7)
+        self.assertEqual(flight.stats()['in_flight'], 0)
+
+    def test_followers_receive_leader_error(self):
+        flight = SingleFlight()
+
+        def fetch():
+            time.sleep(0.2)
+            raise ValueError('upstream failed')
+
+        results, errors = self.run_concurrently(flight, fetch, callers=4)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(all(isinstance(e, ValueError) for e in errors))
+
+    def test_followers_time_out(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        leader = threading.Thread(
+            target=flight.do, args=('key', lambda: release.wait(5)))
+        leader.start()
+        time.sleep(0.05)
+        with self.assertRaises(SingleFlightTimeout):
+            flight.do('key', lambda: None, timeout=0.1)
+        release.set()
+        leader.join()
+        self.assertEqual(flight.stats()['timeouts'], 1)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def fail(self):
+        raise ConnectionError('upstream down')
+
+    def test_opens_on_failure_rate_and_fails_fast(self):
+        breaker = CircuitBreaker('events', failure_rate=0.5, min_calls=4)
+        calls = []
+        for fn in [lambda: calls.append(1), self.fail, lambda: calls.append(1), self.fail]:
+            try:
+                breaker.call(fn)
+            except ConnectionError:
+                pass
+        self.assertEqual(breaker.stats()['state'], 'open')
+
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(breaker.stats()['rejected'], 1)
+
+    def test_half_open_trial_closes_or_reopens(self):
+        breaker = CircuitBreaker('events', min_calls=1, reset_timeout=0.1)
+        with self.assertRaises(ConnectionError):
+            breaker.call(self.fail)
+        time.sleep(0.15)
+        with self.assertRaises(ConnectionError):
+            breaker.call(self.fail)
+        self.assertEqual(breaker.stats()['state'], 'open')
+
+        time.sleep(0.15)
+        self.assertEqual(breaker.call(lambda: 'events'), 'events')
+        self.assertEqual(breaker.stats()['state'], 'closed')
+
+    def test_interrupted_trial_is_released(self):
+        breaker = CircuitBreaker('events', min_calls=1, reset_timeout=0.1)
+        with self.assertRaises(ConnectionError):
+            breaker.call(self.fail)
+        time.sleep(0.15)
+
+        def interrupt():
+            raise KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            breaker.call(interrupt)
+        self.assertEqual(breaker.stats()['state'], 'half-open')
+        self.assertEqual(breaker.call(lambda: 'events'), 'events')
+        self.assertEqual(breaker.stats()['state'], 'closed')
+
+    def test_client_errors_do_not_count(self):
+        breaker = CircuitBreaker('events', min_calls=1)
+        with self.assertRaises(FileNotFoundError):
+            breaker.call(lambda: open('/nonexistent/events.json'))
+        self.assertEqual(breaker.stats()['state'], 'closed')
+
+
+class MatchFramesTests(SimpleTestCase):
+    def setUp(self):
+        def player(x, y, teammate=False, keeper=False):
+            return {'teammate': teammate, 'actor': False, 'keeper': keeper,
+                    'location': [x, y]}
+
+        self.frames = MatchFrames([
+            {'event_uuid': 'shot-1', 'visible_area': [60.0, 0.0, 120.0, 0.0, 120.0, 80.0],
+             'freeze_frame': [player(110.3, 40.0), player(105.0, 39.9, teammate=True),
+                              player(119.2, 40.1, keeper=True), player(110.0, 10.0)]},
+            {'event_uuid': 'shot-2', 'visible_area': [],
+             'freeze_frame': [player(90.0, 40.0)]},
+        ])
+
+    def test_frame_round_trips_locations(self):
+        frame = self.frames.frame('shot-1')
+        self.assertEqual(
+            [p['location'] for p in frame['freeze_frame']],
+            [[110.3, 40.0], [105.0, 39.9], [119.2, 40.1], [110.0, 10.0]])
+        self.assertEqual(frame['visible_area'], [[60.0, 0.0], [120.0, 0.0], [120.0, 80.0]])
+        self.assertIsNone(self.frames.frame('missing'))
+
+    def test_defenders_between_ball_and_goal(self):
+        defenders, keeper_in_cone, visible = self.frames.defenders_between(
+            ['shot-2', 'no-frame', 'shot-1'], [100.0, 100.0, 100.0], [40.0, 40.0, 40.0])
+        self.assertEqual(defenders.tolist(), [0, -1, 1])
+        self.assertEqual(keeper_in_cone.tolist(), [False, False, True])
+        self.assertEqual(visible.tolist(), [1, -1, 4])
+
+
+class MissingFilesSource:
+    def __init__(self, events=True, frames=True):
+        self.has_events = events
+        self.has_frames = frames
+
+    def events(self, match_id):
+        if not self.has_events:
+            raise FileNotFoundError(f'{match_id}.json')
+        return build_match([('Shot', {})]).frame
+
+    def frames(self, match_id):
+        if not self.has_frames:
+            raise FileNotFoundError(f'{match_id}.json')
+        return []
+
+
+class MatchShotFramesViewTests(SimpleTestCase):
+    match_id = 990003
+
+    def setUp(self):
+        self.addCleanup(events_cache.invalidate, self.match_id)
+        self.addCleanup(frames_cache.invalidate, self.match_id)
+
+    def get(self, source):
+        request = APIRequestFactory().get(f'/api/match-shot-frames/{self.match_id}/')
+        response = MatchShotFramesView.as_view(data_source=source)(
+            request, match_id=self.match_id)
+        return response.status_code, response.data
+
+    def test_missing_frames_are_a_404(self):
+        status, data = self.get(MissingFilesSource(frames=False))
+        self.assertEqual(status, 404)
+        self.assertEqual(data['error'], f'No 360 data found for match {self.match_id}')
+
+    def test_missing_events_are_not_reported_as_missing_frames(self):
+        status, data = self.get(MissingFilesSource(events=False))
+        self.assertEqual(status, 500)
+        self.assertIn('shot metrics', data['message'])
+
+
+class CompactFrameTests(SimpleTestCase):
+    def setUp(self):
+        nan = np.nan
+        self.frame = pd.DataFrame({
+            'id': ['a', 'b', 'c', 'd'],
+            'minute': [0, 1, 45, 90],
+            'duration': [0.5, 1.164246, nan, 0.0],
+            'xg': [0.123456789012, nan, nan, 0.5],
+            'unused': [nan, nan, nan, nan],
+            'outcome': ['Won', nan, 'Won', 'Lost'],
+            'under_pressure': [True, nan, nan, False],
+            'location': [[60.0, 40.1], [119.9, 0.5], nan, [1.0, 2.0]],
+            'end_location': [[120.0, 36.0, 1.4], nan, [118.2, 40.5], nan],
+            'related_events': [['b'], nan, ['a', 'd'], nan],
+        })
+
+    def test_match_events_leave_the_given_frame_alone(self):
+        frame = pd.DataFrame({
+            'player': ['Player A', None, 'Player B'], 'team': ['Home'] * 3,
+            'type': ['Pass', 'Half Start', 'Shot'], 'x': [1.5, np.nan, 3.0],
+        })
+        original = frame.copy()
+        match = MatchEvents(frame)
+        pd.testing.assert_frame_equal(frame, original)
+        self.assertEqual(match.frame['player'].dtype.name, 'category')
+        pd.testing.assert_frame_equal(
+            match.frame.astype({'player': object, 'team': object, 'type': object}),
+            original)
+    def test_round_trip_is_exact(self):
+        compact = CompactFrame(self.frame.copy())
+        for rebuilt, expected in [(compact.take(), self.frame),
+                                  (compact.take(np.array([3, 0])), self.frame.iloc[[3, 0]])]:
+            pd.testing.assert_frame_equal(rebuilt, expected, check_exact=True)
+            self.assertEqual(repr(rebuilt.to_dict('records')),
+                             repr(expected.to_dict('records')))
+
+    def test_take_some_columns(self):
+        compact = CompactFrame(self.frame.copy())
+        columns = ['location', 'id', 'unused', 'under_pressure']
+        pd.testing.assert_frame_equal(
+            compact.take(np.array([2, 3]), columns),
+            self.frame.iloc[[2, 3]][columns], check_exact=True)
+
+    def test_layout(self):
+        report = CompactFrame(self.frame.copy()).report()
+        self.assertEqual(report['dropped_null_columns'], ['unused'])
+        self.assertEqual(report['flag_columns'], ['under_pressure'])
+        self.assertEqual(report['location_columns'], ['end_location', 'location'])
+        # 0.123456789012 does not fit in float32 exactly
+        self.assertEqual(report['downcast_columns'], ['duration', 'minute'])
+
+
+# Run in a fresh interpreter: this process has pandas and numpy loaded
+URLCONF_SCRIPT = """
+import json, sys
+import django
+django.setup()
+from django.urls import Resolver404, get_resolver, resolve
+
+try:
+    get_resolver().url_patterns
+except ImportError as e:
+    print(json.dumps({'import_error': e.name}))
+    sys.exit()
+
+def resolves(path):
+    try:
+        resolve(path)
+        return True
+    except Resolver404:
+        return False
+
+print(json.dumps({
+    'api': resolves('/api/match-info/1/'),
+    'admin': resolves('/admin/'),
+    'heavy': sorted(name for name in ('numpy', 'pandas', 'statsbombpy')
+                    if name in sys.modules),
+}))
+"""
+
+
+class UrlProfileTests(SimpleTestCase):
+    def load_urlconf(self, profile):
+        env = {**os.environ, 'API_URL_PROFILE': profile,
+               'DJANGO_SETTINGS_MODULE': 'backend.settings',
+               'SECRET_KEY': settings.SECRET_KEY}
+        result = json.loads(subprocess.run(
+            [sys.executable, '-c', URLCONF_SCRIPT], env=env, cwd=settings.BASE_DIR,
+            capture_output=True, check=True, text=True).stdout)
+        if (result.get('import_error') or '').startswith('sbapi.v1'):
+            self.skipTest(f"sbapi.v1 URLconf does not import: {result['import_error']}")
+        return result
+
+    def test_sbapi_profile_leaves_out_the_api_routes(self):
+        result = self.load_urlconf('sbapi')
+        self.assertFalse(result['api'])
+        self.assertTrue(result['admin'])
+        self.assertEqual(result['heavy'], [])
+
+    def test_api_routes_do_not_import_pandas_or_statsbombpy(self):
+        result = self.load_urlconf('full')
+        self.assertTrue(result['api'])
+        self.assertEqual(result['heavy'], [])
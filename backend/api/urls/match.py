@@ -1,5 +1,6 @@
 # api/urls/match.py
 from django.urls import path
+from ..views.match.frames import MatchEventFrameView, MatchShotFramesView
 from ..views.match.info import MatchInformationView
 from ..views.match.lineups import MatchLineupsView
 
@@ -11,4 +12,12 @@ urlpatterns = [
     path('match-lineups/<int:match_id>/',
          MatchLineupsView.as_view(),
          name='match-lineups'),
+
+    path('match-frames/<int:match_id>/<str:event_id>/',
+         MatchEventFrameView.as_view(),
+         name='match-event-frame'),
+
+    path('match-shot-frames/<int:match_id>/',
+         MatchShotFramesView.as_view(),
+         name='match-shot-frames'),
 ]
@@ -0,0 +1,8 @@
+from django.urls import path
+from ..views.metrics import MetricsView
+
+urlpatterns = [
+    path('metrics/',
+         MetricsView.as_view(),
+         name='api-metrics'),
+]
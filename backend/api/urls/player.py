@@ -1,10 +1,12 @@
 from django.urls import path
+from ..views.player.match.analytics import PlayerMatchAnalyticsView
 from ..views.player.match.defending import PlayerMatchDefendingView
 from ..views.player.match.goalkeeping import GoalkeeperMatchView
 from ..views.player.match.passing import PlayerMatchPassingView
 from ..views.player.match.possession import PlayerMatchPossessionView
 from ..views.player.match.shooting import PlayerMatchShootingView
 from ..views.player.match.touches import PlayerMatchTouchesView
+from ..views.player.season.aggregates import PlayerSeasonView
 
 urlpatterns = [
     path('player-match-touches/<int:match_id>/<str:player_name>/',
@@ -30,4 +32,12 @@ urlpatterns = [
     path('player-gk/<int:match_id>/<str:player_name>/',
          GoalkeeperMatchView.as_view(),
          name='gk-data'),
+
+    path('player-match-analytics/<int:match_id>/<str:player_name>/',
+         PlayerMatchAnalyticsView.as_view(),
+         name='analytics-data'),
+
+    path('player-season/<int:competition_id>/<int:season_id>/<str:player_name>/',
+         PlayerSeasonView.as_view(),
+         name='season-data'),
 ]
@@ -1,26 +1,62 @@
 # Returns a list of matches for a competition and season
 
+from datetime import date
+
 from api.core.imports import *
+from api.core.warming import season_warmer
 
 
 class CompetitionMatchesView(BaseStatsBombView):
+    """Matches of a competition season.
+
+    Optional filters: ``?team=`` (home or away) and an inclusive
+    ``?date_from=`` / ``?date_to=`` range in YYYY-MM-DD format.
+    ``?prefetch=1`` (or API_PREFETCH['ON_MATCHES_VIEW']) queues the season's
+    events and lineups for background warming.
+    """
+
     def get(self, request, competition_id, season_id):
+        try:
+            filters = self._get_filters(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
         try:
             logger.info(
                 f"Fetching matches for competition {competition_id} and season {season_id}")
 
-            # Get matches
-            matches = sb.matches(
-                competition_id=competition_id, season_id=season_id)
+            # Get the cleaned, indexed season matches
+            season = self.get_season_matches(competition_id, season_id)
 
-            if matches is None or matches.empty:
+            if season is None:
                 return Response({'error': 'No matches found'}, status=404)
 
-            # Clean and convert to JSON-safe format
-            matches_data = self.clean_dataframe(matches)
+            if season_warmer.on_matches_view or request.query_params.get('prefetch'):
+                season_warmer.trigger(
+                    competition_id, season_id, season.match_ids())
+
+            if not any(value is not None for value in filters.values()):
+                return self.json_response(season.matches_json)
 
-            return Response(matches_data)
+            return Response(season.select(**filters))
 
         except Exception as e:
             logger.error(f"Error fetching matches: {str(e)}")
             return self.handle_error(e, "Failed to fetch matches")
+
+    def _get_filters(self, request):
+        """Parse the optional team and date range filters"""
+        params = request.query_params
+        filters = {
+            'team': params.get('team') or None,
+            'date_from': params.get('date_from') or None,
+            'date_to': params.get('date_to') or None,
+        }
+        for name in ('date_from', 'date_to'):
+            if filters[name] is not None:
+                try:
+                    filters[name] = date.fromisoformat(filters[name]).isoformat()
+                except ValueError:
+                    raise ValueError(
+                        f"Invalid {name} '{filters[name]}', expected YYYY-MM-DD")
+        return filters
@@ -0,0 +1,102 @@
+from api.core.imports import *
+
+
+def _is_missing(error):
+    """Whether a data source error means the match has no 360 data"""
+    response = getattr(error, 'response', None)
+    return (isinstance(error, FileNotFoundError)
+            or getattr(response, 'status_code', None) == 404)
+
+
+class FramesMissing(Exception):
+    """The data source has no 360 data for a match"""
+
+
+def _get_frames(view, match_id):
+    """Return a match's 360 frames, raising FramesMissing if it has none.
+
+    Only errors from loading the frames are checked, so a missing events
+    file is not reported as missing 360 data.
+    """
+    try:
+        return view.get_match_frames(match_id)
+    except Exception as e:
+        if _is_missing(e):
+            raise FramesMissing(match_id) from e
+        raise
+
+
+class MatchEventFrameView(BaseStatsBombView):
+    """StatsBomb 360 freeze frame and visible area of one event"""
+
+    def get(self, request, match_id, event_id):
+        try:
+            logger.info(f"Fetching 360 frame for event {event_id} of match {match_id}")
+            frame = _get_frames(self, match_id).frame(event_id)
+            if frame is None:
+                return Response({
+                    'error': f'No 360 frame found for event {event_id}'
+                }, status=HTTP_404_NOT_FOUND)
+            return Response({'match_id': match_id, **frame})
+
+        except FramesMissing:
+            return Response({
+                'error': f'No 360 data found for match {match_id}'
+            }, status=HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.error(f"Error in MatchEventFrameView: {str(e)}")
+            return self.handle_error(
+                e, f"Failed to fetch 360 frame for match {match_id}")
+
+
+class MatchShotFramesView(BaseStatsBombView):
+    """Shots of a match with metrics derived from their 360 freeze frames.
+
+    ``defenders_between`` counts the outfield opponents inside the triangle
+    joining the ball to the goal posts, and ``keeper_in_cone`` says whether
+    the goalkeeper is in it. Both are -1/False for shots without a frame.
+    """
+    shot_columns = ['id', 'period', 'minute', 'second', 'team', 'player',
+                    'location', 'shot_outcome', 'shot_statsbomb_xg']
+
+    def get(self, request, match_id):
+        try:
+            logger.info(f"Fetching 360 shot metrics for match {match_id}")
+            shots = self.get_indexed_events(match_id).type_events(
+                ['Shot'], self.shot_columns)
+            if shots.empty:
+                return Response({
+                    'error': f'No shots found for match {match_id}'
+                }, status=HTTP_404_NOT_FOUND)
+
+            frames = _get_frames(self, match_id)
+            locations = np.array(
+                [location[:2] for location in shots['location']], dtype=np.float32)
+            defenders, keeper_in_cone, visible = frames.defenders_between(
+                shots['id'].tolist(), locations[:, 0], locations[:, 1])
+
+            shot_data = self.clean_dataframe(shots.reindex(columns=self.shot_columns))
+            for shot, count, keeper, players in zip(
+                    shot_data, defenders.tolist(), keeper_in_cone.tolist(),
+                    visible.tolist()):
+                shot.update({
+                    'defenders_between': count,
+                    'keeper_in_cone': keeper,
+                    'visible_players': players,
+                })
+
+            return Response({
+                'match_id': match_id,
+                'total_shots': len(shot_data),
+                'shots_with_frames': int((visible >= 0).sum()),
+                'shots': shot_data,
+            })
+
+        except FramesMissing:
+            return Response({
+                'error': f'No 360 data found for match {match_id}'
+            }, status=HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.error(f"Error in MatchShotFramesView: {str(e)}")
+            return self.handle_error(
+                e, f"Failed to fetch 360 shot metrics for match {match_id}")
@@ -4,10 +4,21 @@
 # GET MATCH INFO - focuses on team stuff, its a list of match events it shows evryhting lineups shows the difference is that these
 # are events that are in info type, tactical cnage see,
 # eg start of matc formaiton change, sub time eg formation/tactic and when,
+from rest_framework.renderers import JSONRenderer
+
+from api.core.breaker import stale_resources
+from api.core.cache import response_cache
 from api.core.imports import *
+from .lineups import MatchLineupsView
 
 
 class MatchInformationView(BaseStatsBombView):
+    """Information events of a match organized into a timeline.
+
+    ``?raw_events=false`` leaves the cleaned events out of the response.
+    Both variants are cached per match. ``?format=ndjson`` streams just the
+    cleaned events, one per line.
+    """
     info_types = [
         'Bad Behaviour', 'Half End', 'Half Start', 'Injury Stoppage', 'Offside',
         'Own Goal Against', 'Own Goal For', 'Player Off', 'Player On',
@@ -26,139 +37,177 @@ class MatchInformationView(BaseStatsBombView):
                 }
         return tactics_data
 
+    def get_prefetches(self, match_id):
+        """Load events and warm lineups together; the match page needs both"""
+        return [
+            lambda: self.get_indexed_events(match_id),
+            lambda: MatchLineupsView().warm(match_id),
+        ]
+
     def get(self, request, match_id):
+        include_raw = request.query_params.get(
+            'raw_events', 'true').lower() not in ('0', 'false', 'no')
+        kind = 'match-info' if include_raw else 'match-info-slim'
+
         try:
             logger.info(
                 f"Fetching match information events for match {match_id}")
-            match_events = sb.events(match_id=match_id)
-
-            # Filter for information events
-            info_events = match_events[
-                match_events['type'].isin(self.info_types)
-            ]
-
-            if info_events.empty:
-                return Response({
-                    'error': f'No information events found for match {match_id}'
-                }, status=404)
-
-            # Define columns to keep - combine base event columns and
-            # info-specific columns
-            info_columns = self.event_columns + [
-                'bad_behaviour_card', 'tactics', 'replacement', 'outcome'
-            ]
-
-            # Keep only columns that exist in the DataFrame
-            columns_to_keep = [col for col in info_columns
-                               if col in info_events.columns]
-
-            info_events = info_events[columns_to_keep]
-            info_events = info_events.replace(
-                {np.nan: None, np.inf: None, -np.inf: None})
-            events_data = self.clean_dataframe(info_events)
 
-            # Organize events by type and period
-            organized_events = {
-                'match_timeline': [],
-                'statistics': {
-                    'total_events': len(events_data),
-                    'events_by_type': {},
-                    'events_by_period': {},
-                },
-                'team_data': {
-                    'starting_xi': {},
-                    'substitutions': [],
-                    'tactical_shifts': []
-                }
-            }
+            if self.wants_ndjson(request):
+                info_events = self._get_info_events(match_id)
+                if info_events is None:
+                    return self._not_found(match_id)
+                return self.ndjson_response(info_events)
 
-            # Process each event
-            for event in events_data:
-                event_type = event.get('type')
-                period = event.get('period')
-                minute = event.get('minute')
-                second = event.get('second')
-                team = event.get('team')
-
-                # Base timeline event structure
-                timeline_event = {
-                    'type': event_type,
-                    'period': period,
-                    'time': f"{minute}:{str(second).zfill(2)}",
-                    'team': team,
-                    'player': event.get('player')
-                }
+            content = response_cache.get(kind, match_id)
+            if content is not None:
+                return self.json_response(content)
 
-                # Process specific event types
-                if event_type == 'Starting XI':
-                    tactics_data = self.process_tactics_data(event)
-                    if tactics_data:
-                        organized_events['team_data']['starting_xi'][team] = {
-                            'formation': tactics_data.get('formation'),
-                            'lineup': tactics_data.get('lineup'),
-                            'period': period
-                        }
-                        timeline_event['tactics'] = tactics_data
-
-                elif event_type == 'Substitution':
-                    sub_data = {
-                        'time': f"{minute}:{str(second).zfill(2)}",
-                        'team': team,
-                        'player_off': event.get('player'),
-                        'player_on': event.get('replacement', {}).get('name'),
-                        'reason': event.get('outcome', {}).get('name'),
-                        'period': period
-                    }
-                    organized_events['team_data']['substitutions'].append(
-                        sub_data)
-                    timeline_event.update(sub_data)
-
-                elif event_type == 'Tactical Shift':
-                    tactics_data = self.process_tactics_data(event)
-                    if tactics_data:
-                        shift_data = {
-                            'time': f"{minute}:{str(second).zfill(2)}",
-                            'team': team,
-                            'period': period,
-                            'new_formation': tactics_data.get('formation'),
-                            'new_lineup': tactics_data.get('lineup')
-                        }
-                        organized_events['team_data']['tactical_shifts'].append(
-                            shift_data)
-                        timeline_event.update(shift_data)
-
-                elif event_type == 'Bad Behaviour':
-                    timeline_event['card'] = event.get('bad_behaviour_card')
-
-                # Add to timeline
-                organized_events['match_timeline'].append(timeline_event)
-
-                # Update statistics
-                organized_events['statistics']['events_by_type'][event_type] = \
-                    organized_events['statistics']['events_by_type'].get(
-                        event_type, 0) + 1
-
-                period_key = f"Period {period}"
-                organized_events['statistics']['events_by_period'][period_key] = \
-                    organized_events['statistics']['events_by_period'].get(
-                        period_key, 0) + 1
-
-            # Sort timeline by period and time
-            organized_events['match_timeline'].sort(
-                key=lambda x: (x['period'],
-                               int(x['time'].split(':')[0]),
-                               int(x['time'].split(':')[1]))
-            )
-
-            return Response({
+            info_events = self._get_info_events(match_id)
+            if info_events is None:
+                return self._not_found(match_id)
+
+            events_data = self.clean_dataframe(info_events)
+            organized_events = self._organize_events(
+                events_data, self._timeline_positions(info_events))
+
+            renderer = JSONRenderer()
+            payload = {
                 'match_id': match_id,
                 'match_events': organized_events['match_timeline'],
                 'statistics': organized_events['statistics'],
                 'team_data': organized_events['team_data'],
-                'raw_events': events_data
-            })
+            }
+            slim = renderer.render(payload)
+            full = renderer.render({**payload, 'raw_events': events_data})
+            # Bodies built from stale events are rebuilt once they refresh
+            if not stale_resources():
+                response_cache.set('match-info', match_id, full)
+                response_cache.set('match-info-slim', match_id, slim)
+
+            return self.json_response(full if include_raw else slim)
 
         except Exception as e:
             logger.error(f"Error in MatchInformationView: {str(e)}")
             return self.handle_error(
                 e, f"Failed to fetch match information for match {match_id}")
+
+    def _get_info_events(self, match_id):
+        """Return the match's information events and columns, or None"""
+        # Define columns to keep - combine base event columns and
+        # info-specific columns
+        info_columns = self.event_columns + [
+            'bad_behaviour_card', 'tactics', 'replacement', 'outcome'
+        ]
+
+        # Only the information rows and columns are rebuilt; columns the
+        # match does not have are left out
+        info_events = self.get_indexed_events(match_id).type_events(
+            self.info_types, info_columns)
+
+        if info_events.empty:
+            return None
+
+        return info_events
+
+    def _not_found(self, match_id):
+        return Response({
+            'error': f'No information events found for match {match_id}'
+        }, status=404)
+
+    def _timeline_positions(self, info_events):
+        """Position of each event in the timeline, ordered by period and time"""
+        # lexsort is stable and sorts by the last key first
+        order = np.lexsort((
+            info_events['second'].to_numpy(dtype=np.int64),
+            info_events['minute'].to_numpy(dtype=np.int64),
+            info_events['period'].to_numpy(dtype=np.int64),
+        ))
+        positions = np.empty(len(order), dtype=np.int64)
+        positions[order] = np.arange(len(order))
+        return positions.tolist()
+
+    def _organize_events(self, events_data, timeline_positions):
+        """Build the timeline, statistics and team data in one pass"""
+        timeline = [None] * len(events_data)
+        events_by_type = {}
+        events_by_period = {}
+        team_data = {
+            'starting_xi': {},
+            'substitutions': [],
+            'tactical_shifts': []
+        }
+
+        # Process each event
+        for event, position in zip(events_data, timeline_positions):
+            event_type = event.get('type')
+            period = event.get('period')
+            team = event.get('team')
+            time = f"{event.get('minute')}:{str(event.get('second')).zfill(2)}"
+
+            # Base timeline event structure
+            timeline_event = {
+                'type': event_type,
+                'period': period,
+                'time': time,
+                'team': team,
+                'player': event.get('player')
+            }
+
+            # Process specific event types
+            if event_type == 'Starting XI':
+                tactics_data = self.process_tactics_data(event)
+                if tactics_data:
+                    team_data['starting_xi'][team] = {
+                        'formation': tactics_data.get('formation'),
+                        'lineup': tactics_data.get('lineup'),
+                        'period': period
+                    }
+                    timeline_event['tactics'] = tactics_data
+
+            elif event_type == 'Substitution':
+                sub_data = {
+                    'time': time,
+                    'team': team,
+                    'player_off': event.get('player'),
+                    'player_on': (event.get('replacement') or {}).get('name'),
+                    'reason': (event.get('outcome') or {}).get('name'),
+                    'period': period
+                }
+                team_data['substitutions'].append(sub_data)
+                timeline_event.update(sub_data)
+
+            elif event_type == 'Tactical Shift':
+                tactics_data = self.process_tactics_data(event)
+                if tactics_data:
+                    shift_data = {
+                        'time': time,
+                        'team': team,
+                        'period': period,
+                        'new_formation': tactics_data.get('formation'),
+                        'new_lineup': tactics_data.get('lineup')
+                    }
+                    team_data['tactical_shifts'].append(shift_data)
+                    timeline_event.update(shift_data)
+
+            elif event_type == 'Bad Behaviour':
+                timeline_event['card'] = event.get('bad_behaviour_card')
+
+            # Place the event at its sorted timeline position
+            timeline[position] = timeline_event
+
+            # Update statistics
+            events_by_type[event_type] = events_by_type.get(event_type, 0) + 1
+            period_key = f"Period {period}"
+            events_by_period[period_key] = events_by_period.get(
+                period_key, 0) + 1
+
+        return {
+            'match_timeline': timeline,
+            'statistics': {
+                'total_events': len(events_data),
+                'events_by_type': events_by_type,
+                'events_by_period': events_by_period,
+            },
+            'team_data': team_data
+        }
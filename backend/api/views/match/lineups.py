@@ -1,49 +1,84 @@
+from rest_framework.renderers import JSONRenderer
+
+from api.core.cache import response_cache
 from api.core.imports import *
+from api.core.sanitize import sanitize_columns
 
 
 class MatchLineupsView(BaseStatsBombView):
+    """Team lineups for a match.
+
+    The processed lineups are cached per match; ``?refresh=1`` reloads them
+    from the data source and replaces the cached copy. Expired lineups are
+    served stale while they are reloaded in the background.
+    """
+    lineup_columns = [
+        'player_id', 'player_name', 'player_nickname', 'jersey_number',
+        'country', 'positions', 'cards'
+    ]
+
     def get(self, request, match_id):
         try:
             logger.info(f"Fetching lineups for match {match_id}")
 
-            # Fetch lineups for the specified match
-            lineups = sb.lineups(match_id=match_id)
+            if request.query_params.get('refresh'):
+                response_cache.invalidate(match_id, 'lineups')
 
-            if not lineups:
+            # Concurrent requests for the match share one fetch
+            content = response_cache.get_or_load(
+                'lineups', match_id, lambda: self._load_lineups(match_id))
+
+            if content is None:
                 return Response({'error': 'No lineup data found'}, status=404)
 
-            # Process each team's lineup
-            processed_lineups = {}
-            for team_name, team_data in lineups.items():
-                processed_players = []
+            return self.json_response(content)
+
+        except Exception as e:
+            logger.error(f"Error fetching lineups: {str(e)}")
+            return self.handle_error(e, "Failed to fetch match lineups")
+
+    def warm(self, match_id):
+        """Load the match's lineups into the response cache if missing"""
+        if response_cache.get('lineups', match_id) is None:
+            self.fetch_once(
+                'lineups', match_id, lambda: self._load_lineups(match_id))
 
-                # Iterate through each player in the lineup
-                for player_index in range(len(team_data)):
-                    player = team_data.iloc[player_index]
+    def _load_lineups(self, match_id):
+        """Fetch, process and cache the rendered lineups, or None if missing"""
+        lineups = self.get_data_source().lineups(match_id)
+        if not lineups:
+            return None
 
-                    # Capture relevant player details
-                    player_info = {
-                        'player_id': player['player_id'],
-                        'player_name': player['player_name'],
-                        'nickname': player['player_nickname'] if 'player_nickname' in player else None,
-                        'jersey_number': player['jersey_number'],
-                        'country': player['country'],
-                        'positions': player['positions']
-                    }
+        # Process each team's lineup and keep the rendered result
+        processed_lineups = {
+            team_name: self._process_team_lineup(team_data)
+            for team_name, team_data in lineups.items()
+        }
+        content = JSONRenderer().render(processed_lineups)
+        response_cache.set('lineups', match_id, content)
+        return content
 
-                    # Capture card information if available
-                    if 'cards' in player and player['cards']:
-                        player_info['cards'] = player['cards']
+    def _process_team_lineup(self, team_data):
+        """Convert one team's lineup frame to player records"""
+        columns = sanitize_columns(
+            team_data.reindex(columns=self.lineup_columns))
 
-                    # Append processed player info to the list
-                    processed_players.append(player_info)
+        processed_players = []
+        for player_id, player_name, nickname, jersey_number, country, positions, cards in zip(
+                *(columns[column] for column in self.lineup_columns)):
+            player_info = {
+                'player_id': player_id,
+                'player_name': player_name,
+                'nickname': nickname,
+                'jersey_number': jersey_number,
+                'country': country,
+                'positions': positions
+            }
 
-                # Add processed players list to the team
-                processed_lineups[team_name] = processed_players
+            # Capture card information if available
+            if cards:
+                player_info['cards'] = cards
 
-            # Return processed lineup data
-            return Response(processed_lineups)
+            processed_players.append(player_info)
 
-        except Exception as e:
-            logger.error(f"Error fetching lineups: {str(e)}")
-            return self.handle_error(e, "Failed to fetch match lineups")
+        return processed_players
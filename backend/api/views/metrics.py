@@ -0,0 +1,25 @@
+from api.core.imports import *
+from api.core.breaker import circuit_breakers
+from api.core.cache import (
+    events_cache, frames_cache, raw_events_cache, response_cache)
+from api.core.catalogue import season_matches_cache
+from api.core.singleflight import single_flight
+from api.core.warming import season_warmer
+
+
+class MetricsView(BaseStatsBombView):
+    def get(self, request):
+        return Response({
+            'events_cache': events_cache.stats(),
+            'events_cache_matches': events_cache.memory_report(),
+            'raw_events_cache': raw_events_cache.stats(),
+            'frames_cache': frames_cache.stats(),
+            'season_matches_cache': season_matches_cache.stats(),
+            'response_cache': response_cache.stats(),
+            'single_flight': single_flight.stats(),
+            'prefetch': season_warmer.stats(),
+            'circuit_breakers': {
+                resource: breaker.stats()
+                for resource, breaker in circuit_breakers.items()
+            }
+        })
@@ -0,0 +1,116 @@
+from api.core.imports import *
+from .defending import PlayerMatchDefendingView
+from .goalkeeping import GoalkeeperMatchView
+from .passing import PlayerMatchPassingView
+from .possession import PlayerMatchPossessionView
+from .shooting import PlayerMatchShootingView
+from .touches import PlayerMatchTouchesView
+
+
+class PlayerMatchAnalyticsView(BaseStatsBombView):
+    """All player-match stat sections computed from one events frame.
+
+    ``?sections=passing,shooting`` limits the response to some sections;
+    every section is returned by default.
+    """
+    sections = [
+        'touches', 'passing', 'shooting', 'defending', 'possession',
+        'goalkeeping'
+    ]
+
+    def get(self, request, match_id, player_name):
+        try:
+            sections = self._get_sections(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        try:
+            logger.info(
+                f"Fetching {', '.join(sections)} data for player {player_name} in match {match_id}")
+            # Every section is a lookup in the match's (player, type) index
+            match = self.get_indexed_events(match_id)
+
+            if not len(match.player_rows(player_name)):
+                return Response({
+                    'error': f'No events found for player {player_name}'
+                }, status=HTTP_404_NOT_FOUND)
+
+            data = {}
+            for section in sections:
+                try:
+                    data[section] = getattr(self, f'_get_{section}_section')(
+                        match, player_name)
+                except ValueError as e:
+                    data[section] = {'error': str(e)}
+
+            return Response({
+                'player': player_name,
+                'match_id': match_id,
+                'sections': data
+            })
+
+        except Exception as e:
+            logger.error(f"Error in PlayerMatchAnalyticsView: {str(e)}")
+            return self.handle_error(
+                e, f"Failed to fetch match analytics for player {player_name}")
+
+    def _get_sections(self, request):
+        """Parse the optional comma-separated sections selector"""
+        selector = request.query_params.get('sections')
+        if not selector:
+            return self.sections
+
+        sections = [s.strip() for s in selector.split(',') if s.strip()]
+        unknown = [s for s in sections if s not in self.sections]
+        if unknown:
+            raise ValueError(
+                f"Unknown sections: {', '.join(unknown)}. "
+                f"Choose from: {', '.join(self.sections)}")
+        return [s for s in self.sections if s in sections]
+
+    def _get_touches_section(self, match, player_name):
+        view = PlayerMatchTouchesView()
+        if not len(match.player_rows(player_name, view.touch_types)):
+            raise ValueError(
+                f'No touch events found for player {player_name}')
+        return view._get_touches_records(match, player_name)
+
+    def _get_passing_section(self, match, player_name):
+        view = PlayerMatchPassingView()
+        passes_data = view._get_passing_records(match, player_name)
+        return {
+            'statistics': view._calculate_passing_stats(passes_data),
+            'passes': passes_data
+        }
+
+    def _get_shooting_section(self, match, player_name):
+        view = PlayerMatchShootingView()
+        shots_data = view._get_shooting_records(match, player_name)
+        return {
+            'statistics': view._calculate_shooting_stats(shots_data),
+            'shots': shots_data
+        }
+
+    def _get_defending_section(self, match, player_name):
+        stats, defense_data = PlayerMatchDefendingView()._get_defending_section(
+            match, player_name)
+        return {
+            'statistics': stats,
+            'defensive_actions': defense_data
+        }
+
+    def _get_possession_section(self, match, player_name):
+        stats, possession_data = PlayerMatchPossessionView()._get_possession_section(
+            match, player_name)
+        return {
+            'statistics': stats,
+            'possession_events': possession_data
+        }
+
+    def _get_goalkeeping_section(self, match, player_name):
+        view = GoalkeeperMatchView()
+        gk_data = view._get_goalkeeper_records(match, player_name)
+        return {
+            'statistics': view._calculate_goalkeeper_stats(gk_data),
+            'goalkeeper_events': gk_data
+        }
@@ -23,12 +23,15 @@ class PlayerMatchDefendingView(BaseStatsBombView):
         try:
             logger.info(
                 f"Fetching defensive data for player {player_name} in match {match_id}")
-            match_events = sb.events(match_id=match_id)
+            match = self.get_indexed_events(match_id)
+
+            if self.wants_ndjson(request):
+                return self.ndjson_response(self._select_defensive_columns(
+                    match.player_events(player_name, self.defending_types),
+                    player_name))
 
             # Process data
-            defense_data = self._process_defensive_data(
-                match_events, player_name)
-            stats = self._calculate_defensive_stats(defense_data)
+            stats, defense_data = self._get_defending_section(match, player_name)
 
             return Response({
                 'player': player_name,
@@ -42,65 +45,73 @@ class PlayerMatchDefendingView(BaseStatsBombView):
             return self.handle_error(
                 e, f"Failed to fetch defensive data for player {player_name}")
 
-    def _process_defensive_data(self, match_events, player_name):
+    def _get_defending_section(self, match, player_name):
+        """Return the player's defensive statistics and cleaned actions"""
+        if isinstance(match, RawMatchEvents):
+            defense_data = match.select_records(
+                player_name, self.defending_types,
+                self.event_columns + self.defending_columns)
+            if not defense_data:
+                raise ValueError(
+                    f'No defensive events found for player {player_name}')
+            return (self._calculate_defensive_stats(pd.DataFrame(defense_data)),
+                    defense_data)
+
+        player_defense = match.player_events(player_name, self.defending_types)
+        defense_data = self._process_defensive_data(player_defense, player_name)
+        return self._calculate_defensive_stats(player_defense), defense_data
+
+    def _process_defensive_data(self, player_defense, player_name):
         """Process raw defensive data"""
-        player_defense = match_events[
-            (match_events['type'].isin(self.defending_types)) &
-            (match_events['player'] == player_name)
-        ]
+        return self.clean_dataframe(
+            self._select_defensive_columns(player_defense, player_name))
 
+    def _select_defensive_columns(self, player_defense, player_name):
+        """Keep only relevant defensive columns"""
         if player_defense.empty:
             raise ValueError(
                 f'No defensive events found for player {player_name}')
 
         columns_to_keep = [col for col in self.event_columns + self.defending_columns
                            if col in player_defense.columns]
+        return player_defense[columns_to_keep]
 
-        player_defense = player_defense[columns_to_keep]
-        player_defense = player_defense.replace(
-            {np.nan: None, np.inf: None, -np.inf: None})
-        return self.clean_dataframe(player_defense)
-
-    def _calculate_defensive_stats(self, defense_data):
+    def _calculate_defensive_stats(self, player_defense):
         """Calculate defensive statistics"""
+        type_counts = player_defense['type'].value_counts()
         stats = {
-            'total_defensive_actions': len(defense_data),
-            'actions_by_type': {}
+            'total_defensive_actions': len(player_defense),
+            'actions_by_type': {
+                event_type: int(type_counts[event_type])
+                for event_type in self.defending_types
+                if type_counts.get(event_type, 0) > 0
+            }
         }
 
-        # Count events by type
-        for event_type in self.defending_types:
-            count = sum(1 for event in defense_data if event.get(
-                'type') == event_type)
-            if count > 0:
-                stats['actions_by_type'][event_type] = count
-
         # Calculate duel success rate
-        duels = [event for event in defense_data if event.get(
-            'type') == 'Duel']
-        successful_duels = sum(
-            1 for duel in duels if duel.get('duel_outcome') == 'success')
-        if duels:
+        duels = player_defense[player_defense['type'] == 'Duel']
+        if not duels.empty:
+            successful_duels = int(
+                (self.get_column(duels, 'duel_outcome') == 'success').sum())
             stats['duel_success_rate'] = round(
                 (successful_duels / len(duels) * 100), 1)
 
         # Calculate pressure success rate
-        pressures = [event for event in defense_data if event.get(
-            'type') == 'Pressure']
-        successful_pressures = sum(
-            1 for pressure in pressures if pressure.get('counterpress') is True)
-        if pressures:
+        pressures = player_defense[player_defense['type'] == 'Pressure']
+        if not pressures.empty:
+            successful_pressures = self.count_true(pressures, 'counterpress')
             stats['pressure_success_rate'] = round(
                 (successful_pressures / len(pressures) * 100), 1)
 
         # Add additional statistics
+        cards = self.get_column(player_defense, 'foul_committed_card')
         stats.update({
-            'ball_recoveries': sum(1 for event in defense_data if event.get('type') == 'Ball Recovery'),
-            'interceptions': sum(1 for event in defense_data if event.get('type') == 'Interception'),
-            'fouls_committed': sum(1 for event in defense_data if event.get('type') == 'Foul Committed'),
+            'ball_recoveries': int(type_counts.get('Ball Recovery', 0)),
+            'interceptions': int(type_counts.get('Interception', 0)),
+            'fouls_committed': int(type_counts.get('Foul Committed', 0)),
             'cards': {
-                'yellow': sum(1 for event in defense_data if event.get('foul_committed_card') == 'Yellow Card'),
-                'red': sum(1 for event in defense_data if event.get('foul_committed_card') == 'Red Card')
+                'yellow': int((cards == 'Yellow Card').sum()),
+                'red': int((cards == 'Red Card').sum())
             }
         })
 
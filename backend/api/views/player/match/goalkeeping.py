@@ -16,10 +16,15 @@ class GoalkeeperMatchView(BaseStatsBombView):
         try:
             logger.info(
                 f"Fetching goalkeeper data for player {player_name} in match {match_id}")
-            match_events = sb.events(match_id=match_id)
+            match = self.get_indexed_events(match_id)
+
+            if self.wants_ndjson(request):
+                return self.ndjson_response(self._select_goalkeeper_columns(
+                    match.player_events(player_name, self.goalkeeper_types),
+                    player_name))
 
             # Process data
-            gk_data = self._process_goalkeeper_data(match_events, player_name)
+            gk_data = self._get_goalkeeper_records(match, player_name)
             stats = self._calculate_goalkeeper_stats(gk_data)
 
             return Response({
@@ -34,24 +39,30 @@ class GoalkeeperMatchView(BaseStatsBombView):
             return self.handle_error(
                 e, f"Failed to fetch goalkeeper data for player {player_name}")
 
-    def _process_goalkeeper_data(self, match_events, player_name):
+    def _get_goalkeeper_records(self, match, player_name):
+        """Return the player's goalkeeper events as cleaned dicts"""
+        gk_data = self.get_section_records(
+            match, player_name, self.goalkeeper_types,
+            self.event_columns + self.goalkeeper_columns)
+        if not gk_data:
+            raise ValueError(
+                f'No goalkeeper events found for player {player_name}')
+        return gk_data
+
+    def _process_goalkeeper_data(self, player_gk, player_name):
         """Process raw goalkeeper data"""
-        player_gk = match_events[
-            (match_events['type'].isin(self.goalkeeper_types)) &
-            (match_events['player'] == player_name)
-        ]
+        return self.clean_dataframe(
+            self._select_goalkeeper_columns(player_gk, player_name))
 
+    def _select_goalkeeper_columns(self, player_gk, player_name):
+        """Keep only relevant goalkeeper columns"""
         if player_gk.empty:
             raise ValueError(
                 f'No goalkeeper events found for player {player_name}')
 
         columns_to_keep = [col for col in self.event_columns + self.goalkeeper_columns
                            if col in player_gk.columns]
-
-        player_gk = player_gk[columns_to_keep]
-        player_gk = player_gk.replace(
-            {np.nan: None, np.inf: None, -np.inf: None})
-        return self.clean_dataframe(player_gk)
+        return player_gk[columns_to_keep]
 
     def _calculate_goalkeeper_stats(self, gk_data):
         """Calculate goalkeeper statistics"""
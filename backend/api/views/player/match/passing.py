@@ -15,21 +15,19 @@ class PlayerMatchPassingView(BaseStatsBombView):
         try:
             logger.info(
                 f"Fetching passing data for player {player_name} in match {match_id}")
-            match_events = sb.events(match_id=match_id)
+            match = self.get_indexed_events(match_id)
 
-            # Filter for passing events
-            player_passes = match_events[
-                (match_events['type'] == 'Pass') &
-                (match_events['player'] == player_name)
-            ]
-
-            if player_passes.empty:
+            if not len(match.player_rows(player_name, ['Pass'])):
                 return Response({
                     'error': f'No passing events found for player {player_name}'
                 }, status=HTTP_404_NOT_FOUND)
 
+            if self.wants_ndjson(request):
+                return self.ndjson_response(self._select_passing_columns(
+                    match.player_events(player_name, ['Pass'])))
+
             # Process data
-            passes_data = self._process_passing_data(player_passes)
+            passes_data = self._get_passing_records(match, player_name)
             stats = self._calculate_passing_stats(passes_data)
 
             return Response({
@@ -44,21 +42,24 @@ class PlayerMatchPassingView(BaseStatsBombView):
             return self.handle_error(
                 e, f"Failed to fetch passing data for player {player_name}")
 
+    def _get_passing_records(self, match, player_name):
+        """Return the player's passes as cleaned dicts"""
+        passes_data = self.get_section_records(
+            match, player_name, ['Pass'], self.event_columns + self.passing_columns)
+        if not passes_data:
+            raise ValueError(
+                f'No passing events found for player {player_name}')
+        return passes_data
+
     def _process_passing_data(self, player_passes):
         """Process raw passing data"""
-        # Keep only relevant columns
+        return self.clean_dataframe(self._select_passing_columns(player_passes))
+
+    def _select_passing_columns(self, player_passes):
+        """Keep only relevant columns"""
         columns_to_keep = [col for col in self.event_columns + self.passing_columns
                            if col in player_passes.columns]
-        player_passes = player_passes[columns_to_keep]
-
-        # Replace NaN, inf, and -inf values before cleaning
-        player_passes = player_passes.replace({
-            np.nan: None,
-            np.inf: None,
-            -np.inf: None
-        })
-
-        return self.clean_dataframe(player_passes)
+        return player_passes[columns_to_keep]
 
     def _calculate_passing_stats(self, passes_data):
         """Calculate passing statistics"""
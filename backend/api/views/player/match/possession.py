@@ -16,12 +16,16 @@ class PlayerMatchPossessionView(BaseStatsBombView):
         try:
             logger.info(
                 f"Fetching possession data for player {player_name} in match {match_id}")
-            match_events = sb.events(match_id=match_id)
+            match = self.get_indexed_events(match_id)
+
+            if self.wants_ndjson(request):
+                return self.ndjson_response(self._select_possession_columns(
+                    match.player_events(player_name, self.possession_types),
+                    player_name))
 
             # Process data
-            possession_data = self._process_possession_data(
-                match_events, player_name)
-            stats = self._calculate_possession_stats(possession_data)
+            stats, possession_data = self._get_possession_section(
+                match, player_name)
 
             return Response({
                 'player': player_name,
@@ -35,112 +39,124 @@ class PlayerMatchPossessionView(BaseStatsBombView):
             return self.handle_error(
                 e, f"Failed to fetch possession data for player {player_name}")
 
-    def _process_possession_data(self, match_events, player_name):
+    def _get_possession_section(self, match, player_name):
+        """Return the player's possession statistics and cleaned events"""
+        if isinstance(match, RawMatchEvents):
+            possession_data = match.select_records(
+                player_name, self.possession_types,
+                self.event_columns + self.possession_columns)
+            if not possession_data:
+                raise ValueError(
+                    f'No possession events found for player {player_name}')
+            return (self._calculate_possession_stats(pd.DataFrame(possession_data)),
+                    possession_data)
+
+        player_possession = match.player_events(
+            player_name, self.possession_types)
+        possession_data = self._process_possession_data(
+            player_possession, player_name)
+        return self._calculate_possession_stats(player_possession), possession_data
+
+    def _process_possession_data(self, player_possession, player_name):
         """Process raw possession data"""
-        player_possession = match_events[
-            (match_events['type'].isin(self.possession_types)) &
-            (match_events['player'] == player_name)
-        ]
+        return self.clean_dataframe(
+            self._select_possession_columns(player_possession, player_name))
 
+    def _select_possession_columns(self, player_possession, player_name):
+        """Keep only relevant possession columns"""
         if player_possession.empty:
             raise ValueError(
                 f'No possession events found for player {player_name}')
 
         columns_to_keep = [col for col in self.event_columns + self.possession_columns
                            if col in player_possession.columns]
+        return player_possession[columns_to_keep]
 
-        player_possession = player_possession[columns_to_keep]
-        player_possession = player_possession.replace(
-            {np.nan: None, np.inf: None, -np.inf: None})
-        return self.clean_dataframe(player_possession)
-
-    def _calculate_possession_stats(self, possession_data):
+    def _calculate_possession_stats(self, player_possession):
         """Calculate possession statistics"""
+        type_counts = player_possession['type'].value_counts()
         stats = {
-            'total_possession_actions': len(possession_data),
-            'actions_by_type': {}
+            'total_possession_actions': len(player_possession),
+            'actions_by_type': {
+                event_type: int(type_counts[event_type])
+                for event_type in self.possession_types
+                if type_counts.get(event_type, 0) > 0
+            }
         }
 
-        # Count events by type
-        for event_type in self.possession_types:
-            count = sum(1 for event in possession_data if event.get(
-                'type') == event_type)
-            if count > 0:
-                stats['actions_by_type'][event_type] = count
-
         # Calculate dribble statistics
-        stats.update(self._calculate_dribble_stats(possession_data))
+        stats.update(self._calculate_dribble_stats(player_possession))
 
         # Calculate carry statistics
-        stats.update(self._calculate_carry_stats(possession_data))
+        stats.update(self._calculate_carry_stats(player_possession))
 
         # Calculate ball control statistics
         stats['ball_losses'] = {
-            'dispossessed': sum(1 for event in possession_data if event.get('type') == 'Dispossessed'),
-            'miscontrol': sum(1 for event in possession_data if event.get('type') == 'Miscontrol')
+            'dispossessed': int(type_counts.get('Dispossessed', 0)),
+            'miscontrol': int(type_counts.get('Miscontrol', 0))
         }
 
         # Calculate fouls won
-        stats['fouls_won'] = self._calculate_fouls_won_stats(possession_data)
+        stats['fouls_won'] = self._calculate_fouls_won_stats(player_possession)
 
         # Calculate offsides
-        stats['offsides'] = sum(
-            1 for event in possession_data if event.get('type') == 'Offside')
+        stats['offsides'] = int(type_counts.get('Offside', 0))
 
         return stats
 
-    def _calculate_dribble_stats(self, possession_data):
+    def _calculate_dribble_stats(self, player_possession):
         """Calculate dribbling-related statistics"""
-        dribbles = [event for event in possession_data if event.get(
-            'type') == 'Dribble']
-        if not dribbles:
+        dribbles = player_possession[player_possession['type'] == 'Dribble']
+        if dribbles.empty:
             return {}
 
-        successful_dribbles = sum(1 for dribble in dribbles if dribble.get(
-            'dribble_outcome') == 'Complete')
+        successful_dribbles = int(
+            (self.get_column(dribbles, 'dribble_outcome') == 'Complete').sum())
         stats = {
             'dribble_success_rate': round((successful_dribbles / len(dribbles) * 100), 1),
             'successful_dribbles': successful_dribbles,
             'total_dribbles': len(dribbles),
             'dribbling_details': {
-                'nutmegs': sum(1 for dribble in dribbles if dribble.get('dribble_nutmeg') is True),
-                'overrun': sum(1 for dribble in dribbles if dribble.get('dribble_overrun') is True),
-                'no_touch': sum(1 for dribble in dribbles if dribble.get('dribble_no_touch') is True)
+                'nutmegs': self.count_true(dribbles, 'dribble_nutmeg'),
+                'overrun': self.count_true(dribbles, 'dribble_overrun'),
+                'no_touch': self.count_true(dribbles, 'dribble_no_touch')
             }
         }
         return stats
 
-    def _calculate_carry_stats(self, possession_data):
+    def _calculate_carry_stats(self, player_possession):
         """Calculate carry-related statistics"""
-        carries = [event for event in possession_data if event.get(
-            'type') == 'Carry']
+        carries = player_possession[player_possession['type'] == 'Carry']
         stats = {'total_carries': len(carries)}
 
-        if carries:
-            carry_distances = []
-            for carry in carries:
-                start_loc = carry.get('location')
-                end_loc = carry.get('carry_end_location')
-                if start_loc and end_loc:
-                    try:
-                        distance = ((end_loc[0] - start_loc[0]) **
-                                    2 + (end_loc[1] - start_loc[1])**2)**0.5
-                        carry_distances.append(distance)
-                    except (TypeError, IndexError):
-                        continue
-
-            if carry_distances:
-                stats['average_carry_distance'] = round(
-                    sum(carry_distances) / len(carry_distances), 1)
+        if not carries.empty:
+            stats.update(self._carry_distance_stats(
+                self.get_column(carries, 'location').tolist(),
+                self.get_column(carries, 'carry_end_location').tolist()))
 
         return stats
 
-    def _calculate_fouls_won_stats(self, possession_data):
+    def _carry_distance_stats(self, start_locs, end_locs):
+        """Average distance of the carries with a start and an end point"""
+        pairs = [
+            (start[:2], end[:2]) for start, end in zip(start_locs, end_locs)
+            if isinstance(start, list) and len(start) >= 2 and
+            isinstance(end, list) and len(end) >= 2
+        ]
+        if not pairs:
+            return {}
+
+        locs = np.array(pairs, dtype=float)
+        carry_distances = np.hypot(
+            locs[:, 1, 0] - locs[:, 0, 0], locs[:, 1, 1] - locs[:, 0, 1])
+        return {'average_carry_distance': round(
+            sum(carry_distances.tolist()) / len(carry_distances), 1)}
+
+    def _calculate_fouls_won_stats(self, player_possession):
         """Calculate fouls won statistics"""
-        fouls_won = [event for event in possession_data if event.get(
-            'type') == 'Foul Won']
+        fouls_won = player_possession[player_possession['type'] == 'Foul Won']
         return {
             'total': len(fouls_won),
-            'defensive_half': sum(1 for foul in fouls_won if foul.get('foul_won_defensive') is True),
-            'won_advantage': sum(1 for foul in fouls_won if foul.get('foul_won_advantage') is True)
+            'defensive_half': self.count_true(fouls_won, 'foul_won_defensive'),
+            'won_advantage': self.count_true(fouls_won, 'foul_won_advantage')
         }
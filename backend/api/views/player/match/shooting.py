@@ -14,10 +14,14 @@ class PlayerMatchShootingView(BaseStatsBombView):
         try:
             logger.info(
                 f"Fetching shooting data for player {player_name} in match {match_id}")
-            match_events = sb.events(match_id=match_id)
+            match = self.get_indexed_events(match_id)
+
+            if self.wants_ndjson(request):
+                return self.ndjson_response(self._select_shooting_columns(
+                    match.player_events(player_name, ['Shot']), player_name))
 
             # Process data
-            shots_data = self._process_shooting_data(match_events, player_name)
+            shots_data = self._get_shooting_records(match, player_name)
             stats = self._calculate_shooting_stats(shots_data)
 
             return Response({
@@ -32,24 +36,29 @@ class PlayerMatchShootingView(BaseStatsBombView):
             return self.handle_error(
                 e, f"Failed to fetch shooting data for player {player_name}")
 
-    def _process_shooting_data(self, match_events, player_name):
+    def _get_shooting_records(self, match, player_name):
+        """Return the player's shots as cleaned dicts"""
+        shots_data = self.get_section_records(
+            match, player_name, ['Shot'], self.event_columns + self.shot_columns)
+        if not shots_data:
+            raise ValueError(
+                f'No shooting events found for player {player_name}')
+        return shots_data
+
+    def _process_shooting_data(self, player_shots, player_name):
         """Process raw shooting data"""
-        player_shots = match_events[
-            (match_events['type'] == 'Shot') &
-            (match_events['player'] == player_name)
-        ]
+        return self.clean_dataframe(
+            self._select_shooting_columns(player_shots, player_name))
 
+    def _select_shooting_columns(self, player_shots, player_name):
+        """Keep only relevant shooting columns"""
         if player_shots.empty:
             raise ValueError(
                 f'No shooting events found for player {player_name}')
 
         columns_to_keep = [col for col in self.event_columns + self.shot_columns
                            if col in player_shots.columns]
-
-        player_shots = player_shots[columns_to_keep]
-        player_shots = player_shots.replace(
-            {np.nan: None, np.inf: None, -np.inf: None})
-        return self.clean_dataframe(player_shots)
+        return player_shots[columns_to_keep]
 
     def _calculate_shooting_stats(self, shots_data):
         """Calculate shooting statistics"""
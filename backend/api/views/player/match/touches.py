@@ -12,28 +12,33 @@ class PlayerMatchTouchesView(BaseStatsBombView):
         try:
             logger.info(
                 f"Fetching touch data for player {player_name} in match {match_id}")
-            match_events = sb.events(match_id=match_id)
+            match = self.get_indexed_events(match_id)
 
-            touches = self._get_player_touches(match_events, player_name)
-
-            if touches.empty:
+            if not len(match.player_rows(player_name, self.touch_types)):
                 return Response({
                     'error': f'No touch events found for player {player_name}'
                 }, status=HTTP_404_NOT_FOUND)
 
-            return Response(self._process_touches_data(touches))
+            if self.wants_ndjson(request):
+                return self.ndjson_response(match.player_events(
+                    player_name, self.touch_types)[['type', 'location']])
+
+            return Response(self._get_touches_records(match, player_name))
 
         except Exception as e:
             logger.error(f"Error in PlayerMatchTouchesView: {str(e)}")
             return self.handle_error(
                 e, f"Failed to fetch touch data for player {player_name}")
 
-    def _get_player_touches(self, match_events, player_name):
-        """Get all touch events for a player"""
-        return match_events[
-            (match_events['player'] == player_name) &
-            (match_events['type'].isin(self.touch_types))
-        ]
+    def _get_touches_records(self, match, player_name):
+        """Return the type and location of each of the player's touches"""
+        if isinstance(match, RawMatchEvents):
+            # Missing locations stay NaN, as in the frame's records
+            return [{'type': record['type'],
+                     'location': record.get('location', np.nan)}
+                    for record in match.player_records(player_name, self.touch_types)]
+        return self._process_touches_data(
+            match.player_events(player_name, self.touch_types))
 
     def _process_touches_data(self, touches):
         """Process touches data for response"""
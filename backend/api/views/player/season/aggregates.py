@@ -0,0 +1,219 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from api.core.breaker import stale_resources
+from api.core.cache import indexed_events_cache, response_cache
+from api.core.imports import *
+from ..match.defending import PlayerMatchDefendingView
+from ..match.goalkeeping import GoalkeeperMatchView
+from ..match.passing import PlayerMatchPassingView
+from ..match.possession import PlayerMatchPossessionView
+from ..match.shooting import PlayerMatchShootingView
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    django.setup()
+
+
+def get_process_pool():
+    """Return the shared process pool used for season fan-out"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is not safe
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'API_SEASON_WORKERS', 4),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker)
+        return _pool
+
+
+def reset_process_pool(pool):
+    """Drop a broken pool so the next request starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Per section: the event types and the fields its statistics are computed from
+SECTION_FIELDS = {
+    'passing': (['Pass'], [
+        'type', 'pass_outcome', 'pass_goal_assist', 'pass_shot_assist']),
+    'shooting': (['Shot'], ['type', 'shot_outcome', 'shot_statsbomb_xg']),
+    'defending': (PlayerMatchDefendingView.defending_types, [
+        'type', 'duel_outcome', 'counterpress', 'foul_committed_card']),
+    'possession': (PlayerMatchPossessionView.possession_types, [
+        'type', 'location', 'dribble_outcome', 'dribble_nutmeg',
+        'dribble_overrun', 'dribble_no_touch', 'carry_end_location',
+        'foul_won_defensive', 'foul_won_advantage']),
+    'goalkeeping': (GoalkeeperMatchView.goalkeeper_types, [
+        'type', 'goalkeeper_type', 'goalkeeper_outcome']),
+}
+
+
+def section_rows(match, player_name, sections):
+    """The player's rows per section in one match, as cleaned dicts.
+
+    Rows only hold the fields the section's statistics read. Sections the
+    player has no events for are left out.
+    """
+    rows = {}
+    if not len(match.player_rows(player_name)):
+        return rows
+
+    view = BaseStatsBombView()
+    for section in sections:
+        types, fields = SECTION_FIELDS[section]
+        records = view.get_section_records(match, player_name, types, fields)
+        if records:
+            rows[section] = records
+    return rows
+
+
+def player_match_rows(match_id, player_name, sections):
+    """Worker: ``section_rows`` of a match loaded in the worker process"""
+    return section_rows(
+        BaseStatsBombView().get_indexed_events(match_id), player_name, sections)
+
+
+class PlayerSeasonView(BaseStatsBombView):
+    """A player's statistics over every match of a competition season.
+
+    Matches the parent's events cache already holds are read in process;
+    the others are loaded in parallel on a process pool. Each match gives
+    the fields the section statistics read, which are merged and passed
+    once through the per-match views' calculators, so rates are computed
+    over the whole season. Results are cached per player,
+    sections and set of season match ids. ``?sections=`` limits the sections.
+    """
+    sections = ['passing', 'shooting', 'defending', 'possession', 'goalkeeping']
+
+    def get(self, request, competition_id, season_id, player_name):
+        try:
+            sections = self._get_sections(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        try:
+            logger.info(
+                f"Fetching season data for player {player_name} in competition {competition_id} and season {season_id}")
+            season = self.get_season_matches(competition_id, season_id)
+
+            if season is None:
+                return Response({'error': 'No matches found'}, status=404)
+
+            match_ids = tuple(sorted(season.match_ids()))
+            cache_key = (player_name, tuple(sections), match_ids)
+            content = response_cache.get('player-season', cache_key)
+            if content is not None:
+                return self.json_response(content)
+
+            match_rows, failed = self._collect_rows(match_ids, player_name, sections)
+            if not match_rows:
+                return Response({
+                    'error': f'No events found for player {player_name}',
+                    'failed_matches': failed
+                }, status=HTTP_404_NOT_FOUND)
+
+            data = {
+                'player': player_name,
+                'competition_id': competition_id,
+                'season_id': season_id,
+                'matches_played': len(match_rows),
+                'match_ids': sorted(match_rows),
+                'failed_matches': failed,
+                'sections': {
+                    section: self._merge_section(
+                        section, [rows[section] for rows in match_rows.values()
+                                  if section in rows])
+                    for section in sections
+                }
+            }
+            content = JSONRenderer().render(data)
+            # Incomplete or stale seasons are retried on the next request
+            if not failed and not stale_resources():
+                response_cache.set('player-season', cache_key, content)
+
+            return self.json_response(content)
+
+        except Exception as e:
+            logger.error(f"Error in PlayerSeasonView: {str(e)}")
+            return self.handle_error(
+                e, f"Failed to fetch season data for player {player_name}")
+
+    def _get_sections(self, request):
+        """Parse the optional comma-separated sections selector"""
+        selector = request.query_params.get('sections')
+        if not selector:
+            return self.sections
+
+        sections = [s.strip() for s in selector.split(',') if s.strip()]
+        unknown = [s for s in sections if s not in self.sections]
+        if unknown:
+            raise ValueError(
+                f"Unknown sections: {', '.join(unknown)}. "
+                f"Choose from: {', '.join(self.sections)}")
+        return [s for s in self.sections if s in sections]
+
+    def _collect_rows(self, match_ids, player_name, sections):
+        """Fan out over the season's matches, returning rows per match played"""
+        # Matches the parent already holds are not worth a worker's reload
+        cache = indexed_events_cache()
+        uncached = [match_id for match_id in match_ids
+                    if not cache.contains(match_id)]
+        futures = {}
+        if uncached:
+            pool = get_process_pool()
+            futures = {
+                match_id: pool.submit(player_match_rows, match_id, player_name, sections)
+                for match_id in uncached
+            }
+
+        match_rows = {}
+        failed = []
+        for match_id in match_ids:
+            try:
+                if match_id in futures:
+                    rows = futures[match_id].result()
+                else:
+                    rows = section_rows(
+                        self.get_indexed_events(match_id), player_name, sections)
+            except BrokenProcessPool:
+                reset_process_pool(pool)
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to process match {match_id}: {str(e)}")
+                failed.append(match_id)
+                continue
+            if rows:
+                match_rows[match_id] = rows
+        return match_rows, failed
+
+    def _merge_section(self, section, partials):
+        """Merge per-match rows and compute the section's season statistics"""
+        if not partials:
+            return {'error': f'No {section} events found'}
+
+        rows = [row for match_rows in partials for row in match_rows]
+        if section == 'passing':
+            return PlayerMatchPassingView()._calculate_passing_stats(rows)
+        if section == 'shooting':
+            return PlayerMatchShootingView()._calculate_shooting_stats(rows)
+        if section == 'goalkeeping':
+            return GoalkeeperMatchView()._calculate_goalkeeper_stats(rows)
+        if section == 'defending':
+            return PlayerMatchDefendingView()._calculate_defensive_stats(
+                pd.DataFrame(rows))
+        return PlayerMatchPossessionView()._calculate_possession_stats(
+            pd.DataFrame(rows))
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Serve the api views as coroutines rather than on Django's shared sync thread
+os.environ.setdefault('API_ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
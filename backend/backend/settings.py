@@ -84,7 +84,19 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    # The same database for load_events. Its transactions take the write
+    # lock up front, so concurrent workers wait for it instead of failing
+    # with "database is locked"
+    'ingest': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 30,
+        },
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
 
@@ -135,6 +147,86 @@ CACHES = {
     }
 }
 
+# Where the api views read StatsBomb data from: 'statsbomb' (statsbombpy),
+# 'open-data-mirror' (local copy of statsbomb/open-data) or a dotted path
+API_DATA_SOURCE = config('API_DATA_SOURCE', default='statsbomb')
+# The open-data repository's data/ directory, used by 'open-data-mirror'
+API_OPEN_DATA_ROOT = config('API_OPEN_DATA_ROOT', default=None)
+
+# Shared cache of StatsBomb match events used by the api views
+API_EVENTS_CACHE = {
+    'MAX_ENTRIES': config('API_EVENTS_CACHE_MAX_ENTRIES', default=64, cast=int),
+    'MAX_BYTES': config('API_EVENTS_CACHE_MAX_BYTES',
+                        default=512 * 1024 * 1024, cast=int),
+    'TTL': config('API_EVENTS_CACHE_TTL', default=3600, cast=int),
+    # Directory for Parquet spill of evicted frames, disabled when unset
+    'SPILL_DIR': config('API_EVENTS_CACHE_SPILL_DIR', default=None),
+}
+
+# How the player views hold match events: 'dataframe' (the wide statsbombpy
+# frame) or 'raw' (flattened per-event dicts, see api.core.raw)
+API_EVENTS_PIPELINE = config('API_EVENTS_PIPELINE', default='dataframe')
+
+# Worker processes for season-level player aggregates
+API_SEASON_WORKERS = config('API_SEASON_WORKERS', default=4, cast=int)
+
+# Pre-rendered per-match responses (lineups, match information)
+API_RESPONSE_CACHE = {
+    'MAX_ENTRIES': config('API_RESPONSE_CACHE_MAX_ENTRIES', default=256, cast=int),
+    'TTL': config('API_RESPONSE_CACHE_TTL', default=3600, cast=int),
+}
+
+# Season prefetching of match events and lineups by CompetitionMatchesView's
+# background trigger; the warm_season command only spills events to disk
+API_PREFETCH = {
+    'ON_MATCHES_VIEW': config('API_PREFETCH_ON_MATCHES_VIEW', default=False, cast=bool),
+    'WORKERS': config('API_PREFETCH_WORKERS', default=4, cast=int),
+    # Upstream fetches per second across all workers, 0 for no limit
+    'RATE': config('API_PREFETCH_RATE', default=2.0, cast=float),
+    'LINEUPS': config('API_PREFETCH_LINEUPS', default=True, cast=bool),
+}
+
+# Seconds a request waits for a concurrent request's in-flight fetch
+API_SINGLE_FLIGHT_TIMEOUT = config('API_SINGLE_FLIGHT_TIMEOUT', default=30, cast=int)
+
+# URL profile: 'full' mounts the StatsBomb api and sbapi, 'sbapi' only sbapi
+API_URL_PROFILE = config('API_URL_PROFILE', default='full')
+
+# Serve the api views as coroutines on a bounded thread pool (set by asgi.py)
+API_ASYNC_VIEWS = config('API_ASYNC_VIEWS', default=False, cast=bool)
+API_ASYNC_WORKERS = config('API_ASYNC_WORKERS', default=16, cast=int)
+
+# Seconds before the competitions catalogue is refreshed in the background
+API_CATALOGUE_TTL = config('API_CATALOGUE_TTL', default=21600, cast=int)
+
+# Cache of indexed season matches used by the competition views
+API_MATCHES_CACHE = {
+    'MAX_ENTRIES': config('API_MATCHES_CACHE_MAX_ENTRIES', default=128, cast=int),
+    'TTL': config('API_MATCHES_CACHE_TTL', default=3600, cast=int),
+}
+
+# Per-resource circuit breakers around the data source. A breaker opens when
+# FAILURE_RATE of the calls in the last WINDOW seconds (at least MIN_CALLS)
+# failed or took over SLOW_CALL seconds, and lets a trial call through after
+# RESET_TIMEOUT seconds
+API_CIRCUIT_BREAKER = {
+    'ENABLED': config('API_CIRCUIT_BREAKER_ENABLED', default=True, cast=bool),
+    'FAILURE_RATE': config('API_CIRCUIT_BREAKER_FAILURE_RATE', default=0.5, cast=float),
+    'MIN_CALLS': config('API_CIRCUIT_BREAKER_MIN_CALLS', default=5, cast=int),
+    'WINDOW': config('API_CIRCUIT_BREAKER_WINDOW', default=60, cast=int),
+    'RESET_TIMEOUT': config('API_CIRCUIT_BREAKER_RESET_TIMEOUT', default=30, cast=int),
+    'SLOW_CALL': config('API_CIRCUIT_BREAKER_SLOW_CALL', default=10, cast=float),
+}
+
+# Bulk loading of WhoScored-style event files into the sbapi event tables
+# (load_events command)
+SBAPI_INGEST = {
+    'WORKERS': config('SBAPI_INGEST_WORKERS', default=4, cast=int),
+    'BATCH_SIZE': config('SBAPI_INGEST_BATCH_SIZE', default=500, cast=int),
+    # DATABASES alias the loader writes through
+    'DATABASE': 'ingest',
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
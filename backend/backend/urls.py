@@ -14,15 +14,27 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/', include([
-        path('', include('api.urls.competition')),
-        path('', include('api.urls.match')),
-        path('', include('api.urls.player')),
-    ])),
-    path('sbapi/v1/', include('sbapi.v1.urls')),
 ]
+
+# The 'sbapi' profile leaves out the StatsBomb api views and their
+# pandas/statsbombpy dependencies
+if settings.API_URL_PROFILE != 'sbapi':
+    from api.core.asynchronous import async_include
+
+    # Under ASGI the api views run as coroutines on a bounded thread pool
+    api_include = async_include if settings.API_ASYNC_VIEWS else include
+
+    urlpatterns.append(path('api/', include([
+        path('', api_include('api.urls.competition')),
+        path('', api_include('api.urls.match')),
+        path('', api_include('api.urls.player')),
+        path('', api_include('api.urls.metrics')),
+    ])))
+
+urlpatterns.append(path('sbapi/v1/', include('sbapi.v1.urls')))
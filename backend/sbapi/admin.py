@@ -8,6 +8,7 @@ from .models import (
     Match,
     Formation,
     MatchPlayer,
+    EventIngestion,
     PassEvent,
     ShootingEvent,
     DefendingEvent,
@@ -105,6 +106,15 @@ class MatchPlayerAdmin(admin.ModelAdmin):
     raw_id_fields = ('match', 'player', 'team')
     list_per_page = 50
 
+
+@admin.register(EventIngestion)
+class EventIngestionAdmin(admin.ModelAdmin):
+    list_display = ('match', 'content_hash', 'loader_version', 'events',
+                    'last_loaded')
+    list_filter = ('loader_version',)
+    raw_id_fields = ('match',)
+    list_per_page = 50
+
 # Base Event Admin
 
 
@@ -0,0 +1,191 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, reset_queries
+
+INGEST = getattr(settings, 'SBAPI_INGEST', {})
+
+# Database alias the loader writes through
+DATABASE = INGEST.get('DATABASE', DEFAULT_DB_ALIAS)
+
+# Imports of sbapi.services.loaders are deferred in the functions below:
+# spawned workers unpickle this module before django.setup
+
+
+def _init_worker():
+    django.setup()
+
+
+def load_file(path, batch_size):
+    """Worker: load one match file"""
+    from sbapi.services.loaders.event_loader import load_match_file
+    result = load_match_file(path, batch_size, DATABASE)
+    # With DEBUG on, every bulk insert's SQL stays in the query log
+    reset_queries()
+    return result
+
+
+def load_records(match_id, records, batch_size, content_hash):
+    """Worker: load one match of a streamed export"""
+    from sbapi.services.loaders.event_loader import load_match_records
+    result = load_match_records(
+        match_id, records, batch_size, content_hash, DATABASE)
+    reset_queries()
+    return result
+
+
+def changed_files(files):
+    """The files the ingestion ledger does not have for their match and content
+
+    Match ids are resolved by read_match_file, as when the file is loaded.
+    """
+    from sbapi.services.loaders.event_loader import (
+        IngestError, loaded_matches, read_match_file)
+    sources = {}
+    for path in files:
+        try:
+            match_id, _, content_hash = read_match_file(path)
+            sources[path] = (match_id, content_hash)
+        except (IngestError, ValueError):
+            # Loading it reports the error
+            continue
+    loaded = loaded_matches(sources.values())
+    return [path for path in files if sources.get(path) not in loaded]
+
+
+def match_files(paths):
+    """Per-match event files named by ``paths`` (files or directories)"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob('*.json')))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise CommandError(f"No such file or directory: {path}")
+    return files
+
+
+class Command(BaseCommand):
+    help = ("Load WhoScored-style event files into the six sbapi event tables "
+            "and report events per second. Matches already loaded with the "
+            "same content and loader version are skipped, and re-loading a "
+            "match only writes the rows that changed")
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+',
+                            help='Event files, or directories of <match_id>.json files')
+        parser.add_argument('--stream', action='store_true',
+                            help='Treat each file as a multi-match export (JSON '
+                                 'array or NDJSON of records with matchId) and '
+                                 'read it incrementally')
+        parser.add_argument('--workers', type=int,
+                            default=INGEST.get('WORKERS', 4),
+                            help='Matches loaded in parallel worker processes')
+        parser.add_argument('--batch-size', type=int,
+                            default=INGEST.get('BATCH_SIZE', 500),
+                            help='Event records mapped and written per batch')
+        parser.add_argument('--force', action='store_true',
+                            help='Load matches even if the ingestion ledger has them')
+
+    def handle(self, *args, **options):
+        files = match_files(options['paths'])
+        if not files:
+            raise CommandError('No event files found')
+        batch_size = options['batch_size']
+        workers = options['workers']
+        self.unchanged = 0
+
+        if options['stream']:
+            jobs = self._stream_jobs(files, batch_size, options['force'])
+        else:
+            found = len(files)
+            if not options['force']:
+                files = changed_files(files)
+                self.unchanged = found - len(files)
+            workers = min(workers, len(files))
+            jobs = ((load_file, (path, batch_size)) for path in files)
+
+        workers = max(1, workers)
+        started = time.perf_counter()
+        try:
+            results = self._run(jobs, workers)
+        except Exception as e:
+            raise CommandError(f"Failed to load events: {e}")
+        seconds = time.perf_counter() - started
+
+        loaded = [r for r in results if 'error' not in r]
+        events = sum(r['events'] for r in loaded)
+        rows = {}
+        for result in loaded:
+            for table, count in result['rows'].items():
+                rows[table] = rows.get(table, 0) + count
+
+        changed = sum(r['changed'] for r in loaded)
+        self.stdout.write(
+            f"Loaded {len(loaded)}/{len(results)} matches ({changed} changed), "
+            f"skipped {self.unchanged} unchanged since last load, {events} "
+            f"events in {seconds:.2f}s "
+            f"({events / seconds if seconds else 0:.0f} events/s, {workers} workers)")
+        for table, count in rows.items():
+            self.stdout.write(f"  {table}: {count}")
+        if len(loaded) < len(results):
+            raise CommandError(f"{len(results) - len(loaded)} matches failed")
+
+    def _stream_jobs(self, files, batch_size, force):
+        """One job per match of the exports whose content hash is new"""
+        from sbapi.services.loaders.event_loader import loaded_matches
+        from sbapi.services.loaders.event_stream import iter_match_groups
+        for path in files:
+            for match_id, records, content_hash in iter_match_groups(path):
+                if not force and loaded_matches([(match_id, content_hash)]):
+                    self.unchanged += 1
+                    continue
+                yield load_records, (match_id, records, batch_size, content_hash)
+
+    def _run(self, jobs, workers):
+        """Run (function, args) jobs inline or in worker processes"""
+        results = []
+        if workers == 1:
+            for function, args in jobs:
+                results.append(function(*args))
+                self._progress(len(results), results[-1])
+            return results
+
+        # Workers open their own connections; spawn starts them clean
+        connections.close_all()
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker) as pool:
+            # Jobs are submitted as workers free up, so a streamed export
+            # only holds a few matches' records at a time
+            pending = set()
+            for function, args in jobs:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results.append(future.result())
+                        self._progress(len(results), results[-1])
+                pending.add(pool.submit(function, *args))
+            for future in wait(pending).done:
+                results.append(future.result())
+                self._progress(len(results), results[-1])
+        return results
+
+    def _progress(self, done, result):
+        if 'error' in result:
+            self.stderr.write(f"[{done}] {result['source']}: {result['error']}")
+            return
+        rate = result['events'] / result['seconds'] if result['seconds'] else 0
+        self.stdout.write(
+            f"[{done}] match {result['match_id']}: {result['events']} "
+            f"events ({result['skipped']} skipped), {result['created']} created, "
+            f"{result['updated']} updated, {result['deleted']} deleted in "
+            f"{result['seconds']}s, {rate:.0f} events/s")
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.2 on 2026-10-18 07:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sbapi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='defendingevent',
+            name='outfielder_block',
+            field=models.BooleanField(default=False, help_text='Indicates block made by an outfield player (for shots?)'),
+        ),
+        migrations.AddConstraint(
+            model_name='defendingevent',
+            constraint=models.UniqueConstraint(fields=('match', 'source_id'), name='sbapi_defendingevent_unique_match_source'),
+        ),
+        migrations.AddConstraint(
+            model_name='goalkeeperevent',
+            constraint=models.UniqueConstraint(fields=('match', 'source_id'), name='sbapi_goalkeeperevent_unique_match_source'),
+        ),
+        migrations.AddConstraint(
+            model_name='passevent',
+            constraint=models.UniqueConstraint(fields=('match', 'source_id'), name='sbapi_passevent_unique_match_source'),
+        ),
+        migrations.AddConstraint(
+            model_name='possessionevent',
+            constraint=models.UniqueConstraint(fields=('match', 'source_id'), name='sbapi_possessionevent_unique_match_source'),
+        ),
+        migrations.AddConstraint(
+            model_name='shootingevent',
+            constraint=models.UniqueConstraint(fields=('match', 'source_id'), name='sbapi_shootingevent_unique_match_source'),
+        ),
+        migrations.AddConstraint(
+            model_name='summaryevent',
+            constraint=models.UniqueConstraint(fields=('match', 'source_id'), name='sbapi_summaryevent_unique_match_source'),
+        ),
+    ]
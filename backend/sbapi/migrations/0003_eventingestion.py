@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 07:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sbapi', '0002_event_unique_match_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventIngestion',
+            fields=[
+                ('match', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='sbapi.match')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('loader_version', models.PositiveIntegerField()),
+                ('events', models.IntegerField()),
+                ('last_loaded', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Event Ingestion',
+                'verbose_name_plural': 'Event Ingestions',
+            },
+        ),
+    ]
@@ -3,6 +3,7 @@ from .team import Team
 from .match import Match
 from .formation import Formation
 from .player import Player, MatchPlayer
+from .ingestion import EventIngestion
 from .events import (
     PassEvent,
     ShootingEvent,
@@ -20,6 +21,7 @@ __all__ = [
     'Formation',
     'Player',
     'MatchPlayer',
+    'EventIngestion',
     'PassEvent',
     'ShootingEvent',
     'DefendingEvent',
@@ -157,3 +157,5 @@ class DefendingEvent(Event):
             models.Index(fields=['is_clearance']),
             models.Index(fields=['aerial_success']),
         ]
+        # Meta is redefined, so the parent's constraints are not inherited
+        constraints = [*Event.Meta.constraints]
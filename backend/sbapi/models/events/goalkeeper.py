@@ -60,3 +60,5 @@ class GoalkeeperEvent(Event):
             models.Index(fields=['keeper_save_total']),
             models.Index(fields=['keeper_penalty_saved']),
         ]
+        # Meta is redefined, so the parent's constraints are not inherited
+        constraints = [*Event.Meta.constraints]
@@ -85,3 +85,5 @@ class PassEvent(Event):
             models.Index(fields=['pass_key']),
             models.Index(fields=['big_chance_created']),
         ]
+        # Meta is redefined, so the parent's constraints are not inherited
+        constraints = [*Event.Meta.constraints]
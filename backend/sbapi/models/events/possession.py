@@ -29,6 +29,8 @@ class PossessionEvent(Event):
             models.Index(fields=['dispossessed']),
             models.Index(fields=['touches']),
         ]
+        # Meta is redefined, so the parent's constraints are not inherited
+        constraints = [*Event.Meta.constraints]
 
 
 # 
@@ -77,3 +77,5 @@ class ShootingEvent(Event):
             models.Index(fields=['shot_on_target']),
             models.Index(fields=['big_chance_scored']),
         ]
+        # Meta is redefined, so the parent's constraints are not inherited
+        constraints = [*Event.Meta.constraints]
@@ -44,3 +44,5 @@ class SummaryEvent(Event):
             models.Index(fields=['penalty_conceded', 'penalty_won']),
             models.Index(fields=['sub_on', 'sub_off']),
         ]
+        # Meta is redefined, so the parent's constraints are not inherited
+        constraints = [*Event.Meta.constraints]
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class EventIngestion(models.Model):
+    """Ledger of the event source each match was last loaded from"""
+    match = models.OneToOneField(
+        'sbapi.Match', primary_key=True, on_delete=models.CASCADE)
+    # sha256 of the match's source event file
+    content_hash = models.CharField(max_length=64)
+    # event_loader.LOADER_VERSION that wrote the match's rows
+    loader_version = models.PositiveIntegerField()
+    events = models.IntegerField()
+    last_loaded = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Event Ingestion'
+        verbose_name_plural = 'Event Ingestions'
+
+    def __str__(self):
+        return f"Match {self.match_id} events ({self.content_hash[:12]})"
@@ -0,0 +1,273 @@
+"""Mapping of WhoScored-style event records onto the sbapi event models.
+
+Records are the rows ``createEventsDF`` builds from a match centre page:
+camelCase keys, ``type``/``period``/``outcomeType`` as display names (or
+the raw ``{'value', 'displayName'}`` dicts) and ``satisfiedEventsTypes`` as
+a list of event type names. A flag such as ``pass_accurate`` is set when
+its name (``passAccurate``) is in ``satisfiedEventsTypes`` or the record
+carries it as a True column.
+"""
+import math
+
+from ...models.events import (
+    PassEvent, ShootingEvent, DefendingEvent,
+    GoalkeeperEvent, PossessionEvent, SummaryEvent
+)
+
+EVENT_MODELS = [PassEvent, ShootingEvent, DefendingEvent,
+                GoalkeeperEvent, PossessionEvent, SummaryEvent]
+
+# Model flag field -> source event type name
+PASS_FLAGS = {
+    'pass_accurate': 'passAccurate',
+    'pass_inaccurate': 'passInaccurate',
+    'pass_accuracy': 'passAccuracy',
+    'assist': 'assist',
+    'assist_corner': 'assistCorner',
+    'assist_cross': 'assistCross',
+    'assist_freekick': 'assistFreekick',
+    'assist_other': 'assistOther',
+    'assist_throughball': 'assistThroughball',
+    'assist_throwin': 'assistThrowin',
+    'intentional_assist': 'intentionalAssist',
+    'key_pass_corner': 'keyPassCorner',
+    'key_pass_cross': 'keyPassCross',
+    'key_pass_freekick': 'keyPassFreekick',
+    'key_pass_long': 'keyPassLong',
+    'key_pass_other': 'keyPassOther',
+    'key_pass_short': 'keyPassShort',
+    'key_pass_throughball': 'keyPassThroughball',
+    'key_pass_throwin': 'keyPassThrowin',
+    'pass_key': 'passKey',
+    'pass_corner': 'passCorner',
+    'pass_corner_accurate': 'passCornerAccurate',
+    'pass_corner_inaccurate': 'passCornerInaccurate',
+    'pass_cross_accurate': 'passCrossAccurate',
+    'pass_cross_blocked_defensive': 'passCrossBlockedDefensive',
+    'pass_cross_inaccurate': 'passCrossInaccurate',
+    'pass_freekick': 'passFreekick',
+    'pass_freekick_accurate': 'passFreekickAccurate',
+    'pass_freekick_inaccurate': 'passFreekickInaccurate',
+    'pass_back': 'passBack',
+    'pass_back_zone_inaccurate': 'passBackZoneInaccurate',
+    'pass_forward': 'passForward',
+    'pass_forward_zone_accurate': 'passForwardZoneAccurate',
+    'pass_left': 'passLeft',
+    'pass_right': 'passRight',
+    'pass_chipped': 'passChipped',
+    'pass_head': 'passHead',
+    'pass_left_foot': 'passLeftFoot',
+    'pass_right_foot': 'passRightFoot',
+    'pass_long_ball_accurate': 'passLongBallAccurate',
+    'pass_long_ball_inaccurate': 'passLongBallInaccurate',
+    'short_pass_accurate': 'shortPassAccurate',
+    'short_pass_inaccurate': 'shortPassInaccurate',
+    'pass_through_ball_accurate': 'passThroughBallAccurate',
+    'pass_through_ball_inaccurate': 'passThroughBallInaccurate',
+    'big_chance_created': 'bigChanceCreated',
+    'successful_final_third_passes': 'successfulFinalThirdPasses',
+    'throw_in': 'throwIn',
+}
+
+SHOOTING_FLAGS = {
+    'big_chance_missed': 'bigChanceMissed',
+    'big_chance_scored': 'bigChanceScored',
+    'close_miss_high': 'closeMissHigh',
+    'close_miss_high_left': 'closeMissHighLeft',
+    'close_miss_high_right': 'closeMissHighRight',
+    'close_miss_left': 'closeMissLeft',
+    'close_miss_right': 'closeMissRight',
+    'is_goal': 'isGoal',
+    'goal_counter': 'goalCounter',
+    'goal_head': 'goalHead',
+    'goal_left_foot': 'goalLeftFoot',
+    'goal_right_foot': 'goalRightFoot',
+    'goal_normal': 'goalNormal',
+    'goal_open_play': 'goalOpenPlay',
+    'goal_set_piece': 'goalSetPiece',
+    'goal_obox': 'goalObox',
+    'goal_obp': 'goalObp',
+    'goal_penalty_area': 'goalPenaltyArea',
+    'goal_six_yard_box': 'goalSixYardBox',
+    'is_shot': 'isShot',
+    'shot_blocked': 'shotBlocked',
+    'shot_counter': 'shotCounter',
+    'shot_direct_corner': 'shotDirectCorner',
+    'shot_on_post': 'shotOnPost',
+    'shot_on_target': 'shotOnTarget',
+    'shot_off_target': 'shotOffTarget',
+    'shot_off_target_inside_box': 'shotOffTargetInsideBox',
+    'shots_total': 'shotsTotal',
+    'shot_head': 'shotHead',
+    'shot_left_foot': 'shotLeftFoot',
+    'shot_right_foot': 'shotRightFoot',
+    'shot_obox_total': 'shotOboxTotal',
+    'shot_obp': 'shotObp',
+    'shot_penalty_area': 'shotPenaltyArea',
+    'shot_six_yard_box': 'shotSixYardBox',
+    'shot_open_play': 'shotOpenPlay',
+    'shot_set_piece': 'shotSetPiece',
+    'penalty_missed': 'penaltyMissed',
+    'penalty_scored': 'penaltyScored',
+    'penalty_shootout_missed_off_target': 'penaltyShootoutMissedOffTarget',
+    'penalty_shootout_scored': 'penaltyShootoutScored',
+}
+
+DEFENDING_FLAGS = {
+    'aerial_success': 'aerialSuccess',
+    'duel_aerial_lost': 'duelAerialLost',
+    'duel_aerial_won': 'duelAerialWon',
+    'clearance_effective': 'clearanceEffective',
+    'clearance_head': 'clearanceHead',
+    'clearance_off_the_line': 'clearanceOffTheLine',
+    'clearance_total': 'clearanceTotal',
+    'challenge_lost': 'challengeLost',
+    'defensive_duel': 'defensiveDuel',
+    'offensive_duel': 'offensiveDuel',
+    'error_leads_to_goal': 'errorLeadsToGoal',
+    'error_leads_to_shot': 'errorLeadsToShot',
+    'goal_own': 'goalOwn',
+    'interception_all': 'interceptionAll',
+    'interception_in_the_box': 'interceptionIntheBox',
+    'interception_won': 'interceptionWon',
+    'outfielder_block': 'outfielderBlock',
+    'outfielder_blocked_pass': 'outfielderBlockedPass',
+    'six_yard_block': 'sixYardBlock',
+    'tackle_last_man': 'tackleLastMan',
+    'tackle_lost': 'tackleLost',
+    'tackle_won': 'tackleWon',
+}
+
+GOALKEEPER_FLAGS = {
+    'is_collected': 'collected',
+    'keeper_claim_high_lost': 'keeperClaimHighLost',
+    'keeper_claim_high_won': 'keeperClaimHighWon',
+    'keeper_claim_lost': 'keeperClaimLost',
+    'keeper_claim_won': 'keeperClaimWon',
+    'keeper_diving_save': 'keeperDivingSave',
+    'keeper_missed': 'keeperMissed',
+    'keeper_one_to_one_won': 'keeperOneToOneWon',
+    'standing_save': 'standingSave',
+    'save_feet': 'saveFeet',
+    'save_hands': 'saveHands',
+    'save_high_centre': 'saveHighCentre',
+    'save_high_left': 'saveHighLeft',
+    'save_high_right': 'saveHighRight',
+    'save_low_centre': 'saveLowCentre',
+    'save_low_left': 'saveLowLeft',
+    'save_low_right': 'saveLowRight',
+    'save_obox': 'saveObox',
+    'save_obp': 'saveObp',
+    'save_penalty_area': 'savePenaltyArea',
+    'save_six_yard_box': 'saveSixYardBox',
+    'keeper_save_in_the_box': 'keeperSaveInTheBox',
+    'keeper_save_total': 'keeperSaveTotal',
+    'keeper_penalty_saved': 'keeperPenaltySaved',
+    'penalty_shootout_saved': 'penaltyShootoutSaved',
+    'penalty_shootout_saved_gk': 'penaltyShootoutSavedGK',
+    'penalty_shootout_conceded_gk': 'penaltyShootoutConcededGK',
+    'keeper_smother': 'keeperSmother',
+    'keeper_sweeper_lost': 'keeperSweeperLost',
+    'parried_danger': 'parriedDanger',
+    'parried_safe': 'parriedSafe',
+    'punches': 'punches',
+}
+
+POSSESSION_FLAGS = {
+    'corner_awarded': 'cornerAwarded',
+    'dispossessed': 'dispossessed',
+    'turnover': 'turnover',
+    'overrun': 'overrun',
+    'dribble_lastman': 'dribbleLastman',
+    'dribble_lost': 'dribbleLost',
+    'dribble_won': 'dribbleWon',
+}
+
+SUMMARY_FLAGS = {
+    'yellow_card': 'yellowCard',
+    'red_card': 'redCard',
+    'second_yellow': 'secondYellow',
+    'void_yellow_card': 'voidYellowCard',
+    'sub_on': 'subOn',
+    'sub_off': 'subOff',
+    'foul_committed': 'foulCommitted',
+    'foul_given': 'foulGiven',
+    'penalty_conceded': 'penaltyConceded',
+    'penalty_won': 'penaltyWon',
+    'offside_given': 'offsideGiven',
+    'offside_provoked': 'offsideProvoked',
+}
+
+MODEL_FLAGS = {
+    PassEvent: PASS_FLAGS,
+    ShootingEvent: SHOOTING_FLAGS,
+    DefendingEvent: DEFENDING_FLAGS,
+    GoalkeeperEvent: GOALKEEPER_FLAGS,
+    PossessionEvent: POSSESSION_FLAGS,
+    SummaryEvent: SUMMARY_FLAGS,
+}
+
+# Model value field -> source key, for the non-flag detail columns
+MODEL_VALUES = {
+    PassEvent: {},
+    ShootingEvent: {
+        'goal_mouth_y': 'goalMouthY',
+        'goal_mouth_z': 'goalMouthZ',
+        'shot_body_type': 'shotBodyType',
+    },
+    DefendingEvent: {
+        'blocked_x': 'blockedX',
+        'blocked_y': 'blockedY',
+    },
+    GoalkeeperEvent: {},
+    PossessionEvent: {},
+    SummaryEvent: {
+        'card_type': 'cardType',
+    },
+}
+
+# DefendingEvent fields set from the event type rather than a flag
+DEFENDING_TYPES = {
+    'is_tackle': 'Tackle',
+    'is_interception': 'Interception',
+    'is_clearance': 'Clearance',
+    'is_ball_recovery': 'BallRecovery',
+}
+
+# Event types per table, checked in this order after Pass
+DEFENDING_EVENT_TYPES = {'Tackle', 'Interception', 'Clearance', 'BallRecovery',
+                         'Aerial', 'Challenge', 'Error', 'BlockedPass'}
+# Flags that make any event a defending one (a Save with outfielderBlock is
+# a shot blocked by an outfield player, not a goalkeeper save)
+DEFENDING_EVENT_FLAGS = ('goalOwn', 'sixYardBlock', 'outfielderBlock')
+GOALKEEPER_EVENT_TYPES = {'Save', 'Smother', 'Punch', 'PenaltyFaced',
+                          'CrossNotClaimed', 'KeeperSweeper', 'KeeperPickup',
+                          'Claim'}
+SHOOTING_EVENT_TYPES = {'Goal', 'Shot', 'SavedShot', 'ChanceMissed', 'MissedShots'}
+POSSESSION_EVENT_TYPES = {'BallTouch', 'TakeOn', 'Dispossessed', 'ShieldBallOpp'}
+SUMMARY_EVENT_TYPES = {'Card', 'SubstitutionOn', 'SubstitutionOff', 'Foul',
+                       'GoodSkill', 'OffsideProvoked', 'OffsideGiven',
+                       'OffsidePass', 'FormationSet', 'FormationChange',
+                       'CornerAwarded', 'End'}
+# Period markers carry nothing worth storing
+SKIPPED_EVENT_TYPES = {'Start'}
+
+
+def display_name(value):
+    """The display name of a WhoScored ``{'value', 'displayName'}`` field"""
+    if isinstance(value, dict):
+        return value.get('displayName')
+    return value
+
+
+def optional(value):
+    """None for missing and NaN values"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def stored_fields(model):
+    """Attribute names of the columns a row tuple holds, in table order"""
+    return [field.attname for field in model._meta.concrete_fields
+            if not field.primary_key]
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from ...models import EventIngestion, Match, Player
+from .event_fields import EVENT_MODELS, stored_fields
+from .event_router import route_batch
+
+logger = logging.getLogger(__name__)
+
+# Bump when the mapping of records onto rows changes, so matches loaded by
+# an older loader are reloaded even if their files did not change
+LOADER_VERSION = 1
+
+
+class IngestError(Exception):
+    """A match file that cannot be loaded as a whole"""
+
+
+def file_hash(path):
+    """sha256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def loaded_matches(sources):
+    """The given (match_id, content_hash) pairs the ledger has for the current loader.
+
+    Identical files of different matches are told apart by the match id.
+    """
+    sources = set(sources)
+    return sources & set(EventIngestion.objects.filter(
+        match_id__in=[match_id for match_id, _ in sources],
+        loader_version=LOADER_VERSION
+    ).values_list('match_id', 'content_hash'))
+
+
+def read_match_file(path):
+    """Return (match_id, event records, content hash) of a per-match event file.
+
+    The file holds a JSON list of event records, or an object with
+    ``matchId`` and ``events``. The match id falls back to the records'
+    ``matchId`` and then the file name (``<match_id>.json``).
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        content = f.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+    data = json.loads(content)
+
+    match_id = None
+    if isinstance(data, dict):
+        match_id = data.get('matchId')
+        data = data.get('events') or []
+    if match_id is None and data:
+        match_id = data[0].get('matchId')
+    if match_id is None:
+        try:
+            match_id = int(path.stem)
+        except ValueError:
+            raise IngestError(f"No match id in {path}")
+    return int(match_id), data, content_hash
+
+
+def match_max_minute(events):
+    """Fallback for records without ``maxMinute``"""
+    return max((int(e.get('minute', 0)) for e in events), default=0)
+
+
+# Key of the unique_match_source constraint every event table has
+UNIQUE_FIELDS = ['match', 'source_id']
+
+
+def upsert_sql(model, connection):
+    """INSERT of one row tuple that updates the row on (match, source_id).
+
+    The ``ON CONFLICT (...) DO UPDATE`` form is the one SQLite and
+    PostgreSQL share; see ``fast_upsert``.
+    """
+    quote = connection.ops.quote_name
+    columns = [model._meta.get_field(attname).column
+               for attname in stored_fields(model)]
+    unique = [model._meta.get_field(name).column for name in UNIQUE_FIELDS]
+    return (
+        f"INSERT INTO {quote(model._meta.db_table)} "
+        f"({', '.join(map(quote, columns))}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))}) "
+        f"ON CONFLICT ({', '.join(map(quote, unique))}) DO UPDATE SET "
+        + ', '.join(f"{quote(column)} = EXCLUDED.{quote(column)}"
+                    for column in columns if column not in unique))
+
+
+def can_fast_upsert(connection):
+    """Whether ``fast_upsert``'s SQL runs on the connection's backend"""
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def fast_upsert(model, rows, batch_size, connection):
+    """Upsert row tuples with one ``executemany`` per batch.
+
+    Every value is adapted with its field's ``get_db_prep_save``, as
+    ``bulk_create`` would do; what is skipped is building a model instance
+    and compiling an INSERT for every few rows.
+    """
+    prepare = [model._meta.get_field(attname).get_db_prep_save
+               for attname in stored_fields(model)]
+    sql = upsert_sql(model, connection)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, [
+                [prep(value, connection) for prep, value in zip(prepare, row)]
+                for row in rows[start:start + batch_size]])
+
+
+def bulk_upsert(model, rows, batch_size, using):
+    """Upsert row tuples through ``bulk_create``"""
+    attnames = stored_fields(model)
+    names = [model._meta.get_field(attname).name for attname in attnames]
+    model.objects.using(using).bulk_create(
+        [model(**dict(zip(attnames, row))) for row in rows],
+        batch_size=batch_size, update_conflicts=True, unique_fields=UNIQUE_FIELDS,
+        update_fields=[name for name in names if name not in UNIQUE_FIELDS])
+
+
+def upsert_rows(model, match_id, rows, batch_size, using=DEFAULT_DB_ALIAS):
+    """Write the new and changed row tuples of a match's ``model`` rows.
+
+    The rows stored for the tuples' source ids are compared first, and only
+    those that differ are upserted on (match, source_id): with
+    ``fast_upsert`` where the backend supports it, else ``bulk_create``.
+    Returns (created, updated).
+    """
+    if not rows:
+        return 0, 0
+    attnames = stored_fields(model)
+    source_index = attnames.index('source_id')
+    existing = {
+        row[source_index]: row
+        for row in model.objects.using(using).filter(
+            match_id=match_id, source_id__in=[row[source_index] for row in rows]
+        ).values_list(*attnames)
+    }
+
+    created = updated = 0
+    changed = []
+    for row in rows:
+        current = existing.get(row[source_index])
+        if current is None:
+            created += 1
+        elif current != row:
+            updated += 1
+        else:
+            continue
+        changed.append(row)
+
+    if changed:
+        connection = connections[using]
+        if can_fast_upsert(connection):
+            fast_upsert(model, changed, batch_size, connection)
+        else:
+            bulk_upsert(model, changed, batch_size, using)
+    return created, updated
+
+
+def delete_missing_rows(model, match_id, source_ids, batch_size,
+                        using=DEFAULT_DB_ALIAS):
+    """Delete a match's ``model`` rows whose source id is not in ``source_ids``"""
+    missing = [source_id for source_id in model.objects.using(using).filter(
+        match_id=match_id).values_list('source_id', flat=True)
+        if source_id not in source_ids]
+    deleted = 0
+    for start in range(0, len(missing), batch_size):
+        count, _ = model.objects.using(using).filter(
+            match_id=match_id,
+            source_id__in=missing[start:start + batch_size]).delete()
+        deleted += count
+    return deleted
+
+
+def load_match_events(match_id, events, batch_size=None, content_hash=None,
+                      using=DEFAULT_DB_ALIAS):
+    """Load one match's events into the six event tables.
+
+    The match must already be loaded. Players the events refer to are
+    created if missing. Records are routed column-wise into row tuples and
+    written ``batch_size`` at a time, so only one batch of rows is held at
+    once. Re-loading a match is idempotent: rows are upserted on (match,
+    source_id), only rows that differ are written and rows no longer in the
+    source are deleted, all in one transaction. ``Match.last_updated``
+    is only touched when something changed. A ``content_hash`` of the
+    source is recorded in the EventIngestion ledger. ``using`` is the
+    database alias written through.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'SBAPI_INGEST', {}).get('BATCH_SIZE', 500)
+    started = time.perf_counter()
+    try:
+        match = Match.objects.using(using).only(
+            'match_id', 'home_team_id', 'away_team_id').get(match_id=match_id)
+    except Match.DoesNotExist:
+        raise IngestError(f"Match {match_id} is not loaded")
+
+    max_minute = match_max_minute(events)
+    seen = {model: set() for model in EVENT_MODELS}
+    counts = {'created': 0, 'updated': 0, 'deleted': 0}
+    skipped = 0
+    with transaction.atomic(using=using):
+        for start in range(0, len(events), batch_size):
+            tables, players, batch_skipped = route_batch(
+                match, events[start:start + batch_size], max_minute)
+            skipped += batch_skipped
+            Player.objects.using(using).bulk_create(
+                [Player(player_id=player_id, name=name[:100])
+                 for player_id, name in players.items()],
+                batch_size=batch_size, ignore_conflicts=True)
+            for model, rows in tables.items():
+                created, updated = upsert_rows(
+                    model, match_id, rows, batch_size, using)
+                counts['created'] += created
+                counts['updated'] += updated
+                source_index = stored_fields(model).index('source_id')
+                seen[model].update(row[source_index] for row in rows)
+
+        for model, source_ids in seen.items():
+            counts['deleted'] += delete_missing_rows(
+                model, match_id, source_ids, batch_size, using)
+
+        changed = any(counts.values())
+        if changed:
+            Match.objects.using(using).filter(match_id=match_id).update(
+                last_updated=timezone.now())
+        if content_hash is not None:
+            EventIngestion.objects.using(using).update_or_create(
+                match_id=match_id, defaults={
+                    'content_hash': content_hash,
+                    'loader_version': LOADER_VERSION,
+                    'events': len(events),
+                })
+
+    return {
+        'match_id': match_id,
+        'events': len(events),
+        'skipped': skipped,
+        'rows': {model._meta.db_table: len(source_ids)
+                 for model, source_ids in seen.items()},
+        **counts,
+        'changed': changed,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def load_match_file(path, batch_size=None, using=DEFAULT_DB_ALIAS):
+    """Worker: load one per-match event file, returning its result or error"""
+    try:
+        match_id, events, content_hash = read_match_file(path)
+        return load_match_events(match_id, events, batch_size, content_hash, using)
+    except Exception as e:
+        logger.error(f"Failed to load events from {path}: {e}")
+        return {'source': str(path), 'error': str(e)}
+
+
+def load_match_records(match_id, events, batch_size=None, content_hash=None,
+                       using=DEFAULT_DB_ALIAS):
+    """Worker: load one match's records, returning its result or error"""
+    try:
+        return load_match_events(match_id, events, batch_size, content_hash, using)
+    except Exception as e:
+        logger.error(f"Failed to load events of match {match_id}: {e}")
+        return {'source': f'match {match_id}', 'error': str(e)}
@@ -0,0 +1,209 @@
+"""Column-wise routing of event records into per-table row tuples.
+
+A batch of records is turned into columns once: one array per source key
+and one boolean matrix of the flags every record satisfies, built by
+exploding ``satisfiedEventsTypes`` into (row, flag) index pairs with
+NumPy. The table of each record is then a vectorized ``np.select`` over
+type and flag masks, and each table's rows are the zip of its columns
+taken at the routed positions, in ``stored_fields(model)`` order.
+"""
+import logging
+from itertools import chain
+
+import numpy as np
+
+from .event_fields import (
+    DEFENDING_EVENT_FLAGS, DEFENDING_EVENT_TYPES, DEFENDING_TYPES, EVENT_MODELS,
+    GOALKEEPER_EVENT_TYPES, MODEL_FLAGS, MODEL_VALUES, POSSESSION_EVENT_TYPES,
+    SHOOTING_EVENT_TYPES, SKIPPED_EVENT_TYPES, SUMMARY_EVENT_TYPES,
+    display_name, optional, stored_fields
+)
+from ...models.events import (
+    PassEvent, ShootingEvent, DefendingEvent,
+    GoalkeeperEvent, PossessionEvent, SummaryEvent
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns of the flag matrix, sorted for np.searchsorted
+FLAG_NAMES = np.array(sorted(
+    {name for flags in MODEL_FLAGS.values() for name in flags.values()}
+    | set(DEFENDING_EVENT_FLAGS)))
+FLAG_INDEX = {name: index for index, name in enumerate(FLAG_NAMES.tolist())}
+
+# Per model: flag fields and their matrix columns
+_MODEL_FLAG_COLUMNS = {
+    model: (list(flags), np.array([FLAG_INDEX[name] for name in flags.values()]))
+    for model, flags in MODEL_FLAGS.items()
+}
+
+
+def flag_matrix(events):
+    """(records, FLAG_NAMES) boolean matrix of the flags each record satisfies"""
+    size = len(events)
+    matrix = np.zeros((size, len(FLAG_NAMES)), dtype=bool)
+    # Satisfied event types plus the record's True columns (isShot, ...)
+    lists = [[*(event.get('satisfiedEventsTypes') or ()),
+              *(key for key, value in event.items() if value is True)]
+             for event in events]
+    lengths = np.fromiter(map(len, lists), dtype=np.intp, count=size)
+    if lengths.sum():
+        names = np.array(list(chain.from_iterable(lists)), dtype=str)
+        columns = np.searchsorted(FLAG_NAMES, names).clip(max=len(FLAG_NAMES) - 1)
+        known = FLAG_NAMES[columns] == names
+        rows = np.repeat(np.arange(size), lengths)
+        matrix[rows[known], columns[known]] = True
+    return matrix
+
+
+def route_events(types, matrix):
+    """Index into EVENT_MODELS of each record's table, -1 if it is not stored"""
+    defending = matrix[:, [FLAG_INDEX[name] for name in DEFENDING_EVENT_FLAGS]]
+    shot = matrix[:, FLAG_INDEX['isShot']]
+
+    def of_type(names):
+        return np.isin(types, list(names))
+
+    # np.select takes the first matching condition, like if/elif rules would
+    rules = [
+        (PassEvent, types == 'Pass'),
+        (DefendingEvent, of_type(DEFENDING_EVENT_TYPES) | defending.any(axis=1)),
+        (GoalkeeperEvent, of_type(GOALKEEPER_EVENT_TYPES)),
+        (ShootingEvent, of_type(SHOOTING_EVENT_TYPES) | shot),
+        (PossessionEvent, of_type(POSSESSION_EVENT_TYPES)),
+        (SummaryEvent, of_type(SUMMARY_EVENT_TYPES)),
+    ]
+    table = np.select([condition for _, condition in rules],
+                      [EVENT_MODELS.index(model) for model, _ in rules], default=-1)
+    table[of_type(SKIPPED_EVENT_TYPES)] = -1
+    return table
+
+
+def _objects(values):
+    """1-d object array of ``values``, even if they are lists"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _numbers(events, key):
+    """Float array of a numeric key, NaN where absent"""
+    return np.array([optional(event.get(key)) for event in events], dtype=float)
+
+
+def _column(values, kind, missing=None):
+    """Object array of ``values`` as ``kind``, ``missing`` where NaN"""
+    absent = np.isnan(values)
+    column = np.where(absent, 0, values).astype(kind).astype(object)
+    column[absent] = missing
+    return column
+
+
+def _flags(events, key):
+    return _objects([bool(event.get(key, False)) for event in events])
+
+
+def base_columns(match, events, max_minute):
+    """Columns of the fields shared by all six tables, as object arrays"""
+    home_id, away_id = match.home_team_id, match.away_team_id
+    team_ids = _numbers(events, 'teamId')
+    home, away = team_ids == home_id, team_ids == away_id
+    given_h_a = _objects([str(event.get('h_a', '')).lower() for event in events])
+    h_a = np.where(home, 'h', np.where(away, 'a', given_h_a)).astype(object)
+    team_id = np.where(home, home_id, np.where(
+        away | (h_a != 'h'), away_id, home_id))
+
+    minute = _numbers(events, 'minute')
+    expanded = _numbers(events, 'expandedMinute')
+    expanded = np.where(np.isnan(expanded), minute, expanded)
+    max_minutes = _numbers(events, 'maxMinute')
+    situations = [optional(event.get('situation')) for event in events]
+
+    return {
+        'source_id': _column(_numbers(events, 'id'), np.int64),
+        'event_id': _column(_numbers(events, 'eventId'), np.int64, 0),
+        'match_id': _objects([match.match_id] * len(events)),
+        'team_id': team_id.astype(np.int64).astype(object),
+        'player_id': _column(_numbers(events, 'playerId'), np.int64),
+        'player_name': _objects(
+            [optional(event.get('playerName')) for event in events]),
+        'minute': _column(minute, np.int64, 0),
+        'second': _column(_numbers(events, 'second'), float),
+        'expanded_minute': _column(expanded, np.int64, 0),
+        'period': _objects(
+            [display_name(event.get('period')) or '' for event in events]),
+        # A maxMinute of 0 is as good as missing
+        'max_minute': _column(np.where(max_minutes == 0, np.nan, max_minutes),
+                              np.int64, max_minute),
+        'x': _column(_numbers(events, 'x'), float, 0.0),
+        'y': _column(_numbers(events, 'y'), float, 0.0),
+        'end_x': _column(_numbers(events, 'endX'), float),
+        'end_y': _column(_numbers(events, 'endY'), float),
+        'is_touch': _flags(events, 'isTouch'),
+        'touches': _flags(events, 'touches'),
+        'defensive_third': _flags(events, 'defensiveThird'),
+        'mid_third': _flags(events, 'midThird'),
+        'final_third': _flags(events, 'finalThird'),
+        'outcome_type': _objects(
+            [optional(display_name(event.get('outcomeType'))) for event in events]),
+        'related_event_id': _column(_numbers(events, 'relatedEventId'), float),
+        'related_player_id': _column(_numbers(events, 'relatedPlayerId'), float),
+        'h_a': h_a,
+        'situation': _objects([str(situation).strip() if situation is not None
+                               else None for situation in situations]),
+        'qualifiers': _objects(
+            [list(event.get('qualifiers') or []) for event in events]),
+        'satisfied_events_types': _objects(
+            [list(event.get('satisfiedEventsTypes') or []) for event in events]),
+    }
+
+
+def model_columns(model, events, positions, types, matrix):
+    """Columns of ``model``'s own fields for the records at ``positions``"""
+    fields, flag_columns = _MODEL_FLAG_COLUMNS[model]
+    columns = dict(zip(fields, matrix[np.ix_(positions, flag_columns)].T.tolist()))
+    for field, key in MODEL_VALUES[model].items():
+        values = [optional(display_name(events[i].get(key))) for i in positions]
+        # createEventsDF fills missing card types with False
+        columns[field] = [None if value is False or value == 'False' else value
+                          for value in values]
+    if model is DefendingEvent:
+        for field, defending_type in DEFENDING_TYPES.items():
+            columns[field] = (types[positions] == defending_type).tolist()
+    return columns
+
+
+def route_batch(match, events, max_minute):
+    """Split a batch of a match's records into row tuples per event model.
+
+    Returns ``(tables, players, skipped)``: model -> list of row tuples in
+    ``stored_fields(model)`` order, player id -> name of every player the
+    stored rows refer to, and the number of records no table stores.
+    """
+    types = _objects([display_name(event.get('type')) or '' for event in events])
+    matrix = flag_matrix(events)
+    routed = route_events(types, matrix)
+    stored = routed >= 0
+    unhandled = set(types[~stored]) - SKIPPED_EVENT_TYPES
+    if unhandled:
+        logger.debug(f"Unhandled event types: {', '.join(sorted(unhandled))}")
+
+    base = base_columns(match, events, max_minute)
+    base['type'] = types
+    tables = {}
+    for index, model in enumerate(EVENT_MODELS):
+        positions = np.flatnonzero(routed == index)
+        if not len(positions):
+            tables[model] = []
+            continue
+        own = model_columns(model, events, positions, types, matrix)
+        tables[model] = list(zip(*(
+            own[name] if name in own else base[name][positions].tolist()
+            for name in stored_fields(model))))
+
+    players = {}
+    for player_id, name in zip(base['player_id'][stored].tolist(),
+                               base['player_name'][stored].tolist()):
+        if player_id is not None:
+            players.setdefault(player_id, name or '')
+    return tables, players, int((~stored).sum())
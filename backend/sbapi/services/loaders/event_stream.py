@@ -0,0 +1,85 @@
+"""Streaming reader for multi-match event exports.
+
+A season export is a JSON array of event records, or NDJSON with one
+record per line, where every record carries its ``matchId``. Instead of
+``json.load`` on the whole file, records are decoded one at a time with
+``JSONDecoder.raw_decode`` from a buffer refilled in fixed-size chunks, and
+grouped into matches as they arrive. Memory is bounded by the chunk size
+plus the largest match, not by the size of the file.
+"""
+import hashlib
+import json
+
+from .event_loader import IngestError
+
+CHUNK_SIZE = 1 << 16
+
+# A single record larger than this means the file is not what we expect
+MAX_RECORD_SIZE = 1 << 24
+
+# Characters between records: whitespace, array brackets and separators
+_BETWEEN_RECORDS = frozenset(' \t\r\n,[]')
+
+_decode = json.JSONDecoder().raw_decode
+
+
+def iter_records(path, chunk_size=CHUNK_SIZE):
+    """Yield (record, raw JSON text) for each record of an array or NDJSON file"""
+    with open(path, encoding='utf-8') as f:
+        buffer, pos, eof = '', 0, False
+        while True:
+            while pos < len(buffer) and buffer[pos] in _BETWEEN_RECORDS:
+                pos += 1
+            if pos < len(buffer):
+                try:
+                    record, end = _decode(buffer, pos)
+                except json.JSONDecodeError:
+                    end = None
+                # A value ending with the buffer may go on in the next chunk
+                if end is not None and (end < len(buffer) or eof):
+                    if not isinstance(record, dict):
+                        raise IngestError(f"Expected event records in {path}")
+                    yield record, buffer[pos:end]
+                    pos = end
+                    continue
+                if eof:
+                    raise IngestError(f"Invalid JSON in {path}")
+                if len(buffer) - pos > MAX_RECORD_SIZE:
+                    raise IngestError(
+                        f"Record over {MAX_RECORD_SIZE} characters in {path}")
+            elif eof:
+                return
+
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+
+
+def iter_match_groups(path, chunk_size=CHUNK_SIZE):
+    """Yield (match_id, records, content hash) per match of an export.
+
+    A match's records must be contiguous, as they are when an export is
+    written match by match. The hash is the sha256 of the match's raw
+    record text, so it changes whenever any of its records does.
+    """
+    current, records, digest = None, [], None
+    finished = set()
+    for record, raw in iter_records(path, chunk_size):
+        match_id = record.get('matchId')
+        if match_id is None:
+            raise IngestError(f"Event record without matchId in {path}")
+        match_id = int(match_id)
+
+        if match_id != current:
+            if current is not None:
+                yield current, records, digest.hexdigest()
+                finished.add(current)
+            if match_id in finished:
+                raise IngestError(
+                    f"Events of match {match_id} are not contiguous in {path}")
+            current, records, digest = match_id, [], hashlib.sha256()
+        records.append(record)
+        digest.update(raw.encode('utf-8'))
+
+    if current is not None:
+        yield current, records, digest.hexdigest()
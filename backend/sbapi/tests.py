@@ -1,3 +1,233 @@
-from django.test import TestCase
+import json
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.db import connections
+from django.test import SimpleTestCase, TestCase
+
+from .models import (
+    Competition, Season, Team, Match, Player, EventIngestion, PassEvent,
+    ShootingEvent, DefendingEvent, GoalkeeperEvent, SummaryEvent
+)
+from .services.loaders.event_fields import EVENT_MODELS, stored_fields
+from .services.loaders.event_router import flag_matrix, route_batch, route_events
+from .services.loaders.event_stream import iter_match_groups
+from .services.loaders import event_loader
+from .services.loaders.event_loader import (
+    IngestError, bulk_upsert, fast_upsert, file_hash, load_match_events,
+    load_match_file, loaded_matches
+)
+from .management.commands.load_events import changed_files
+
+
+def _event(source_id, event_type, satisfied=(), **extra):
+    return {
+        'id': float(source_id), 'eventId': source_id, 'minute': 10,
+        'second': 5.0, 'teamId': 26, 'playerId': 101.0,
+        'playerName': 'Player One', 'x': 50.0, 'y': 40.0,
+        'expandedMinute': 10, 'period': {'value': 1, 'displayName': 'FirstHalf'},
+        'type': event_type, 'outcomeType': 'Successful',
+        'satisfiedEventsTypes': list(satisfied), 'qualifiers': [],
+        **extra,
+    }
+
+
+class EventRoutingTests(SimpleTestCase):
+    def test_routes_by_type_and_flags(self):
+        events = [_event(1, 'Pass'), _event(2, 'Save'),
+                  _event(3, 'Save', ['outfielderBlock']), _event(4, 'Card'),
+                  _event(5, 'Carry', ['zUnknown', 'isShotX']),
+                  _event(6, 'Carry', isShot=True),
+                  _event(7, 'Start')]
+        types = np.array([event['type'] for event in events], dtype=object)
+        routed = route_events(types, flag_matrix(events))
+        self.assertEqual(
+            [EVENT_MODELS[index] if index >= 0 else None for index in routed],
+            [PassEvent, GoalkeeperEvent, DefendingEvent, SummaryEvent,
+             None, ShootingEvent, None])
+
+
+class EventStreamTests(SimpleTestCase):
+    def _groups(self, content, chunk_size=7):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'season.json'
+            path.write_text(content)
+            return [(match_id, [r['id'] for r in records], content_hash)
+                    for match_id, records, content_hash
+                    in iter_match_groups(path, chunk_size=chunk_size)]
+
+    def test_groups_array_and_ndjson_across_chunks(self):
+        records = [{'matchId': 1, 'id': 1.0, 'qualifiers': [{'type': 'Zone'}]},
+                   {'matchId': 1, 'id': 2.5},
+                   {'matchId': 2, 'id': 3.0}]
+        array = self._groups(json.dumps(records, indent=1))
+        ndjson = self._groups('\n'.join(map(json.dumps, records)) + '\n')
+
+        self.assertEqual([(m, ids) for m, ids, _ in array],
+                         [(1, [1.0, 2.5]), (2, [3.0])])
+        self.assertEqual([(m, ids) for m, ids, _ in ndjson],
+                         [(m, ids) for m, ids, _ in array])
+        self.assertEqual(array, self._groups(json.dumps(records, indent=1), 1 << 16))
+
+    def test_rejects_interleaved_matches(self):
+        records = [{'matchId': 1, 'id': 1}, {'matchId': 2, 'id': 2},
+                   {'matchId': 1, 'id': 3}]
+        with self.assertRaises(IngestError):
+            self._groups(json.dumps(records))
+
+
+class LoadMatchEventsTests(TestCase):
+    def setUp(self):
+        season = Season.objects.create(
+            competition=Competition.objects.create(name='League', country='England'),
+            name='2023/24')
+        Match.objects.create(
+            match_id=1, season=season,
+            start_datetime=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            venue='Ground', home_score_ht=0, away_score_ht=0,
+            home_score_ft=1, away_score_ft=0,
+            home_team=Team.objects.create(team_id=26, name='Home', country='England'),
+            away_team=Team.objects.create(team_id=167, name='Away', country='England'))
+        self.events = [
+            _event(1, 'Start'),
+            _event(2, 'Pass', ['passAccurate', 'passForward']),
+            _event(3, 'Tackle', ['tackleWon'], teamId=167, playerId=202.0),
+            _event(4, 'Card', cardType={'value': 31, 'displayName': 'Yellow'}),
+        ]
+
+    def test_loads_rows_and_players(self):
+        result = load_match_events(1, self.events)
+        self.assertEqual(result['skipped'], 1)
+
+        passing = PassEvent.objects.get(match_id=1)
+        self.assertTrue(passing.pass_accurate and passing.pass_forward)
+        self.assertFalse(passing.pass_back)
+        self.assertEqual((passing.period, passing.h_a), ('FirstHalf', 'h'))
+
+        tackle = DefendingEvent.objects.get(match_id=1)
+        self.assertTrue(tackle.is_tackle and tackle.tackle_won)
+        self.assertEqual((tackle.team_id, tackle.h_a), (167, 'a'))
+        self.assertEqual(SummaryEvent.objects.get(match_id=1).card_type, 'Yellow')
+        self.assertEqual(set(Player.objects.values_list('player_id', flat=True)),
+                         {101, 202})
+
+    def test_refuses_unknown_match(self):
+        with self.assertRaises(IngestError):
+            load_match_events(2, self.events)
+
+    def test_reload_upserts_changes_only(self):
+        load_match_events(1, self.events)
+        touched = Match.objects.get(match_id=1).last_updated
+        pass_pk = PassEvent.objects.get(match_id=1).pk
+
+        result = load_match_events(1, self.events)
+        self.assertEqual((result['created'], result['updated'], result['deleted']),
+                         (0, 0, 0))
+        self.assertFalse(result['changed'])
+        self.assertEqual(Match.objects.get(match_id=1).last_updated, touched)
+
+        # Correct the pass, drop the card and turn the tackle into a save
+        events = [
+            self.events[0],
+            _event(2, 'Pass', ['passInaccurate']),
+            _event(3, 'Save', teamId=167, playerId=202.0),
+        ]
+        result = load_match_events(1, events)
+        self.assertEqual((result['created'], result['updated'], result['deleted']),
+                         (1, 1, 2))
+        self.assertTrue(result['changed'])
+        self.assertGreater(Match.objects.get(match_id=1).last_updated, touched)
+
+        passing = PassEvent.objects.get(match_id=1)
+        self.assertEqual(passing.pk, pass_pk)
+        self.assertTrue(passing.pass_inaccurate)
+        self.assertFalse(passing.pass_accurate)
+        self.assertFalse(SummaryEvent.objects.exists())
+        self.assertFalse(DefendingEvent.objects.exists())
+        self.assertTrue(GoalkeeperEvent.objects.filter(source_id=3).exists())
+
+    def test_fast_upsert_stores_what_bulk_create_stores(self):
+        events = [
+            _event(2, 'Pass', ['passAccurate', 'passCrossAccurate'], endX=80.5,
+                   qualifiers=[{'type': {'displayName': 'Length'}, 'value': '12.3'}]),
+            _event(3, 'Tackle', ['tackleWon'], teamId=167, playerId=202.0,
+                   relatedEventId=2),
+            _event(4, 'Card', cardType={'value': 31, 'displayName': 'Yellow'}),
+            _event(5, 'Goal', ['goalNormal'], isShot=True, situation='OpenPlay '),
+            _event(6, 'Save', ['keeperSaveTotal'], playerId=None, playerName=None),
+            _event(7, 'TakeOn', ['dribbleWon'], maxMinute=0, expandedMinute=None),
+        ]
+        match = Match.objects.get(match_id=1)
+        tables, players, _ = route_batch(match, events, 95)
+        Player.objects.bulk_create(
+            [Player(player_id=player_id, name=name) for player_id, name in players.items()])
+        connection = connections['default']
+
+        def stored(model):
+            columns = ', '.join(connection.ops.quote_name(
+                model._meta.get_field(attname).column)
+                for attname in stored_fields(model))
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT {columns} FROM {model._meta.db_table} "
+                               f"ORDER BY source_id")
+                return cursor.fetchall()
+
+        for model in EVENT_MODELS:
+            rows = tables[model]
+            self.assertTrue(rows, model.__name__)
+            # Inserts, then updates of every row on conflict
+            changed = [tuple(not value if isinstance(value, bool) else value
+                             for value in row) for row in rows]
+            results = []
+            for upsert in (lambda rows: fast_upsert(model, rows, 2, connection),
+                           lambda rows: bulk_upsert(model, rows, 2, 'default')):
+                model.objects.all().delete()
+                upsert(rows)
+                inserted = stored(model)
+                upsert(changed)
+                results.append((inserted, stored(model)))
+            self.assertEqual(results[0], results[1], model.__name__)
+            self.assertNotEqual(results[0][0], results[0][1])
+
+    def test_ledger_records_file_hash_and_loader_version(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / '1.json'
+            path.write_text(json.dumps(self.events))
+            content_hash = file_hash(path)
+            self.assertEqual(loaded_matches([(1, content_hash)]), set())
+
+            load_match_file(path)
+            ingestion = EventIngestion.objects.get(match_id=1)
+            self.assertEqual(ingestion.content_hash, content_hash)
+            self.assertEqual(ingestion.events, len(self.events))
+            self.assertEqual(loaded_matches([(1, content_hash)]), {(1, content_hash)})
+
+        with mock.patch.object(event_loader, 'LOADER_VERSION',
+                               event_loader.LOADER_VERSION + 1):
+            self.assertEqual(loaded_matches([(1, content_hash)]), set())
+
+    def test_identical_files_of_other_matches_are_not_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / f'{match_id}.json' for match_id in (1, 2)]
+            for path in paths:
+                path.write_text(json.dumps(self.events))
+            broken = Path(tmp) / 'broken.json'
+            broken.write_text('[')
+            self.assertEqual(changed_files(paths + [broken]), paths + [broken])
+
+            load_match_file(paths[0])
+            self.assertEqual(changed_files(paths + [broken]), paths[1:] + [broken])
+
+    def test_files_named_after_another_match_are_skipped_once_loaded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # Named 1234.json, holding match 1's records
+            path = Path(tmp) / '1234.json'
+            path.write_text(json.dumps({'matchId': 1, 'events': self.events}))
+            self.assertEqual(changed_files([path]), [path])
+
+            load_match_file(path)
+            self.assertTrue(EventIngestion.objects.filter(match_id=1).exists())
+            self.assertEqual(changed_files([path]), [])